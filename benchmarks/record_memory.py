@@ -0,0 +1,127 @@
+import argparse
+import gc
+import json
+import random
+import tracemalloc
+import uuid
+from datetime import date, datetime, timedelta
+from typing import Callable, Dict, List, Any, Iterable
+
+from models.status_scales import STATUS_SCALES, MEAL_AMOUNTS
+from storage.log_archive import SELF_CARE_COLUMNS
+from storage.log_index import PatientLogIndex
+"""
+Record Memory Benchmark
+Per-log memory of the in-memory log index against holding decoded documents.
+
+Logs are generated as stored JSON documents, the form they take in SQLite, and
+decoded the way the repository loads them. The baseline keeps the decoded
+dictionaries; the index keeps DailyLog records plus its sort keys and lookup
+maps. tracemalloc measures the memory each keeps alive:
+
+    python -m benchmarks.record_memory --count 100000
+"""
+
+CARERS = ["Carer", "Amira Patel", "John Smith", "Night Shift", "Family Member"]
+NOTES = ["", "", "Calm day", "Agitated in the evening", "Ate well, walked in the garden"]
+
+
+def generate_documents(count: int, seed: int = 7) -> List[str]:
+    """
+    Generate stored log documents shaped like the daily log form's output.
+
+    Args:
+        count: Number of logs
+        seed: Random seed
+
+    Returns:
+        List of JSON documents in (date, timestamp) order
+    """
+    rng = random.Random(seed)
+    first_day = date.today() - timedelta(days=730)
+    documents = []
+    for _ in range(count):
+        log_date = first_day + timedelta(days=rng.randrange(730))
+        logged_at = datetime.combine(log_date, datetime.min.time()).replace(
+            hour=rng.randrange(7, 22), minute=rng.randrange(60)
+        )
+        systolic = rng.randrange(105, 150)
+        diastolic = rng.randrange(65, min(systolic - 10, 95))
+        documents.append(json.dumps({
+            'id': str(uuid.UUID(int=rng.getrandbits(128))),
+            'date': log_date.isoformat(),
+            'time': logged_at.strftime('%H:%M'),
+            'timestamp': logged_at.isoformat(),
+            'vitals': {
+                'temperature': round(rng.uniform(36.0, 37.8), 1),
+                'blood_pressure': f"{systolic}/{diastolic}",
+                'heart_rate': rng.randrange(55, 100),
+                'respiratory_rate': 16,
+                'oxygen_saturation': rng.randrange(92, 100),
+                'weight': round(rng.uniform(50.0, 90.0), 1),
+                'systolic': systolic,
+                'diastolic': diastolic,
+            },
+            'activities': {
+                field: rng.randrange(len(labels)) for field, labels in STATUS_SCALES.items()
+            },
+            'self_care': {name: False for name in SELF_CARE_COLUMNS},
+            'meals': {
+                'breakfast': {'amount': rng.randrange(len(MEAL_AMOUNTS)), 'calories': 300},
+                'lunch': {'amount': rng.randrange(len(MEAL_AMOUNTS)), 'calories': 450},
+                'dinner': {'amount': rng.randrange(len(MEAL_AMOUNTS)), 'calories': 400},
+                'total_calories': 1150,
+                'total_fluids': rng.randrange(8, 25) * 100,
+            },
+            'general_notes': rng.choice(NOTES),
+            'incidents': '',
+            'logged_by': rng.choice(CARERS),
+        }))
+    documents.sort(key=lambda document: json.loads(document)['timestamp'])
+    return documents
+
+
+def measure(documents: List[str], build: Callable[[Iterable[Dict[str, Any]]], Any]) -> int:
+    """
+    Measure the memory kept alive by a structure built from the documents.
+
+    Args:
+        documents: JSON documents
+        build: Builds the held structure from the decoded documents
+
+    Returns:
+        Bytes allocated by the held structure
+    """
+    gc.collect()
+    tracemalloc.start()
+    held = build(json.loads(document) for document in documents)
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del held
+    return current
+
+
+def main() -> None:
+    """Run the benchmark and print bytes per record for each representation."""
+    parser = argparse.ArgumentParser(description="Compare per-log memory of dicts and the log index")
+    parser.add_argument('--count', type=int, default=100_000, help="Number of logs")
+    args = parser.parse_args()
+
+    documents = generate_documents(args.count)
+    results = {
+        'dicts': measure(documents, list),
+        'log index': measure(documents, PatientLogIndex),
+    }
+
+    baseline = results['dicts']
+    print(f"{args.count} logs")
+    for name, total in results.items():
+        print(
+            f"{name:>10}: {total / args.count:8.0f} bytes/log "
+            f"{total / 2 ** 20:8.1f} MiB total ({total / baseline:.0%} of dicts)"
+        )
+
+
+if __name__ == '__main__':
+    main()
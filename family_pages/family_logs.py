@@ -1,6 +1,10 @@
 import streamlit as st
 from datetime import datetime, date, timedelta
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
+
+from models.status_scales import meal_label, status_label
+from pages.log_sections import LogSectionRenderer, formatted_logs
+from storage.repository import get_repository
 """
 Family Logs View Module
 Read-only view for family members to see patient care logs.
@@ -20,14 +24,15 @@ class FamilyPatientSelector:
     def render_selector() -> Optional[tuple[str, str]]:
         """
         """
-        if not st.session_state.patients:
+        patients = get_repository().list_patients()
+        if not patients:
             st.warning("No patients registered in the system.")
             return None
         
         default_index = 0
         if st.session_state.current_patient:
             try:
-                default_index = list(st.session_state.patients.keys()).index(
+                default_index = list(patients.keys()).index(
                     st.session_state.current_patient
                 )
             except ValueError:
@@ -35,7 +40,7 @@ class FamilyPatientSelector:
         
         patient_options = {
             pid: f"{p.get('patient_id_number', 'N/A')} - {p['name']}"
-            for pid, p in st.session_state.patients.items()
+            for pid, p in patients.items()
         }
         
         selected_display = st.selectbox(
@@ -50,7 +55,7 @@ class FamilyPatientSelector:
         ][0]
         
         st.session_state.current_patient = selected_patient_id
-        patient_name = st.session_state.patients[selected_patient_id]['name']
+        patient_name = patients[selected_patient_id]['name']
         
         return selected_patient_id, patient_name
 
@@ -115,8 +120,18 @@ class DateRangeSelector:
 class LogSummaryCard:
     """
     Displays summary information for a single log entry.
+    Only the selected section of a log is built on each rerun.
     """
     
+    TASK_LABELS = {
+        'bathing': 'Bathing/Washing',
+        'toileting': 'Toileting',
+        'dressing': 'Dressing',
+        'grooming': 'Grooming',
+        'eating': 'Eating (Independent)',
+        'mobility': 'Mobility (Independent)'
+    }
+    
     @staticmethod
     def render(log: Dict[str, Any]) -> None:
         """
@@ -126,42 +141,111 @@ class LogSummaryCard:
         log_date = datetime.fromisoformat(log['date']).strftime('%A, %d %B %Y')
         
         with st.expander(f"{log_date} at {log.get('time', 'N/A')}"):
-            tab1, tab2, tab3, tab4 = st.tabs([
-                "Vitals", 
-                "Nutrition & Meals", 
-                "Tasks Completed", 
-                "Notes"
-            ])
-            
-            with tab1:
-                LogSummaryCard._render_vitals(log)
-            
-            with tab2:
-                LogSummaryCard._render_nutrition(log)
-            
-            with tab3:
-                LogSummaryCard._render_tasks(log)
-            
-            with tab4:
-                LogSummaryCard._render_notes(log)
+            LogSectionRenderer.render(
+                log,
+                {
+                    "Vitals": LogSummaryCard._render_vitals,
+                    "Nutrition & Meals": LogSummaryCard._render_nutrition,
+                    "Tasks Completed": LogSummaryCard._render_tasks,
+                    "Notes": LogSummaryCard._render_notes,
+                },
+                key_prefix="family_section"
+            )
+    
+    @staticmethod
+    def _format_vitals(log: Dict[str, Any]) -> Tuple[Tuple[str, ...], List[str], List[str]]:
+        """Format vitals metric values and daily status lines."""
+        vitals = log.get('vitals') or {}
+        activities = log.get('activities') or {}
+        metrics = (
+            f"{vitals.get('temperature', 'N/A')}°C",
+            f"{vitals.get('heart_rate', 'N/A')} bpm",
+            f"{vitals.get('blood_pressure', 'N/A')}",
+            f"{vitals.get('oxygen_saturation', 'N/A')}%",
+            f"{vitals.get('weight', 'N/A')} kg",
+        )
+        left = [
+            f"**Mood:** {status_label(activities, 'mood', 'N/A')}",
+            f"**Sleep Quality:** {status_label(activities, 'sleep_quality', 'N/A')}",
+            f"**Appetite:** {status_label(activities, 'appetite', 'N/A')}",
+        ]
+        right = [
+            f"**Activity Level:** {status_label(activities, 'activity_level', 'N/A')}",
+            f"**Social Engagement:** {status_label(activities, 'social_engagement', 'N/A')}",
+            f"**Communication:** {status_label(activities, 'communication', 'N/A')}",
+        ]
+        return metrics, left, right
+    
+    @staticmethod
+    def _format_nutrition(log: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Format nutrition totals, meal rows and medications given."""
+        if not log.get('meals'):
+            return None
+        
+        meals = log['meals']
+        fluid_target = 2000
+        percentage = (meals.get('total_fluids', 0) / fluid_target * 100)
+        
+        meal_rows = []
+        for meal_name, meal_data in (
+            ("Breakfast", meals.get('breakfast', {})),
+            ("Lunch", meals.get('lunch', {})),
+            ("Dinner", meals.get('dinner', {}))
+        ):
+            if isinstance(meal_data, dict):
+                amount = meal_label(meal_data, 'Not recorded')
+                calories = meal_data.get('calories', 0)
+                meal_rows.append(
+                    (f"**{meal_name}:**", f"{amount} consumed | {calories} kcal")
+                )
+        
+        return {
+            'calories': f"{meals.get('total_calories', 0)} kcal",
+            'fluids': f"{meals.get('total_fluids', 0)} ml",
+            'fluid_target': f"{percentage:.0f}%",
+            'meals': meal_rows,
+            'medications': [
+                f"- **{med['medication']}** ({med['dosage']}) at {med['time_given']}"
+                for med in log.get('medications_given', [])
+            ],
+        }
+    
+    @staticmethod
+    def _format_tasks(log: Dict[str, Any]) -> Tuple[List[str], List[str]]:
+        """Split self-care tasks into completed and assistance needed."""
+        completed_tasks = []
+        not_completed = []
+        
+        for task_key, task_label in LogSummaryCard.TASK_LABELS.items():
+            if log['self_care'].get(task_key, False):
+                completed_tasks.append(task_label)
+            else:
+                not_completed.append(task_label)
+        
+        return completed_tasks, not_completed
     
     @staticmethod
     def _render_vitals(log: Dict[str, Any]) -> None:
         """Render vitals information."""
+        metrics, left, right = formatted_logs.get(
+            log, 'family_vitals', LogSummaryCard._format_vitals
+        )
+        temperature, heart_rate, blood_pressure, oxygen, weight = metrics
+        
         st.subheader("Vital Signs")
         
         col1, col2, col3 = st.columns(3)
         
         with col1:
-            st.metric("Temperature", f"{log['vitals']['temperature']}°C")
-            st.metric("Heart Rate", f"{log['vitals']['heart_rate']} bpm")
+            st.metric("Temperature", temperature)
+            st.metric("Heart Rate", heart_rate)
         
         with col2:
-            st.metric("Blood Pressure", log['vitals']['blood_pressure'])
-            st.metric("Oxygen", f"{log['vitals']['oxygen_saturation']}%")
+            st.metric("Blood Pressure", blood_pressure)
+            st.metric("Oxygen", oxygen)
         
         with col3:
-            st.metric("Weight", f"{log['vitals']['weight']} kg")
+            st.metric("Weight", weight)
         
         st.divider()
         st.subheader("Daily Status")
@@ -169,66 +253,50 @@ class LogSummaryCard:
         col1, col2 = st.columns(2)
         
         with col1:
-            st.write(f"**Mood:** {log['activities']['mood']}")
-            st.write(f"**Sleep Quality:** {log['activities']['sleep_quality']}")
-            st.write(f"**Appetite:** {log['activities']['appetite']}")
+            st.write("  \n".join(left))
         
         with col2:
-            st.write(f"**Activity Level:** {log['activities']['activity_level']}")
-            st.write(f"**Social Engagement:** {log['activities']['social_engagement']}")
-            st.write(f"**Communication:** {log['activities']['communication']}")
+            st.write("  \n".join(right))
     
     @staticmethod
     def _render_nutrition(log: Dict[str, Any]) -> None:
         """Render nutrition and meals information."""
         st.subheader("Nutrition Summary")
         
-        if not log.get('meals'):
+        nutrition = formatted_logs.get(
+            log, 'family_nutrition', LogSummaryCard._format_nutrition
+        )
+        
+        if nutrition is None:
             st.info("No meal information recorded")
             return
         
-        meals = log['meals']
-        
         col1, col2, col3 = st.columns(3)
         
         with col1:
-            st.metric("Total Calories", f"{meals.get('total_calories', 0)} kcal")
+            st.metric("Total Calories", nutrition['calories'])
         
         with col2:
-            st.metric("Total Fluids", f"{meals.get('total_fluids', 0)} ml")
+            st.metric("Total Fluids", nutrition['fluids'])
         
         with col3:
-            fluid_target = 2000
-            percentage = (meals.get('total_fluids', 0) / fluid_target * 100)
-            st.metric("Fluid Target", f"{percentage:.0f}%")
+            st.metric("Fluid Target", nutrition['fluid_target'])
         
         st.divider()
         st.subheader("Meals Consumed")
         
-        meal_info = [
-            ("Breakfast", meals.get('breakfast', {})),
-            ("Lunch", meals.get('lunch', {})),
-            ("Dinner", meals.get('dinner', {}))
-        ]
+        for meal_name, meal_text in nutrition['meals']:
+            col1, col2 = st.columns([2, 1])
+            with col1:
+                st.write(meal_name)
+            with col2:
+                st.write(meal_text)
         
-        for meal_name, meal_data in meal_info:
-            if isinstance(meal_data, dict):
-                amount = meal_data.get('amount', 'Not recorded')
-                calories = meal_data.get('calories', 0)
-                
-                col1, col2 = st.columns([2, 1])
-                with col1:
-                    st.write(f"**{meal_name}:**")
-                with col2:
-                    st.write(f"{amount} consumed | {calories} kcal")
-        
-        if log.get('medications_given'):
+        if nutrition['medications']:
             st.divider()
             st.subheader("Medications Given")
-            for med in log['medications_given']:
-                st.write(
-                    f"- **{med['medication']}** ({med['dosage']}) at {med['time_given']}"
-                )
+            for line in nutrition['medications']:
+                st.write(line)
     
     @staticmethod
     def _render_tasks(log: Dict[str, Any]) -> None:
@@ -239,39 +307,23 @@ class LogSummaryCard:
             st.info("No task information recorded")
             return
         
-        completed_tasks = []
-        not_completed = []
-        
-        task_labels = {
-            'bathing': 'Bathing/Washing',
-            'toileting': 'Toileting',
-            'dressing': 'Dressing',
-            'grooming': 'Grooming',
-            'eating': 'Eating (Independent)',
-            'mobility': 'Mobility (Independent)'
-        }
-        
-        for task_key, task_label in task_labels.items():
-            if log['self_care'].get(task_key, False):
-                completed_tasks.append(task_label)
-            else:
-                not_completed.append(task_label)
+        completed_tasks, not_completed = formatted_logs.get(
+            log, 'family_tasks', LogSummaryCard._format_tasks
+        )
         
         col1, col2 = st.columns(2)
         
         with col1:
             st.write("**Completed:**")
             if completed_tasks:
-                for task in completed_tasks:
-                    st.write(f"✅ {task}")
+                st.write("  \n".join(f"✅ {task}" for task in completed_tasks))
             else:
                 st.write("None recorded")
         
         with col2:
             st.write("**Assistance Needed:**")
             if not_completed:
-                for task in not_completed:
-                    st.write(f"⚪ {task}")
+                st.write("  \n".join(f"⚪ {task}" for task in not_completed))
             else:
                 st.write("None")
     
@@ -318,18 +370,20 @@ def render_page() -> None:
     
     st.divider()
     
-    if patient_id not in st.session_state.daily_logs:
+    repository = get_repository()
+    
+    if not repository.has_logs(patient_id):
         st.info(f"No care logs available for {patient_name} yet")
         return
     
-    all_logs = st.session_state.daily_logs[patient_id]
-    
-    filtered_logs = [
-        log for log in all_logs
-        if start_date.isoformat() <= log['date'] <= end_date.isoformat()
-    ]
+    sorted_logs = repository.get_logs_in_range(
+        patient_id,
+        start_date.isoformat(),
+        end_date.isoformat(),
+        newest_first=True
+    )
     
-    if not filtered_logs:
+    if not sorted_logs:
         st.info(
             f"No logs found between {start_date.strftime('%d %b %Y')} and "
             f"{end_date.strftime('%d %b %Y')}"
@@ -337,12 +391,10 @@ def render_page() -> None:
         return
     
     st.success(
-        f"Found {len(filtered_logs)} care log(s) for {patient_name} between "
+        f"Found {len(sorted_logs)} care log(s) for {patient_name} between "
         f"{start_date.strftime('%d %b %Y')} and {end_date.strftime('%d %b %Y')}"
     )
     
-    sorted_logs = sorted(filtered_logs, key=lambda x: x['date'], reverse=True)
-    
     for log in sorted_logs:
         LogSummaryCard.render(log)
 
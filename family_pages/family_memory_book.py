@@ -2,6 +2,10 @@ import streamlit as st
 from datetime import datetime
 from typing import Dict, List, Any, Optional
 import uuid
+
+from storage.media_ingest import MediaIngestError
+from storage.media_server import get_media_server
+from storage.repository import get_repository
 """
 Family Memory Book Module
 Editable memory book for family members to upload and manage photos, videos, and audio.
@@ -33,14 +37,15 @@ class FamilyPatientSelector:
         Render patient selection dropdown for family members.
         
         """
-        if not st.session_state.patients:
+        patients = get_repository().list_patients()
+        if not patients:
             st.warning("No patients registered in the system.")
             return None
         
         default_index = 0
         if st.session_state.current_patient:
             try:
-                default_index = list(st.session_state.patients.keys()).index(
+                default_index = list(patients.keys()).index(
                     st.session_state.current_patient
                 )
             except ValueError:
@@ -48,7 +53,7 @@ class FamilyPatientSelector:
         
         patient_options = {
             pid: f"{p.get('patient_id_number', 'N/A')} - {p['name']}"
-            for pid, p in st.session_state.patients.items()
+            for pid, p in patients.items()
         }
         
         selected_display = st.selectbox(
@@ -63,7 +68,7 @@ class FamilyPatientSelector:
         ][0]
         
         st.session_state.current_patient = selected_patient_id
-        patient_name = st.session_state.patients[selected_patient_id]['name']
+        patient_name = patients[selected_patient_id]['name']
         
         return selected_patient_id, patient_name
 
@@ -74,10 +79,13 @@ class MediaUploadForm:
     """
     
     @staticmethod
-    def render() -> Optional[Dict[str, Any]]:
+    def render(patient_id: str) -> Optional[Dict[str, Any]]:
         """
         Render media upload form.
         
+        Args:
+            patient_id: ID of the patient the upload is for
+            
         Returns:
             Media data dictionary or None if not submitted
         """
@@ -120,14 +128,18 @@ class MediaUploadForm:
             submitted = st.form_submit_button("Upload Memory", use_container_width=True)
             
             if submitted and uploaded_file and title:
-                return MediaUploadForm._create_media_entry(
-                    media_type,
-                    title,
-                    category,
-                    uploaded_file,
-                    description,
-                    people_tagged
-                )
+                try:
+                    return MediaUploadForm._create_media_entry(
+                        patient_id,
+                        media_type,
+                        title,
+                        category,
+                        uploaded_file,
+                        description,
+                        people_tagged
+                    )
+                except MediaIngestError as error:
+                    st.error(str(error))
             elif submitted:
                 st.error("Please provide both a title and file")
             
@@ -135,6 +147,7 @@ class MediaUploadForm:
     
     @staticmethod
     def _create_media_entry(
+        patient_id: str,
         media_type: str,
         title: str,
         category: str,
@@ -142,22 +155,24 @@ class MediaUploadForm:
         description: str,
         people_tagged: str
     ) -> Dict[str, Any]:
-        """Create media entry from form data."""
-        file_data = uploaded_file.read()
-        
-        return {
-            'id': str(uuid.uuid4()),
-            'title': title,
-            'media_type': media_type,
-            'category': category,
-            'description': description,
-            'people': people_tagged,
-            'file_name': uploaded_file.name,
-            'file_type': uploaded_file.type,
-            'file_data': file_data,
-            'uploaded_on': datetime.now().isoformat(),
-            'uploaded_by': "Family Member"
-        }
+        """Create and store media entry from form data."""
+        uploaded_file.seek(0)
+        return get_repository().ingest_media(
+            patient_id,
+            uploaded_file,
+            {
+                'id': str(uuid.uuid4()),
+                'title': title,
+                'media_type': media_type,
+                'category': category,
+                'description': description,
+                'people': people_tagged,
+                'file_name': uploaded_file.name,
+                'uploaded_on': datetime.now().isoformat(),
+                'uploaded_by': "Family Member"
+            },
+            uploaded_file.type
+        )
 
 
 class MediaFilter:
@@ -236,13 +251,23 @@ class MediaRenderer:
             uploaded_by = memory.get('uploaded_by', 'Unknown')
             st.caption(f"Uploaded by {uploaded_by} on {uploaded_date}")
             
+            if memory['media_type'] == 'Photo' and st.button(
+                "View Thumbnail" if MediaRenderer._showing_full(memory) else "View Full",
+                key=f"view_{memory['id']}",
+                use_container_width=True
+            ):
+                st.session_state[f"view_full_{memory['id']}"] = (
+                    not MediaRenderer._showing_full(memory)
+                )
+                st.rerun()
+            
             if st.button(
                 "Delete Memory",
                 key=f"del_{memory['id']}",
                 use_container_width=True
             ):
                 if st.session_state.get(f"confirm_delete_{memory['id']}", False):
-                    st.session_state.memory_book[patient_id].remove(memory)
+                    get_repository().delete_media(memory['id'])
                     st.success("Memory deleted")
                     st.rerun()
                 else:
@@ -251,13 +276,29 @@ class MediaRenderer:
     
     @staticmethod
     def _render_media_preview(memory: Dict[str, Any]) -> None:
-        """Render media preview."""
+        """Render media preview, a thumbnail for photos unless the full view was requested."""
+        repository = get_repository()
+        server = get_media_server()
+        
         if memory['media_type'] == 'Photo':
-            st.image(memory['file_data'], use_container_width=True)
+            if MediaRenderer._showing_full(memory):
+                st.image(
+                    server.url_for(memory) if server else repository.read_media_bytes(memory),
+                    use_container_width=True
+                )
+            elif server and repository.thumbnails.get(memory['blob_hash']):
+                st.image(server.thumbnail_url_for(memory), use_container_width=True)
+            else:
+                st.image(repository.read_media_preview(memory), use_container_width=True)
         elif memory['media_type'] == 'Video':
-            st.video(memory['file_data'])
+            st.video(server.url_for(memory) if server else repository.read_media_bytes(memory))
         elif memory['media_type'] == 'Audio':
-            st.audio(memory['file_data'])
+            st.audio(server.url_for(memory) if server else repository.read_media_bytes(memory))
+    
+    @staticmethod
+    def _showing_full(memory: Dict[str, Any]) -> bool:
+        """Check if the full-size original was requested for a media item."""
+        return st.session_state.get(f"view_full_{memory['id']}", False)
 
 
 class MediaStatistics:
@@ -291,21 +332,10 @@ class MemoryBookManager:
     Main memory book management controller.
     """
     
-    @staticmethod
-    def initialize_memory_book(patient_id: str) -> None:
-        """Initialize memory book for patient."""
-        if patient_id not in st.session_state.memory_book:
-            st.session_state.memory_book[patient_id] = []
-    
-    @staticmethod
-    def add_media(patient_id: str, media_data: Dict[str, Any]) -> None:
-        """Add media item to memory book."""
-        st.session_state.memory_book[patient_id].append(media_data)
-    
     @staticmethod
     def get_media(patient_id: str) -> List[Dict]:
         """Get all media for patient."""
-        return st.session_state.memory_book.get(patient_id, [])
+        return get_repository().get_media(patient_id)
 
 
 def render_page() -> None:
@@ -322,12 +352,9 @@ def render_page() -> None:
     
     st.divider()
     
-    MemoryBookManager.initialize_memory_book(patient_id)
-    
-    media_data = MediaUploadForm.render()
+    media_data = MediaUploadForm.render(patient_id)
     
     if media_data:
-        MemoryBookManager.add_media(patient_id, media_data)
         st.success(f"Memory '{media_data['title']}' uploaded successfully!")
         st.rerun()
     
@@ -0,0 +1,120 @@
+from typing import Dict, Any, NamedTuple, Tuple
+"""
+Medication Timing Module
+Typed, pre-parsed dosing schedule for medications.
+
+Times are parsed once when a medication is created: the 'HH:MM' string becomes a
+minute of day and the frequency is expanded into the minutes of every dose, so
+alert and render paths never parse or sort time strings.
+"""
+
+MINUTES_PER_DAY = 24 * 60
+
+FREQUENCY_INTERVALS = {
+    "Once daily": (0,),
+    "Twice daily": (0, 12 * 60),
+    "Three times daily": (0, 6 * 60, 12 * 60),
+    "Four times daily": (0, 4 * 60, 8 * 60, 12 * 60),
+    # As-needed medications keep their entered time as the reminder time
+    "As needed": (0,),
+}
+
+
+def parse_minute(time_text: str) -> int:
+    """
+    Convert an 'HH:MM' string to minutes since midnight.
+
+    Args:
+        time_text: Time in HH:MM format
+
+    Returns:
+        Minutes since midnight
+    """
+    hours, minutes = time_text.split(':')
+    return int(hours) * 60 + int(minutes)
+
+
+def format_minute(minute: int) -> str:
+    """
+    Convert minutes since midnight to an 'HH:MM' string.
+
+    Args:
+        minute: Minutes since midnight
+
+    Returns:
+        Time in HH:MM format
+    """
+    return f"{minute // 60:02d}:{minute % 60:02d}"
+
+
+class MedicationTiming(NamedTuple):
+    """
+    Parsed schedule of a medication.
+    """
+
+    minute: int
+    dose_minutes: Tuple[int, ...]
+    active: bool = True
+
+    @classmethod
+    def from_schedule(
+        cls,
+        time_text: str,
+        frequency: str,
+        active: bool = True
+    ) -> 'MedicationTiming':
+        """
+        Build the timing from form values.
+
+        Args:
+            time_text: First dose time in HH:MM format
+            frequency: Frequency option from the medication form
+            active: Whether the medication is active
+
+        Returns:
+            MedicationTiming instance
+        """
+        minute = parse_minute(time_text)
+        intervals = FREQUENCY_INTERVALS.get(frequency, (0,))
+        dose_minutes = tuple(sorted(
+            (minute + interval) % MINUTES_PER_DAY for interval in intervals
+        ))
+        return cls(minute, dose_minutes, active)
+
+    @classmethod
+    def from_medication(cls, medication: Dict[str, Any]) -> 'MedicationTiming':
+        """
+        Read the timing stored on a medication dictionary.
+        Medications saved before timings were stored are parsed once here.
+
+        Args:
+            medication: Medication dictionary
+
+        Returns:
+            MedicationTiming instance
+        """
+        active = medication.get('active', True)
+        if 'dose_minutes' in medication:
+            return cls(
+                medication['minute'],
+                tuple(medication['dose_minutes']),
+                active
+            )
+        return cls.from_schedule(
+            medication['time'],
+            medication.get('frequency', "Once daily"),
+            active
+        )
+
+    def to_fields(self) -> Dict[str, Any]:
+        """
+        Get the fields stored on the medication dictionary.
+
+        Returns:
+            Dictionary with 'minute', 'dose_minutes' and 'active'
+        """
+        return {
+            'minute': self.minute,
+            'dose_minutes': list(self.dose_minutes),
+            'active': self.active
+        }
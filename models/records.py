@@ -0,0 +1,332 @@
+import sys
+from dataclasses import dataclass, fields
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, List, Any, ClassVar, FrozenSet, Mapping, Optional, Tuple
+"""
+Records Module
+Slotted, typed records for patients, logs, medications, tasks and media.
+
+Stored documents stay JSON dictionaries and pages keep working on dictionaries;
+in-memory holders convert on the way in and out. The log index keeps each log
+as a DailyLog and the alert schedule keeps each medication as a Medication,
+converting back with to_dict() when they are read. A record is a slots
+dataclass without a per-instance __dict__, repeated strings such as
+'logged_by', dates and dosages are interned so equal values share one object,
+and small mappings such as the self-care flags, status positions and meal
+entries are shared read-only mappings, so thousands of logs with the same
+values hold one object each.
+
+from_dict() accepts a stored document and keeps unknown keys in 'extra';
+to_dict() returns a new document of plain containers, leaving out optional
+fields that are None, so records and dictionaries convert both ways without loss.
+"""
+
+@lru_cache(maxsize=None)
+def _shared(items: Tuple[Tuple[str, Any], ...]) -> Mapping[str, Any]:
+    """Return the one read-only mapping kept for a set of items."""
+    return MappingProxyType(dict(items))
+
+
+def share_mapping(values: Any) -> Any:
+    """
+    Get a shared read-only mapping equal to a small dictionary of flags or
+    scale positions, so records with the same values hold one object.
+
+    Args:
+        values: Mapping with hashable values
+
+    Returns:
+        Shared read-only mapping, or values unchanged if it is not a mapping
+        of hashable values
+    """
+    if not isinstance(values, Mapping):
+        return values
+    try:
+        return _shared(tuple(values.items()))
+    except TypeError:
+        return values
+
+
+SCALAR_TYPES = (str, int, float, bool, type(None))
+SELF_CARE_FIELDS = ('bathing', 'toileting', 'dressing', 'grooming', 'eating', 'mobility')
+SELF_CARE_DEFAULTS = share_mapping(dict.fromkeys(SELF_CARE_FIELDS, False))
+
+
+def _plain(value: Any) -> Any:
+    """Copy a record value into plain dictionaries and lists for callers and JSON."""
+    if type(value) in SCALAR_TYPES:
+        return value
+    if isinstance(value, Record):
+        return value.to_dict()
+    if isinstance(value, Mapping):
+        return {key: _plain(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_plain(item) for item in value]
+    return value
+
+
+@lru_cache(maxsize=None)
+def _field_names(record_type: type) -> Tuple[str, ...]:
+    """Names of a record type's document fields, in declaration order."""
+    return tuple(field.name for field in fields(record_type) if field.name != 'extra')
+
+
+class Record:
+    """
+    Shared conversion and interning for record dataclasses.
+
+    Subclasses list the string fields to intern in INTERNED, fields holding
+    nested records (or lists of them) in NESTED, fields holding small shareable
+    mappings in SHARED, fields holding dictionaries of shareable mappings in
+    SHARED_ENTRIES, and optional fields written even when None in KEEP_NONE.
+    """
+
+    __slots__ = ()
+
+    INTERNED: ClassVar[Tuple[str, ...]] = ()
+    NESTED: ClassVar[Dict[str, type]] = {}
+    SHARED: ClassVar[Tuple[str, ...]] = ()
+    SHARED_ENTRIES: ClassVar[Tuple[str, ...]] = ()
+    KEEP_NONE: ClassVar[FrozenSet[str]] = frozenset()
+
+    def __post_init__(self) -> None:
+        for name in self.INTERNED:
+            value = getattr(self, name)
+            if type(value) is str:
+                setattr(self, name, sys.intern(value))
+        for name, record_type in self.NESTED.items():
+            value = getattr(self, name)
+            if isinstance(value, dict):
+                setattr(self, name, record_type.from_dict(value))
+            elif isinstance(value, list):
+                setattr(self, name, [
+                    record_type.from_dict(item) if isinstance(item, dict) else item
+                    for item in value
+                ])
+        for name in self.SHARED:
+            setattr(self, name, share_mapping(getattr(self, name)))
+        for name in self.SHARED_ENTRIES:
+            value = getattr(self, name)
+            if isinstance(value, dict):
+                setattr(self, name, {
+                    key: share_mapping(item) for key, item in value.items()
+                })
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> 'Record':
+        """
+        Build a record from a stored document.
+
+        Args:
+            data: Document dictionary
+
+        Returns:
+            Record of this type; keys it does not declare are kept in 'extra'
+        """
+        names = _field_names(cls)
+        values = {key: value for key, value in data.items() if key in names}
+        if len(values) < len(data):
+            values['extra'] = {
+                key: value for key, value in data.items() if key not in names
+            }
+        return cls(**values)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convert the record back to its document form.
+
+        Returns:
+            New dictionary of plain containers that shares nothing with the record
+        """
+        data = {}
+        for name in _field_names(type(self)):
+            value = getattr(self, name)
+            if value is None and name not in self.KEEP_NONE:
+                continue
+            data[name] = value if type(value) in SCALAR_TYPES else _plain(value)
+        if self.extra:
+            data.update(_plain(self.extra))
+        return data
+
+
+@dataclass(slots=True)
+class Vitals(Record):
+    """
+    Vital signs recorded with a daily log.
+    """
+
+    temperature: Optional[float] = None
+    blood_pressure: Optional[str] = None
+    systolic: Optional[int] = None
+    diastolic: Optional[int] = None
+    heart_rate: Optional[int] = None
+    respiratory_rate: Optional[int] = None
+    oxygen_saturation: Optional[int] = None
+    weight: Optional[float] = None
+    extra: Optional[Dict[str, Any]] = None
+
+    INTERNED: ClassVar[Tuple[str, ...]] = ('blood_pressure',)
+    KEEP_NONE: ClassVar[FrozenSet[str]] = frozenset({'systolic', 'diastolic'})
+
+
+@dataclass(slots=True)
+class MedicationAdministration(Record):
+    """
+    One dose given, as recorded on the day's log.
+    """
+
+    id: str
+    date: Optional[str] = None
+    medication: Optional[str] = None
+    dosage: Optional[str] = None
+    time_given: Optional[str] = None
+    scheduled_time: Optional[str] = None
+    given_by: Optional[str] = None
+    extra: Optional[Dict[str, Any]] = None
+
+    INTERNED: ClassVar[Tuple[str, ...]] = (
+        'medication', 'dosage', 'time_given', 'scheduled_time', 'given_by'
+    )
+
+
+@dataclass(slots=True)
+class DailyLog(Record):
+    """
+    A daily care log, or a medication-only day record.
+    """
+
+    id: str
+    date: str
+    time: Optional[str] = None
+    timestamp: Optional[str] = None
+    vitals: Optional[Vitals] = None
+    activities: Optional[Mapping[str, Any]] = None
+    self_care: Optional[Mapping[str, bool]] = None
+    meals: Optional[Dict[str, Any]] = None
+    medications_given: Optional[List[MedicationAdministration]] = None
+    general_notes: Optional[str] = None
+    incidents: Optional[str] = None
+    logged_by: Optional[str] = None
+    extra: Optional[Dict[str, Any]] = None
+
+    INTERNED: ClassVar[Tuple[str, ...]] = ('date', 'time', 'logged_by')
+    NESTED: ClassVar[Dict[str, type]] = {
+        'vitals': Vitals,
+        'medications_given': MedicationAdministration,
+    }
+    SHARED: ClassVar[Tuple[str, ...]] = ('activities', 'self_care')
+    SHARED_ENTRIES: ClassVar[Tuple[str, ...]] = ('meals',)
+
+
+@dataclass(slots=True)
+class Patient(Record):
+    """
+    A registered resident.
+    """
+
+    id: str
+    patient_id_number: Optional[str] = None
+    name: Optional[str] = None
+    age: Optional[int] = None
+    dob: Optional[str] = None
+    gender: Optional[str] = None
+    room: Optional[str] = None
+    diagnosis_date: Optional[str] = None
+    stage: Optional[str] = None
+    address: Optional[str] = None
+    phone: Optional[str] = None
+    email: Optional[str] = None
+    gp_name: Optional[str] = None
+    gp_phone: Optional[str] = None
+    gp_practice: Optional[str] = None
+    gp_email: Optional[str] = None
+    emergency_contacts: Optional[List[Dict[str, Any]]] = None
+    family_members: Optional[List[Dict[str, Any]]] = None
+    allergies: Optional[str] = None
+    medical_conditions: Optional[str] = None
+    mobility: Optional[str] = None
+    dietary_requirements: Optional[str] = None
+    care_notes: Optional[str] = None
+    created_date: Optional[str] = None
+    extra: Optional[Dict[str, Any]] = None
+
+    INTERNED: ClassVar[Tuple[str, ...]] = (
+        'gender', 'stage', 'mobility', 'gp_name', 'gp_practice', 'created_date'
+    )
+
+
+@dataclass(slots=True)
+class Medication(Record):
+    """
+    A prescribed medication with its parsed dosing schedule.
+    """
+
+    id: str
+    name: Optional[str] = None
+    dosage: Optional[str] = None
+    frequency: Optional[str] = None
+    time: Optional[str] = None
+    route: Optional[str] = None
+    prescriber: Optional[str] = None
+    purpose: Optional[str] = None
+    start_date: Optional[str] = None
+    end_date: Optional[str] = None
+    minute: Optional[int] = None
+    dose_minutes: Optional[List[int]] = None
+    active: Optional[bool] = None
+    extra: Optional[Dict[str, Any]] = None
+
+    INTERNED: ClassVar[Tuple[str, ...]] = (
+        'name', 'dosage', 'frequency', 'time', 'route', 'prescriber', 'start_date'
+    )
+    KEEP_NONE: ClassVar[FrozenSet[str]] = frozenset({'end_date'})
+
+
+@dataclass(slots=True)
+class Task(Record):
+    """
+    A care task on a patient's task list.
+    """
+
+    id: str
+    task: Optional[str] = None
+    priority: Optional[str] = None
+    time: Optional[str] = None
+    notes: Optional[str] = None
+    recurring: Optional[bool] = None
+    completed: Optional[bool] = None
+    created_date: Optional[str] = None
+    created_by: Optional[str] = None
+    completed_at: Optional[str] = None
+    completed_by: Optional[str] = None
+    extra: Optional[Dict[str, Any]] = None
+
+    INTERNED: ClassVar[Tuple[str, ...]] = (
+        'task', 'priority', 'time', 'created_date', 'created_by', 'completed_by'
+    )
+
+
+@dataclass(slots=True)
+class MediaItem(Record):
+    """
+    A photo, video or audio clip in a patient's memory book.
+    """
+
+    id: str
+    title: Optional[str] = None
+    media_type: Optional[str] = None
+    file_name: Optional[str] = None
+    file_type: Optional[str] = None
+    file_size: Optional[int] = None
+    blob_hash: Optional[str] = None
+    category: Optional[str] = None
+    description: Optional[str] = None
+    people: Optional[str] = None
+    uploaded_on: Optional[str] = None
+    uploaded_by: Optional[str] = None
+    extra: Optional[Dict[str, Any]] = None
+
+    INTERNED: ClassVar[Tuple[str, ...]] = (
+        'media_type', 'category', 'file_type', 'uploaded_by'
+    )
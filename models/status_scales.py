@@ -0,0 +1,140 @@
+from typing import Dict, Any, Optional, Tuple
+"""
+Status Scales Module
+Shared lookup tables for the daily status sliders and meal amounts.
+
+Each slider is an ordinal scale of five labels. Logs store the position of the
+chosen label (0 for the lowest, 4 for the highest) instead of the label text,
+so a log's status fields are small integers and per-patient status arrays fit
+in int8 columns. Labels are looked up again only when a value is displayed or
+exported. Logs saved before the encoding keep working: decoding passes label
+text through unchanged and encoding accepts either form.
+"""
+
+STATUS_SCALES: Dict[str, Tuple[str, ...]] = {
+    'mood': ("Very Low", "Low", "Neutral", "Good", "Very Good"),
+    'sleep_quality': ("Very Poor", "Poor", "Fair", "Good", "Excellent"),
+    'appetite': ("None", "Poor", "Fair", "Good", "Excellent"),
+    'activity_level': ("Bedridden", "Limited", "Moderate", "Active", "Very Active"),
+    'social_engagement': ("None", "Minimal", "Moderate", "Good", "Excellent"),
+    'communication': ("Non-verbal", "Very Limited", "Limited", "Good", "Excellent"),
+}
+MEAL_AMOUNTS: Tuple[str, ...] = ("None", "25%", "50%", "75%", "100%")
+MEALS = ['breakfast', 'lunch', 'dinner']
+
+
+def encode_value(labels: Tuple[str, ...], value: Any) -> Optional[int]:
+    """
+    Encode a scale value as its ordinal position.
+
+    Args:
+        labels: Scale labels from lowest to highest
+        value: Label text, an already encoded position, or None
+
+    Returns:
+        Position in the scale, or None if missing or not on the scale
+    """
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value if 0 <= value < len(labels) else None
+    try:
+        return labels.index(value)
+    except ValueError:
+        return None
+
+
+def decode_value(labels: Tuple[str, ...], code: Any, default: Optional[str] = None) -> Optional[str]:
+    """
+    Look up the label of an encoded scale value.
+
+    Args:
+        labels: Scale labels from lowest to highest
+        code: Ordinal position, legacy label text, or None
+        default: Returned when the value is missing or off the scale
+
+    Returns:
+        Label text
+    """
+    if isinstance(code, str):
+        return code
+    if isinstance(code, int) and 0 <= code < len(labels):
+        return labels[code]
+    return default
+
+
+def status_label(activities: Dict[str, Any], field: str, default: Optional[str] = None) -> Optional[str]:
+    """
+    Get the display label of a status field.
+
+    Args:
+        activities: Log 'activities' dictionary
+        field: Status field name, a key of STATUS_SCALES
+        default: Returned when the field was not recorded
+
+    Returns:
+        Label text
+    """
+    return decode_value(STATUS_SCALES[field], activities.get(field), default)
+
+
+def meal_label(meal: Dict[str, Any], default: Optional[str] = None) -> Optional[str]:
+    """
+    Get the display label of a meal's eaten amount.
+
+    Args:
+        meal: Meal dictionary with 'amount' and 'calories'
+        default: Returned when the amount was not recorded
+
+    Returns:
+        Label text such as "75%"
+    """
+    return decode_value(MEAL_AMOUNTS, meal.get('amount'), default)
+
+
+def encode_status(log: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Encode the status fields and meal amounts of a log.
+
+    Args:
+        log: Log entry dictionary with labels or positions
+
+    Returns:
+        New log dictionary storing positions
+    """
+    encoded = dict(log)
+    if log.get('activities'):
+        encoded['activities'] = {
+            field: (
+                encode_value(STATUS_SCALES[field], value)
+                if field in STATUS_SCALES else value
+            )
+            for field, value in log['activities'].items()
+        }
+    if log.get('meals'):
+        meals = dict(log['meals'])
+        for meal in MEALS:
+            if isinstance(meals.get(meal), dict):
+                meals[meal] = {
+                    **meals[meal],
+                    'amount': encode_value(MEAL_AMOUNTS, meals[meal].get('amount')),
+                }
+        encoded['meals'] = meals
+    return encoded
+
+
+def is_encoded(log: Dict[str, Any]) -> bool:
+    """
+    Check whether a log's status fields and meal amounts are all positions.
+
+    Args:
+        log: Log entry dictionary
+
+    Returns:
+        False if any status field or meal amount is stored as label text
+    """
+    values = list((log.get('activities') or {}).values())
+    values += [
+        meal.get('amount') for meal in
+        ((log.get('meals') or {}).get(name) for name in MEALS)
+        if isinstance(meal, dict)
+    ]
+    return not any(isinstance(value, str) for value in values)
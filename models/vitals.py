@@ -0,0 +1,106 @@
+import re
+from typing import Dict, Any, NamedTuple, Optional
+"""
+Blood Pressure Module
+Structured blood pressure readings for daily log vitals.
+
+Blood pressure is entered as free text ("120/80"). It is parsed once, when the
+log is saved, into 'systolic' and 'diastolic' integers stored next to the
+entered text, so exports, trend arrays and charts read numbers instead of
+parsing strings. The text is kept in the canonical "120/80" form for display.
+"""
+
+SYSTOLIC_RANGE = (50, 300)
+DIASTOLIC_RANGE = (20, 200)
+
+BLOOD_PRESSURE_PATTERN = re.compile(
+    r'^\s*(\d{2,3})\s*[/\\-]\s*(\d{2,3})\s*(?:mm\s*hg)?\s*$',
+    re.IGNORECASE
+)
+
+
+class BloodPressure(NamedTuple):
+    """
+    Parsed blood pressure reading in mmHg.
+    """
+
+    systolic: int
+    diastolic: int
+
+    @classmethod
+    def parse(cls, text: str) -> 'BloodPressure':
+        """
+        Parse and validate a reading such as "120/80" or "120 / 80 mmHg".
+
+        Args:
+            text: Entered blood pressure
+
+        Returns:
+            BloodPressure reading
+
+        Raises:
+            ValueError: If the text is not a plausible systolic/diastolic pair
+        """
+        match = BLOOD_PRESSURE_PATTERN.match(text)
+        if not match:
+            raise ValueError(f"Blood pressure should look like 120/80, not '{text}'")
+
+        reading = cls(int(match.group(1)), int(match.group(2)))
+        if not SYSTOLIC_RANGE[0] <= reading.systolic <= SYSTOLIC_RANGE[1]:
+            raise ValueError(f"Systolic pressure {reading.systolic} is out of range")
+        if not DIASTOLIC_RANGE[0] <= reading.diastolic <= DIASTOLIC_RANGE[1]:
+            raise ValueError(f"Diastolic pressure {reading.diastolic} is out of range")
+        if reading.diastolic >= reading.systolic:
+            raise ValueError("Systolic pressure must be higher than diastolic pressure")
+        return reading
+
+    def __str__(self) -> str:
+        return f"{self.systolic}/{self.diastolic}"
+
+
+def parse_blood_pressure(text: Optional[str]) -> Optional[BloodPressure]:
+    """
+    Parse an optional blood pressure entry.
+
+    Args:
+        text: Entered blood pressure, empty or None if not taken
+
+    Returns:
+        BloodPressure reading, or None if nothing was entered
+
+    Raises:
+        ValueError: If the entry is not a valid reading
+    """
+    if text is None or not str(text).strip():
+        return None
+    return BloodPressure.parse(str(text))
+
+
+def structure_vitals(vitals: Dict[str, Any], strict: bool = True) -> Dict[str, Any]:
+    """
+    Add 'systolic' and 'diastolic' integers to a vitals dictionary.
+
+    Args:
+        vitals: Vitals dictionary with a free-text 'blood_pressure'
+        strict: Raise for an invalid reading; if False, keep the text as
+            entered and store None for both numbers
+
+    Returns:
+        New vitals dictionary with canonical 'blood_pressure' text
+
+    Raises:
+        ValueError: If strict and the reading is invalid
+    """
+    try:
+        reading = parse_blood_pressure(vitals.get('blood_pressure'))
+    except ValueError:
+        if strict:
+            raise
+        reading = None
+
+    structured = dict(vitals)
+    if reading is not None:
+        structured['blood_pressure'] = str(reading)
+    structured['systolic'] = reading.systolic if reading is not None else None
+    structured['diastolic'] = reading.diastolic if reading is not None else None
+    return structured
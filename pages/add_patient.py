@@ -2,6 +2,8 @@ import streamlit as st
 from datetime import date
 from typing import Dict, List, Any
 import uuid
+
+from storage.repository import get_repository
 """
 Add Patient Module
 Handles the creation and registration of new dementia patients in the system.
@@ -211,27 +213,22 @@ class PatientValidator:
         return True, ""
     
     @staticmethod
-    def check_duplicate_id(patient_id: str, existing_patients: Dict) -> bool:
+    def check_duplicate_id(patient_id: str) -> bool:
         """
         Check if patient ID already exists.
         
         Args:
             patient_id: Patient ID to check
-            existing_patients: Dictionary of existing patients
             
         Returns:
             True if ID exists, False otherwise
         """
-        existing_ids = [
-            p.get('patient_id_number')
-            for p in existing_patients.values()
-        ]
-        return patient_id in existing_ids
+        return get_repository().patient_id_number_exists(patient_id)
 
 
 class PatientDataManager:
     """
-    Manages patient data creation and storage in session state.
+    Manages patient data creation and storage in the care repository.
     """
     @staticmethod
     def create_patient_record(
@@ -284,15 +281,11 @@ class PatientDataManager:
     @staticmethod
     def save_patient(patient_data: Dict[str, Any]) -> None:
         """
-        Save patient data to session state and initialize related data structures.
+        Save patient data to the care repository.
         Args:
             patient_data: Complete patient record to save
         """
-        patient_id = patient_data['id']
-        st.session_state.patients[patient_id] = patient_data
-        st.session_state.tasks[patient_id] = []
-        st.session_state.medications[patient_id] = []
-        st.session_state.daily_logs[patient_id] = []
+        get_repository().save_patient(patient_data)
 
 
 def render_page() -> None:
@@ -323,10 +316,7 @@ def render_page() -> None:
             st.error(f"Please fill in all required fields: {error_message}")
             return
         
-        if PatientValidator.check_duplicate_id(
-            basic_info['patient_id_number'],
-            st.session_state.patients
-        ):
+        if PatientValidator.check_duplicate_id(basic_info['patient_id_number']):
             st.error(
                 f"Patient ID {basic_info['patient_id_number']} already exists. "
                 "Please use a different ID."
@@ -2,6 +2,11 @@ import streamlit as st
 from datetime import datetime, date
 from typing import Dict, Any, Optional
 import uuid
+
+from models.records import SELF_CARE_DEFAULTS
+from models.status_scales import STATUS_SCALES, MEAL_AMOUNTS, status_label
+from models.vitals import structure_vitals
+from storage.repository import get_repository
 """
 Daily Logs Module
 Handles recording of daily care observations, vitals, and nutrition tracking.
@@ -18,7 +23,8 @@ class PatientSelector:
     def render_selector() -> Optional[tuple[str, str]]:
         """
         """
-        if not st.session_state.patients:
+        patients = get_repository().list_patients()
+        if not patients:
             st.warning("No patients registered. Please add a patient first.")
             if st.button("Add Patient"):
                 st.switch_page("pages/add_patient.py")
@@ -26,7 +32,7 @@ class PatientSelector:
         default_index = 0
         if st.session_state.current_patient:
             try:
-                default_index = list(st.session_state.patients.keys()).index(
+                default_index = list(patients.keys()).index(
                     st.session_state.current_patient
                 )
             except ValueError:
@@ -34,7 +40,7 @@ class PatientSelector:
         
         patient_names = {
             pid: p['name'] 
-            for pid, p in st.session_state.patients.items()
+            for pid, p in patients.items()
         }
         
         selected_patient_name = st.selectbox(
@@ -73,7 +79,7 @@ class VitalsFormRenderer:
             )
             blood_pressure = st.text_input(
                 "Blood Pressure",
-                placeholder=""
+                placeholder="e.g. 120/80"
             )
         with col2:
             heart_rate = st.number_input(
@@ -112,44 +118,35 @@ class StatusFormRenderer:
     """
     """
     @staticmethod
-    def render() -> Dict[str, str]:
+    def _slider(label: str, field: str, default: str) -> int:
+        """Render a status slider and return the position of the chosen label."""
+        labels = STATUS_SCALES[field]
+        return st.select_slider(
+            label,
+            options=range(len(labels)),
+            value=labels.index(default),
+            format_func=labels.__getitem__
+        )
+
+    @staticmethod
+    def render() -> Dict[str, int]:
         """
         """
         st.write("### Daily Status")
         col1, col2, col3 = st.columns(3)
         
         with col1:
-            mood = st.select_slider(
-                "Mood",
-                options=["Very Low", "Low", "Neutral", "Good", "Very Good"],
-                value="Neutral"
-            )
-            sleep_quality = st.select_slider(
-                "Sleep",
-                options=["Very Poor", "Poor", "Fair", "Good", "Excellent"],
-                value="Fair"
-            )
+            mood = StatusFormRenderer._slider("Mood", 'mood', "Neutral")
+            sleep_quality = StatusFormRenderer._slider("Sleep", 'sleep_quality', "Fair")
         with col2:
-            appetite = st.select_slider(
-                "Appetite",
-                options=["None", "Poor", "Fair", "Good", "Excellent"],
-                value="Good"
-            )
-            activity_level = st.select_slider(
-                "Activity",
-                options=["Bedridden", "Limited", "Moderate", "Active", "Very Active"],
-                value="Moderate"
-            )
+            appetite = StatusFormRenderer._slider("Appetite", 'appetite', "Good")
+            activity_level = StatusFormRenderer._slider("Activity", 'activity_level', "Moderate")
         with col3:
-            social_engagement = st.select_slider(
-                "Social",
-                options=["None", "Minimal", "Moderate", "Good", "Excellent"],
-                value="Moderate"
+            social_engagement = StatusFormRenderer._slider(
+                "Social", 'social_engagement', "Moderate"
             )
-            communication = st.select_slider(
-                "Communication",
-                options=["Non-verbal", "Very Limited", "Limited", "Good", "Excellent"],
-                value="Good"
+            communication = StatusFormRenderer._slider(
+                "Communication", 'communication', "Good"
             )
         return {
             'mood': mood,
@@ -166,6 +163,16 @@ class NutritionFormRenderer:
     Handles meal consumption, calorie tracking, and fluid intake.
     """
     
+    @staticmethod
+    def _amount_slider(label: str) -> int:
+        """Render a meal amount slider and return the position of the chosen amount."""
+        return st.select_slider(
+            label,
+            options=range(len(MEAL_AMOUNTS)),
+            value=MEAL_AMOUNTS.index("75%"),
+            format_func=MEAL_AMOUNTS.__getitem__
+        )
+    
     @staticmethod
     def render() -> Dict[str, Any]:
         """
@@ -175,21 +182,9 @@ class NutritionFormRenderer:
         col1, col2 = st.columns(2)
         
         with col1:
-            breakfast_eaten = st.select_slider(
-                "Breakfast",
-                options=["None", "25%", "50%", "75%", "100%"],
-                value="75%"
-            )
-            lunch_eaten = st.select_slider(
-                "Lunch",
-                options=["None", "25%", "50%", "75%", "100%"],
-                value="75%"
-            )
-            dinner_eaten = st.select_slider(
-                "Dinner",
-                options=["None", "25%", "50%", "75%", "100%"],
-                value="75%"
-            )
+            breakfast_eaten = NutritionFormRenderer._amount_slider("Breakfast")
+            lunch_eaten = NutritionFormRenderer._amount_slider("Lunch")
+            dinner_eaten = NutritionFormRenderer._amount_slider("Dinner")
         
         with col2:
             breakfast_cal = st.number_input(
@@ -290,14 +285,7 @@ class DailyLogManager:
             'timestamp': datetime.now().isoformat(),
             'vitals': vitals,
             'activities': activities,
-            'self_care': {
-                'bathing': False,
-                'toileting': False,
-                'dressing': False,
-                'grooming': False,
-                'eating': False,
-                'mobility': False
-            },
+            'self_care': dict(SELF_CARE_DEFAULTS),
             'meals': meals,
             'general_notes': notes['general_notes'],
             'incidents': notes['incidents'],
@@ -308,10 +296,7 @@ class DailyLogManager:
     def save_log(patient_id: str, log_entry: Dict[str, Any]) -> None:
         """
         """
-        if patient_id not in st.session_state.daily_logs:
-            st.session_state.daily_logs[patient_id] = []
-        
-        st.session_state.daily_logs[patient_id].append(log_entry)
+        get_repository().save_log(patient_id, log_entry)
 
 
 class RecentLogsDisplay:
@@ -331,19 +316,13 @@ class RecentLogsDisplay:
         st.divider()
         st.subheader("Recent Logs")
         
-        if patient_id not in st.session_state.daily_logs:
-            st.info("No logs recorded yet for this patient")
-            return
+        recent_logs = get_repository().get_recent_logs(patient_id, num_logs)
         
-        logs = st.session_state.daily_logs[patient_id]
-        
-        if not logs:
+        if not recent_logs:
             st.info("No logs recorded yet for this patient")
             return
         
-        sorted_logs = sorted(logs, key=lambda x: x['timestamp'], reverse=True)
-        
-        for log in sorted_logs[:num_logs]:
+        for log in recent_logs:
             RecentLogsDisplay._render_log_summary(log)
         
         if st.button("View All Logs"):
@@ -356,21 +335,26 @@ class RecentLogsDisplay:
 
         """
         with st.expander(
-            f"{log['date']} at {log['time']} - by {log['logged_by']}"
+            f"{log['date']} at {log.get('time', 'N/A')} - "
+            f"by {log.get('logged_by', 'N/A')}"
         ):
             col1, col2 = st.columns(2)
             
             with col1:
-                st.write("**Vitals:**")
-                st.write(f"Temp: {log['vitals']['temperature']}°C | "
-                        f"BP: {log['vitals']['blood_pressure']}")
-                st.write(f"Heart Rate: {log['vitals']['heart_rate']} bpm | "
-                        f"O2: {log['vitals']['oxygen_saturation']}%")
+                vitals = log.get('vitals')
+                if vitals:
+                    st.write("**Vitals:**")
+                    st.write(f"Temp: {vitals.get('temperature', 'N/A')}°C | "
+                            f"BP: {vitals.get('blood_pressure') or 'N/A'}")
+                    st.write(f"Heart Rate: {vitals.get('heart_rate', 'N/A')} bpm | "
+                            f"O2: {vitals.get('oxygen_saturation', 'N/A')}%")
                 
-                st.write("**Status:**")
-                st.write(f"Mood: {log['activities']['mood']} | "
-                        f"Sleep: {log['activities']['sleep_quality']}")
-                st.write(f"Appetite: {log['activities']['appetite']}")
+                activities = log.get('activities')
+                if activities:
+                    st.write("**Status:**")
+                    st.write(f"Mood: {status_label(activities, 'mood', 'N/A')} | "
+                            f"Sleep: {status_label(activities, 'sleep_quality', 'N/A')}")
+                    st.write(f"Appetite: {status_label(activities, 'appetite', 'N/A')}")
             
             with col2:
                 if log.get('meals'):
@@ -378,6 +362,11 @@ class RecentLogsDisplay:
                     st.write(f"Calories: {log['meals'].get('total_calories', 0)} kcal")
                     st.write(f"Fluids: {log['meals'].get('total_fluids', 0)} ml")
                 
+                if log.get('medications_given'):
+                    st.write("**Medications Given:**")
+                    for med in log['medications_given']:
+                        st.write(f"{med.get('medication', 'N/A')} at {med.get('time_given', 'N/A')}")
+                
                 if log.get('incidents'):
                     st.warning(f"**Incidents:** {log['incidents']}")
             
@@ -398,7 +387,9 @@ def render_page() -> None:
     
     st.divider()
     
-    with st.form("daily_log_form", clear_on_submit=True):
+    form_version = st.session_state.setdefault('daily_log_form_version', 0)
+    
+    with st.form(f"daily_log_form_{form_version}"):
         log_date = st.date_input(
             "Date",
             value=date.today(),
@@ -413,18 +404,24 @@ def render_page() -> None:
         submitted = st.form_submit_button("Save Log", use_container_width=True)
     
     if submitted:
-        log_entry = DailyLogManager.create_log_entry(
-            log_date,
-            vitals,
-            activities,
-            meals,
-            notes
-        )
-        
-        DailyLogManager.save_log(patient_id, log_entry)
-        
-        st.success(f"Log saved for {patient_name}")
-        st.rerun()
+        try:
+            vitals = structure_vitals(vitals)
+        except ValueError as error:
+            st.error(str(error))
+        else:
+            log_entry = DailyLogManager.create_log_entry(
+                log_date,
+                vitals,
+                activities,
+                meals,
+                notes
+            )
+            
+            DailyLogManager.save_log(patient_id, log_entry)
+            
+            st.success(f"Log saved for {patient_name}")
+            st.session_state.daily_log_form_version += 1
+            st.rerun()
     
     RecentLogsDisplay.render(patient_id, patient_name)
 
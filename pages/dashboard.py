@@ -1,6 +1,8 @@
+import os
 import streamlit as st
-from datetime import  date
 from typing import Dict, Any
+
+from storage.repository import get_repository
 """
 Dashboard Module
 Main overview page displaying key metrics and quick access to patient information.
@@ -9,6 +11,9 @@ This module provides carers with a comprehensive overview of daily priorities,
 including pending tasks, medication schedules, and patient quick access cards.
 """
 
+VERIFY_COUNTERS = os.environ.get('CARE_VERIFY_DASHBOARD_COUNTERS') == '1'
+
+
 class DashboardMetrics:
     """
     Calculates and displays dashboard statistics.
@@ -16,78 +21,42 @@ class DashboardMetrics:
     
     @staticmethod
     def render() -> None:
-        """Render key metrics in the dashboard header."""
+        """
+        Render key metrics in the dashboard header. The totals are kept up to
+        date by the repository on every write; set CARE_VERIFY_DASHBOARD_COUNTERS=1
+        to recount them on each render and report any drift.
+        """
         col1, col2, col3, col4 = st.columns(4)
-        
-        total_patients = DashboardMetrics._count_total_patients()
-        pending_tasks = DashboardMetrics._count_pending_tasks()
-        today_medications = DashboardMetrics._count_today_medications()
-        today_logs = DashboardMetrics._count_today_logs()
+
+        repository = get_repository()
+        if VERIFY_COUNTERS:
+            DashboardMetrics._report_mismatches(repository.check_dashboard_counts())
+        counts = repository.get_dashboard_counts()
         
         with col1:
-            st.metric("Total Patients", total_patients)
+            st.metric("Total Patients", counts['patients'])
         
         with col2:
-            st.metric("Pending Tasks", pending_tasks)
+            st.metric("Pending Tasks", counts['pending_tasks'])
         
         with col3:
-            st.metric("Today's Medications", today_medications)
+            st.metric("Today's Medications", counts['active_medications'])
         
         with col4:
-            st.metric("Logs Today", today_logs)
-    
-    @staticmethod
-    def _count_total_patients() -> int:
-        """
-        Count total number of registered patients.
-        
-        Returns:
-            Number of patients
-        """
-        return len(st.session_state.patients)
-    
-    @staticmethod
-    def _count_pending_tasks() -> int:
-        """
-        Counts total number of pending tasks across all patients.
-        
-        Returns:
-            Number of pending tasks
-        """
-        pending_count = 0
-        for patient_id, task_list in st.session_state.tasks.items():
-            pending_count += sum(
-                1 for task in task_list
-                if not task.get('completed', False)
-            )
-        return pending_count
-    
-    @staticmethod
-    def _count_today_medications() -> int:
-        """
-        Counts total medications scheduled for today.
+            st.metric("Logs Today", counts['logs_today'])
 
-        """
-        medication_count = 0
-        for patient_id, meds in st.session_state.medications.items():
-            medication_count += len(meds)
-        return medication_count
-    
     @staticmethod
-    def _count_today_logs() -> int:
+    def _report_mismatches(mismatches: Dict[str, tuple]) -> None:
         """
-        Counts the number of logs recorded today.
+        Warn about maintained counters that differed from a full recount.
+
+        Args:
+            mismatches: Counter name -> (maintained, recounted)
         """
-        today = date.today().isoformat()
-        log_count = 0
-        
-        for logs in st.session_state.daily_logs.values():
-            log_count += sum(
-                1 for log in logs
-                if log.get('date') == today
+        for name, (maintained, recounted) in mismatches.items():
+            st.warning(
+                f"Dashboard counter '{name}' was {maintained}, recounted {recounted}"
             )
-        
-        return log_count
 
 
 class TaskOverview:
@@ -100,39 +69,30 @@ class TaskOverview:
         """Render pending tasks overview."""
         st.subheader("Pending Tasks")
         
-        if not st.session_state.tasks:
+        repository = get_repository()
+        pending_by_patient = repository.get_pending_tasks()
+        
+        if not pending_by_patient:
             st.info("No pending tasks")
             return
         
-        has_pending = False
+        patients = repository.list_patients()
         
-        for patient_id, task_list in st.session_state.tasks.items():
-            patient_name = st.session_state.patients.get(
-                patient_id, {}
-            ).get('name', 'Unknown')
+        for patient_id, pending_tasks in pending_by_patient.items():
+            patient_name = patients.get(patient_id, {}).get('name', 'Unknown')
             
-            pending_tasks = [
-                task for task in task_list
-                if not task.get('completed', False)
-            ]
+            st.write(f"**{patient_name}**")
             
-            if pending_tasks:
-                has_pending = True
-                st.write(f"**{patient_name}**")
+            for task in pending_tasks:
+                priority_emoji = TaskOverview._get_priority_emoji(
+                    task.get('priority', 'Low')
+                )
+                task_text = f"{priority_emoji} {task['task']}"
                 
-                for task in pending_tasks:
-                    priority_emoji = TaskOverview._get_priority_emoji(
-                        task.get('priority', 'Low')
-                    )
-                    task_text = f"{priority_emoji} {task['task']}"
-                    
-                    if task.get('time'):
-                        task_text += f" (at {task['time']})"
-                    
-                    st.write(f"  - {task_text}")
-        
-        if not has_pending:
-            st.info("No pending tasks")
+                if task.get('time'):
+                    task_text += f" (at {task['time']})"
+                
+                st.write(f"  - {task_text}")
     
     @staticmethod
     def _get_priority_emoji(priority: str) -> str:
@@ -164,35 +124,24 @@ class MedicationSchedule:
         """Render medication schedule overview."""
         st.subheader("Today's Medications")
         
-        if not st.session_state.medications:
+        repository = get_repository()
+        active_by_patient = repository.get_active_medications()
+        
+        if not active_by_patient:
             st.info("No medications scheduled")
             return
         
-        has_medications = False
+        patients = repository.list_patients()
         
-        for patient_id, meds in st.session_state.medications.items():
-            patient_name = st.session_state.patients.get(
-                patient_id, {}
-            ).get('name', 'Unknown')
+        for patient_id, active_meds in active_by_patient.items():
+            patient_name = patients.get(patient_id, {}).get('name', 'Unknown')
             
-            active_meds = [
-                med for med in meds
-                if med.get('active', True)
-            ]
+            st.write(f"**{patient_name}**")
             
-            if active_meds:
-                has_medications = True
-                st.write(f"**{patient_name}**")
-                
-                sorted_meds = sorted(active_meds, key=lambda x: x['time'])
-                
-                for med in sorted_meds:
-                    st.write(
-                        f"  - {med['time']}: {med['name']} ({med['dosage']})"
-                    )
-        
-        if not has_medications:
-            st.info("No medications scheduled")
+            for med in active_meds:
+                st.write(
+                    f"  - {med['time']}: {med['name']} ({med['dosage']})"
+                )
 
 
 class PatientQuickAccess:
@@ -206,7 +155,9 @@ class PatientQuickAccess:
         """
         st.subheader("Quick Patient Access")
         
-        if not st.session_state.patients:
+        patients = get_repository().list_patients()
+        
+        if not patients:
             st.info("No patients registered yet. Add a patient to get started.")
             if st.button("Add Patient"):
                 st.switch_page("pages/add_patient.py")
@@ -214,9 +165,7 @@ class PatientQuickAccess:
         
         cols = st.columns(3)
         
-        for idx, (patient_id, patient) in enumerate(
-            st.session_state.patients.items()
-        ):
+        for idx, (patient_id, patient) in enumerate(patients.items()):
             with cols[idx % 3]:
                 PatientQuickAccess._render_patient_card(patient_id, patient)
     
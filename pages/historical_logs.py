@@ -9,8 +9,16 @@ identify patterns, and export data for reporting purposes.
 import streamlit as st
 from datetime import datetime, date, timedelta
 from typing import Dict, List, Any, Optional, Tuple
-import pandas as pd
 import calendar
+
+import pandas as pd
+
+from models.status_scales import STATUS_SCALES, meal_label, status_label
+from pages.log_sections import LogSectionRenderer, formatted_logs
+from reports.export_jobs import get_export_queue
+from reports.status_trends import status_summary, weekly_low_meal_share, weekly_mean
+from reports.vitals_trends import TREND_WINDOWS, trend_columns, trend_summaries
+from storage.repository import get_repository
 """
 Provides both calendar-based and date-range views of patient care logs.
 This module allows doctors and carers to review past care records,
@@ -27,11 +35,12 @@ class LogViewSelector:
         Render view mode selector.
         
         Returns:
-            Selected view mode ('Calendar View' or 'Date Range')
+            Selected view mode ('Calendar View', 'Date Range', 'Vitals Trends'
+            or 'Status Trends')
         """
         return st.radio(
             "View Mode",
-            ["Calendar View", "Date Range"],
+            ["Calendar View", "Date Range", "Vitals Trends", "Status Trends"],
             horizontal=True
         )
 
@@ -48,7 +57,7 @@ class CalendarViewController:
         
         st.divider()
         
-        if patient_id not in st.session_state.daily_logs:
+        if not get_repository().has_logs(patient_id):
             st.info("No logs recorded yet for this patient")
             return
         
@@ -98,21 +107,21 @@ class CalendarViewController:
         """
         Get all logs for specified month.
         """
-        all_logs = st.session_state.daily_logs[patient_id]
-        
         month_start = date(year, month, 1)
         if month == 12:
             month_end = date(year + 1, 1, 1) - timedelta(days=1)
         else:
             month_end = date(year, month + 1, 1) - timedelta(days=1)
         
+        month_logs = get_repository().get_logs_in_range(
+            patient_id,
+            month_start.isoformat(),
+            month_end.isoformat()
+        )
+        
         logs_by_date = {}
-        for log in all_logs:
-            log_date = log['date']
-            if month_start.isoformat() <= log_date <= month_end.isoformat():
-                if log_date not in logs_by_date:
-                    logs_by_date[log_date] = []
-                logs_by_date[log_date].append(log)
+        for log in month_logs:
+            logs_by_date.setdefault(log['date'], []).append(log)
         
         return logs_by_date
     
@@ -275,6 +284,7 @@ class DateRangeController:
 class LogDetailRenderer:
     """
     Renders detailed log information in expandable sections.
+    Only the selected section of a log is built on each rerun.
     """
     
     @staticmethod
@@ -288,77 +298,130 @@ class LogDetailRenderer:
         with st.expander(
             f"{log.get('time', 'N/A')} - by {log.get('logged_by', 'Unknown')}"
         ):
-            tab1, tab2, tab3, tab4 = st.tabs(
-                ["Vitals", "Status", "Medications", "Notes"]
+            LogDetailRenderer.render_log_sections(log)
+    
+    @staticmethod
+    def render_log_sections(log: Dict[str, Any]) -> None:
+        """
+        Render the selected vitals, status, medications or notes section of a log.
+        
+        Args:
+            log: Log entry dictionary
+        """
+        LogSectionRenderer.render(
+            log,
+            {
+                "Vitals": LogDetailRenderer._render_vitals_tab,
+                "Status": LogDetailRenderer._render_status_tab,
+                "Medications": LogDetailRenderer._render_medications_tab,
+                "Notes": LogDetailRenderer._render_notes_tab,
+            },
+            key_prefix="history_section"
+        )
+    
+    @staticmethod
+    def _format_vitals(log: Dict[str, Any]) -> Tuple[str, ...]:
+        """Format the vitals metric values of a log."""
+        vitals = log.get('vitals') or {}
+        return (
+            f"{vitals.get('temperature', 'N/A')}°C",
+            f"{vitals.get('heart_rate', 'N/A')} bpm",
+            f"{vitals.get('blood_pressure', 'N/A')}",
+            f"{vitals.get('oxygen_saturation', 'N/A')}%",
+            f"{vitals.get('weight', 'N/A')} kg",
+        )
+    
+    @staticmethod
+    def _format_status(log: Dict[str, Any]) -> Tuple[List[str], List[str], List[str]]:
+        """Format the status columns and nutrition lines of a log."""
+        activities = log.get('activities') or {}
+        left = [
+            f"**Mood:** {status_label(activities, 'mood', 'N/A')}",
+            f"**Sleep:** {status_label(activities, 'sleep_quality', 'N/A')}",
+            f"**Appetite:** {status_label(activities, 'appetite', 'N/A')}",
+        ]
+        right = [
+            f"**Activity:** {status_label(activities, 'activity_level', 'N/A')}",
+            f"**Social:** {status_label(activities, 'social_engagement', 'N/A')}",
+            f"**Communication:** {status_label(activities, 'communication', 'N/A')}",
+        ]
+        
+        nutrition = []
+        if log.get('meals'):
+            meals = log['meals']
+            nutrition = [
+                "**Nutrition:**",
+                f"Calories: {meals.get('total_calories', 0)} kcal | "
+                f"Fluids: {meals.get('total_fluids', 0)} ml",
+                f"Breakfast: {meal_label(meals.get('breakfast') or {}, 'N/A')} | "
+                f"Lunch: {meal_label(meals.get('lunch') or {}, 'N/A')} | "
+                f"Dinner: {meal_label(meals.get('dinner') or {}, 'N/A')}",
+            ]
+        
+        return left, right, nutrition
+    
+    @staticmethod
+    def _format_medications(log: Dict[str, Any]) -> List[Tuple[str, str, str]]:
+        """Format the administrations recorded on a log."""
+        return [
+            (
+                f"- **{med['medication']}** ({med['dosage']})",
+                f"  Scheduled: {med['scheduled_time']} | Given: {med['time_given']}",
+                f"  By: {med.get('given_by', 'Unknown')}",
             )
-            
-            with tab1:
-                LogDetailRenderer._render_vitals_tab(log)
-            
-            with tab2:
-                LogDetailRenderer._render_status_tab(log)
-            
-            with tab3:
-                LogDetailRenderer._render_medications_tab(log)
-            
-            with tab4:
-                LogDetailRenderer._render_notes_tab(log)
+            for med in log.get('medications_given', [])
+        ]
     
     @staticmethod
     def _render_vitals_tab(log: Dict[str, Any]) -> None:
         """Render vitals information tab."""
+        temperature, heart_rate, blood_pressure, oxygen, weight = formatted_logs.get(
+            log, 'history_vitals', LogDetailRenderer._format_vitals
+        )
+        
         col1, col2, col3 = st.columns(3)
         
         with col1:
-            st.metric("Temperature", f"{log['vitals']['temperature']}°C")
-            st.metric("Heart Rate", f"{log['vitals']['heart_rate']} bpm")
+            st.metric("Temperature", temperature)
+            st.metric("Heart Rate", heart_rate)
         
         with col2:
-            st.metric("Blood Pressure", log['vitals']['blood_pressure'])
-            st.metric("Oxygen", f"{log['vitals']['oxygen_saturation']}%")
+            st.metric("Blood Pressure", blood_pressure)
+            st.metric("Oxygen", oxygen)
         
         with col3:
-            st.metric("Weight", f"{log['vitals']['weight']} kg")
+            st.metric("Weight", weight)
     
     @staticmethod
     def _render_status_tab(log: Dict[str, Any]) -> None:
         """Render status information tab."""
+        left, right, nutrition = formatted_logs.get(
+            log, 'history_status', LogDetailRenderer._format_status
+        )
+        
         col1, col2 = st.columns(2)
         
         with col1:
-            st.write(f"**Mood:** {log['activities']['mood']}")
-            st.write(f"**Sleep:** {log['activities']['sleep_quality']}")
-            st.write(f"**Appetite:** {log['activities']['appetite']}")
+            st.write("  \n".join(left))
         
         with col2:
-            st.write(f"**Activity:** {log['activities']['activity_level']}")
-            st.write(f"**Social:** {log['activities']['social_engagement']}")
-            st.write(f"**Communication:** {log['activities']['communication']}")
+            st.write("  \n".join(right))
         
-        if log.get('meals'):
-            st.write("**Nutrition:**")
-            st.write(
-                f"Calories: {log['meals'].get('total_calories', 0)} kcal | "
-                f"Fluids: {log['meals'].get('total_fluids', 0)} ml"
-            )
-            st.write(
-                f"Breakfast: {log['meals']['breakfast'].get('amount', 'N/A')} | "
-                f"Lunch: {log['meals']['lunch'].get('amount', 'N/A')} | "
-                f"Dinner: {log['meals']['dinner'].get('amount', 'N/A')}"
-            )
+        for line in nutrition:
+            st.write(line)
     
     @staticmethod
     def _render_medications_tab(log: Dict[str, Any]) -> None:
         """Render medications information tab."""
-        if log.get('medications_given'):
+        administrations = formatted_logs.get(
+            log, 'history_medications', LogDetailRenderer._format_medications
+        )
+        
+        if administrations:
             st.write("**Medications Administered:**")
-            for med in log['medications_given']:
-                st.write(f"- **{med['medication']}** ({med['dosage']})")
-                st.write(
-                    f"  Scheduled: {med['scheduled_time']} | "
-                    f"Given: {med['time_given']}"
-                )
-                st.write(f"  By: {med.get('given_by', 'Unknown')}")
+            for lines in administrations:
+                for line in lines:
+                    st.write(line)
                 st.divider()
         else:
             st.info("No medications recorded for this day")
@@ -373,66 +436,347 @@ class LogDetailRenderer:
             st.error(f"**Incidents:** {log['incidents']}")
 
 
+class LogPageBrowser:
+    """
+    Pages through a date range newest first with one compact row per log.
+    Only the log the user opens is rendered in full.
+    """
+    
+    @staticmethod
+    def render(patient_id: str, start_date: date, end_date: date) -> None:
+        """
+        Render the current page of logs with Newer/Older navigation.
+        
+        Args:
+            patient_id: ID of the patient
+            start_date: First date of the range
+            end_date: Last date of the range
+        """
+        range_key = (patient_id, start_date.isoformat(), end_date.isoformat())
+        if st.session_state.get('log_page_range') != range_key:
+            st.session_state.log_page_range = range_key
+            st.session_state.log_page_cursors = [None]
+            st.session_state.open_log_id = None
+        
+        cursors = st.session_state.log_page_cursors
+        logs, next_cursor = get_repository().get_logs_page(
+            patient_id,
+            start_date.isoformat(),
+            end_date.isoformat(),
+            before=cursors[-1]
+        )
+        
+        for log in logs:
+            LogPageBrowser._render_summary_row(log)
+        
+        col1, col2, col3 = st.columns([1, 2, 1])
+        with col1:
+            if st.button("Newer", disabled=len(cursors) == 1):
+                cursors.pop()
+                st.rerun()
+        with col2:
+            st.caption(f"Page {len(cursors)}")
+        with col3:
+            if st.button("Older", disabled=next_cursor is None):
+                cursors.append(next_cursor)
+                st.rerun()
+    
+    @staticmethod
+    def _summary_text(log: Dict[str, Any]) -> str:
+        """
+        Build the one-line summary of a log.
+        
+        Args:
+            log: Log entry dictionary
+            
+        Returns:
+            Markdown summary
+        """
+        log_date = datetime.fromisoformat(log['date']).strftime('%a, %d %b %Y')
+        parts = [
+            f"**{log_date}** at {log.get('time', 'N/A')}",
+            f"by {log.get('logged_by', 'Unknown')}"
+        ]
+        
+        vitals = log.get('vitals') or {}
+        if vitals.get('temperature') is not None:
+            parts.append(f"{vitals['temperature']}°C")
+        if vitals.get('blood_pressure'):
+            parts.append(f"BP {vitals['blood_pressure']}")
+        
+        mood = status_label(log.get('activities') or {}, 'mood')
+        if mood:
+            parts.append(f"Mood: {mood}")
+        if log.get('medications_given'):
+            parts.append(f"{len(log['medications_given'])} med(s) given")
+        if log.get('incidents'):
+            parts.append("⚠️ Incident")
+        
+        return " | ".join(parts)
+    
+    @staticmethod
+    def _render_summary_row(log: Dict[str, Any]) -> None:
+        """
+        Render a summary row, plus the full log if it is the opened one.
+        
+        Args:
+            log: Log entry dictionary
+        """
+        is_open = st.session_state.open_log_id == log['id']
+        
+        col1, col2 = st.columns([6, 1])
+        with col1:
+            st.markdown(LogPageBrowser._summary_text(log))
+        with col2:
+            if st.button("Close" if is_open else "Open", key=f"open_log_{log['id']}"):
+                st.session_state.open_log_id = None if is_open else log['id']
+                st.rerun()
+        
+        if is_open:
+            with st.container(border=True):
+                LogDetailRenderer.render_log_sections(log)
+
+
+class VitalsTrendView:
+    """
+    Displays rolling trends of a patient's vital signs.
+    """
+    
+    VITALS = {
+        "Temperature": ('temperature', "°C", 1),
+        "Heart Rate": ('heart_rate', "bpm", 0),
+        "Oxygen": ('oxygen_saturation', "%", 0),
+        "Weight": ('weight', "kg", 1),
+        "Systolic BP": ('systolic', "mmHg", 0),
+        "Diastolic BP": ('diastolic', "mmHg", 0),
+    }
+    
+    CHART_RANGES = {
+        "Last 3 Months": 90,
+        "Last Year": 365,
+        "All": None,
+    }
+    
+    @staticmethod
+    def render(patient_id: str) -> None:
+        """
+        Render window summaries and a trend chart for one vital sign.
+        
+        Args:
+            patient_id: ID of the patient
+        """
+        series = get_repository().get_vitals_series(patient_id)
+        
+        if not len(series):
+            st.info("No vitals recorded yet for this patient")
+            return
+        
+        col1, col2 = st.columns([2, 1])
+        
+        with col1:
+            label = st.segmented_control(
+                "Vital Sign",
+                list(VitalsTrendView.VITALS),
+                default="Temperature",
+                key=f"trend_vital_{patient_id}"
+            ) or "Temperature"
+        
+        with col2:
+            chart_range = st.selectbox(
+                "Chart Range",
+                list(VitalsTrendView.CHART_RANGES),
+                key=f"trend_range_{patient_id}"
+            )
+        
+        field, unit, decimals = VitalsTrendView.VITALS[label]
+        
+        VitalsTrendView._render_summaries(series, field, unit, decimals)
+        VitalsTrendView._render_chart(
+            series,
+            field,
+            VitalsTrendView.CHART_RANGES[chart_range]
+        )
+    
+    @staticmethod
+    def _render_summaries(series, field: str, unit: str, decimals: int) -> None:
+        """
+        Render mean, range and weekly change for each trend window.
+        
+        Args:
+            series: Patient's VitalsSeries
+            field: Vital field name
+            unit: Unit shown after values
+            decimals: Decimal places shown
+        """
+        cols = st.columns(len(TREND_WINDOWS))
+        
+        for col, summary in zip(cols, trend_summaries(series, field)):
+            with col:
+                st.write(f"**Last {summary['window']} Days**")
+                
+                if not summary['count']:
+                    st.write("No readings")
+                    continue
+                
+                delta = None
+                if summary['slope'] is not None:
+                    delta = f"{summary['slope'] * 7:+.{decimals + 1}f} {unit}/week"
+                
+                st.metric(
+                    "Average",
+                    f"{summary['mean']:.{decimals}f} {unit}",
+                    delta,
+                    delta_color="off"
+                )
+                st.caption(
+                    f"Range {summary['min']:.{decimals}f} - "
+                    f"{summary['max']:.{decimals}f} {unit} | "
+                    f"{summary['count']} readings"
+                )
+    
+    @staticmethod
+    def _render_chart(series, field: str, days: Optional[int]) -> None:
+        """
+        Render readings and rolling means as a line chart.
+        
+        Args:
+            series: Patient's VitalsSeries
+            field: Vital field name
+            days: Number of recent days to chart, or None for all
+        """
+        columns = trend_columns(series, field)
+        start = 0
+        if days is not None:
+            first_day = date.today().toordinal() - (days - 1)
+            start = int(series.days.searchsorted(first_day))
+        
+        chart_data = pd.DataFrame(
+            {name: values[start:] for name, values in columns.items()},
+            index=series.dates()[start:]
+        )
+        st.line_chart(chart_data)
+
+
+class StatusTrendView:
+    """
+    Displays weekly averages of a patient's daily status and meal intake.
+    """
+    
+    STATUSES = {
+        "Mood": 'mood',
+        "Sleep": 'sleep_quality',
+        "Appetite": 'appetite',
+        "Activity": 'activity_level',
+        "Social": 'social_engagement',
+        "Communication": 'communication',
+    }
+    
+    @staticmethod
+    def render(patient_id: str) -> None:
+        """
+        Render window summaries and weekly charts for one status field.
+        
+        Args:
+            patient_id: ID of the patient
+        """
+        series = get_repository().get_status_series(patient_id)
+        
+        if not len(series):
+            st.info("No daily status recorded yet for this patient")
+            return
+        
+        label = st.segmented_control(
+            "Status",
+            list(StatusTrendView.STATUSES),
+            default="Mood",
+            key=f"trend_status_{patient_id}"
+        ) or "Mood"
+        field = StatusTrendView.STATUSES[label]
+        labels = STATUS_SCALES[field]
+        
+        cols = st.columns(len(TREND_WINDOWS))
+        for col, window in zip(cols, TREND_WINDOWS):
+            summary = status_summary(series, field, window)
+            with col:
+                st.write(f"**Last {window} Days**")
+                if summary['mean'] is None:
+                    st.write("Not recorded")
+                else:
+                    st.metric("Average", labels[int(round(summary['mean']))])
+                    st.caption(f"Score {summary['mean'] + 1:.1f} / {len(labels)}")
+                if summary['low_meal_share'] is not None:
+                    st.caption(
+                        f"{summary['low_meal_share']:.0%} of {summary['meals']} "
+                        f"meals below 50%"
+                    )
+        
+        weeks, means = weekly_mean(series, field)
+        st.write(f"**Weekly Average {label}** (1 = {labels[0]}, {len(labels)} = {labels[-1]})")
+        st.bar_chart(pd.DataFrame({label: means + 1}, index=weeks))
+        
+        weeks, shares = weekly_low_meal_share(series)
+        st.write("**Weekly Share of Meals Below 50%**")
+        st.line_chart(pd.DataFrame({"Share": shares}, index=weeks))
+
+
 class LogExporter:
     """
     Handles exporting logs to CSV format.
+    Exports run as background jobs; progress and downloads show in the sidebar.
     """
     
     @staticmethod
     def render_export_button(
+        patient_id: str,
         patient_name: str,
-        logs: List[Dict],
         start_date: date,
         end_date: date
     ) -> None:
         """
-        export button and handle CSV generation.
+        export buttons that queue CSV generation for this patient or all patients.
         """
-        if st.button("Export to CSV"):
-            csv_data = LogExporter._generate_csv(logs)
-            
-            st.download_button(
-                label="Download CSV",
-                data=csv_data,
-                file_name=f"{patient_name}_logs_{start_date}_to_{end_date}.csv",
-                mime="text/csv"
-            )
+        compress = st.checkbox("Compress (gzip)", key="export_gzip")
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            if st.button("Export to CSV"):
+                LogExporter._queue_export(
+                    [patient_id],
+                    patient_name,
+                    start_date,
+                    end_date,
+                    compress
+                )
+        with col2:
+            if st.button("Export All Patients"):
+                LogExporter._queue_export(
+                    list(get_repository().list_patients()),
+                    "All patients",
+                    start_date,
+                    end_date,
+                    compress
+                )
     
     @staticmethod
-    def _generate_csv(logs: List[Dict]) -> str:
+    def _queue_export(
+        patient_ids: List[str],
+        label: str,
+        start_date: date,
+        end_date: date,
+        compress: bool
+    ) -> None:
         """
+        Submit an export job and remember it for this session.
         """
-        export_data = []
-        
-        for log in logs:
-            meds_given = ""
-            if log.get('medications_given'):
-                meds_list = [
-                    f"{m['medication']} ({m['dosage']}) at {m['time_given']}"
-                    for m in log['medications_given']
-                ]
-                meds_given = "; ".join(meds_list)
-            
-            export_data.append({
-                'Date': log['date'],
-                'Time': log.get('time', 'N/A'),
-                'Temperature': log['vitals']['temperature'],
-                'Blood Pressure': log['vitals']['blood_pressure'],
-                'Heart Rate': log['vitals']['heart_rate'],
-                'Oxygen': log['vitals']['oxygen_saturation'],
-                'Mood': log['activities']['mood'],
-                'Sleep': log['activities']['sleep_quality'],
-                'Appetite': log['activities']['appetite'],
-                'Total Calories': log['meals'].get('total_calories', 0) if log.get('meals') else 0,
-                'Total Fluids': log['meals'].get('total_fluids', 0) if log.get('meals') else 0,
-                'Medications Given': meds_given,
-                'Notes': log.get('general_notes', ''),
-                'Incidents': log.get('incidents', ''),
-                'Logged By': log.get('logged_by', 'Unknown')
-            })
-        
-        df = pd.DataFrame(export_data)
-        return df.to_csv(index=False)
+        job_id = get_export_queue().submit(
+            patient_ids,
+            label,
+            start_date.isoformat(),
+            end_date.isoformat(),
+            compress
+        )
+        st.session_state.setdefault('export_jobs', []).append(job_id)
+        st.rerun()
 
 
 def render_page() -> None:
@@ -453,46 +797,40 @@ def render_page() -> None:
     
     if view_mode == "Calendar View":
         CalendarViewController.render(patient_id)
+    elif view_mode == "Vitals Trends":
+        VitalsTrendView.render(patient_id)
+    elif view_mode == "Status Trends":
+        StatusTrendView.render(patient_id)
     else:
         start_date, end_date = DateRangeController.render()
         
         st.divider()
         
-        if patient_id not in st.session_state.daily_logs:
+        repository = get_repository()
+        
+        if not repository.has_logs(patient_id):
             st.info("No logs recorded yet for this patient")
             return
         
-        all_logs = st.session_state.daily_logs[patient_id]
-        
-        filtered_logs = [
-            log for log in all_logs
-            if start_date.isoformat() <= log['date'] <= end_date.isoformat()
-        ]
+        log_count = repository.count_logs_in_range(
+            patient_id,
+            start_date.isoformat(),
+            end_date.isoformat()
+        )
         
-        if filtered_logs:
+        if log_count:
             st.success(
-                f"Found {len(filtered_logs)} logs between "
+                f"Found {log_count} logs between "
                 f"{start_date.strftime('%d %b %Y')} and "
                 f"{end_date.strftime('%d %b %Y')}"
             )
             
-            sorted_logs = sorted(filtered_logs, key=lambda x: x['date'], reverse=True)
-            
-            for log in sorted_logs:
-                log_date = datetime.fromisoformat(log['date']).strftime(
-                    '%A, %d %B %Y'
-                )
-                
-                with st.expander(
-                    f"{log_date} at {log.get('time', 'N/A')} - "
-                    f"by {log.get('logged_by', 'Unknown')}"
-                ):
-                    LogDetailRenderer.render_log_expander(log)
+            LogPageBrowser.render(patient_id, start_date, end_date)
             
             st.divider()
             LogExporter.render_export_button(
+                patient_id,
                 patient_name,
-                sorted_logs,
                 start_date,
                 end_date
             )
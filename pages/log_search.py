@@ -0,0 +1,153 @@
+import streamlit as st
+from datetime import date, timedelta
+from typing import Dict, Any, Optional, Tuple
+
+from storage.log_search import SEARCH_FIELDS
+from storage.repository import get_repository
+"""
+Log Search Module
+Full-text search across the care notes, incidents and behavioural changes of
+every patient's logs, including archived months.
+
+Carers can look for words such as "fall" or "agitated" and see the matching
+logs ranked by relevance, with the matching words highlighted.
+"""
+
+FIELD_LABELS = {
+    'general_notes': "Notes",
+    'incidents': "Incidents",
+    'behavioral_changes': "Behavioural Changes",
+}
+
+RESULT_LIMIT = 50
+
+
+class SearchControls:
+    """
+    Renders the search box, patient filter and date range.
+    """
+
+    @staticmethod
+    def render(patients: Dict[str, Dict]) -> Tuple[str, Optional[str], date, date]:
+        """
+        Render search controls.
+
+        Args:
+            patients: Dictionary of all patients
+
+        Returns:
+            Tuple of (search text, patient ID or None for all, start date, end date)
+        """
+        text = st.text_input(
+            "Search",
+            placeholder='e.g. fall, agitated, "refused medication"'
+        )
+
+        col1, col2, col3 = st.columns([2, 1, 1])
+
+        with col1:
+            options = [None] + list(patients)
+            patient_id = st.selectbox(
+                "Patient",
+                options,
+                format_func=lambda option: (
+                    "All Patients" if option is None
+                    else patients[option]['name']
+                )
+            )
+
+        with col2:
+            start_date = st.date_input(
+                "From Date",
+                value=date.today() - timedelta(days=365),
+                max_value=date.today()
+            )
+
+        with col3:
+            end_date = st.date_input(
+                "To Date",
+                value=date.today(),
+                max_value=date.today()
+            )
+
+        return text, patient_id, start_date, end_date
+
+
+class SearchResults:
+    """
+    Renders ranked search hits.
+    """
+
+    @staticmethod
+    def render(hits: list, patients: Dict[str, Dict]) -> None:
+        """
+        Render search hits, best match first.
+
+        Args:
+            hits: Hit dictionaries from the repository
+            patients: Dictionary of all patients
+        """
+        if len(hits) == RESULT_LIMIT:
+            st.write(f"**Showing the {RESULT_LIMIT} best matches**")
+        else:
+            st.write(f"**Found {len(hits)} matching log(s)**")
+
+        for hit in hits:
+            SearchResults._render_hit(hit, patients)
+
+    @staticmethod
+    def _render_hit(hit: Dict[str, Any], patients: Dict[str, Dict]) -> None:
+        """
+        Render a single hit with its highlighted snippets.
+
+        Args:
+            hit: Hit dictionary
+            patients: Dictionary of all patients
+        """
+        patient_name = patients.get(hit['patient_id'], {}).get('name', 'Unknown')
+        log_date = date.fromisoformat(hit['date'])
+
+        with st.container(border=True):
+            st.write(f"**{patient_name}** - {log_date.strftime('%A, %d %B %Y')}")
+
+            for field in SEARCH_FIELDS:
+                if field in hit['snippets']:
+                    st.write(f"*{FIELD_LABELS[field]}:* {hit['snippets'][field]}")
+
+
+def render_page() -> None:
+    """Main function to render the Search Notes page."""
+    st.title("Search Notes")
+
+    repository = get_repository()
+    patients = repository.list_patients()
+
+    if not patients:
+        st.info("No patients registered yet.")
+        st.stop()
+
+    text, patient_id, start_date, end_date = SearchControls.render(patients)
+
+    st.divider()
+
+    if not text.strip():
+        st.info("Enter words to search for in notes, incidents and behavioural changes")
+        return
+
+    hits = repository.search_logs(
+        text,
+        start_date.isoformat(),
+        end_date.isoformat(),
+        patient_id,
+        RESULT_LIMIT
+    )
+
+    if not hits:
+        st.info("No logs match your search")
+        return
+
+    SearchResults.render(hits, patients)
+
+
+if __name__ == "__main__":
+    render_page()
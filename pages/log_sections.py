@@ -0,0 +1,105 @@
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Any, Hashable
+
+import streamlit as st
+"""
+Log Sections Module
+Lazy section rendering for log detail views.
+
+A log's detail view shows one section at a time (vitals, status, notes, ...).
+Instead of st.tabs, which builds every tab's widgets on each rerun, a segmented
+control picks the section and only that section's content is built. Formatted
+strings are cached per log content so reopening a log does not reformat it.
+"""
+
+
+class FormattedLogCache:
+    """
+    Bounded cache of formatted log content shared by all sessions.
+    Entries are keyed by a digest of the whole stored log and the section name,
+    so any rewrite of a log (a re-save, new administrations on a day record or
+    a one-off migration) is formatted again instead of served stale.
+    """
+
+    def __init__(self, max_entries: int = 4096):
+        """
+        Create the cache.
+
+        Args:
+            max_entries: Number of formatted sections kept before the oldest is dropped
+        """
+        self.max_entries = max_entries
+        self.entries: OrderedDict = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(
+        self,
+        log: Dict[str, Any],
+        section: str,
+        build: Callable[[Dict[str, Any]], Any]
+    ) -> Any:
+        """
+        Get a log's formatted section, building it on first use.
+
+        Args:
+            log: Log entry dictionary
+            section: Name of the formatted section
+            build: Returns the formatted content for a log
+
+        Returns:
+            Formatted content returned by build
+        """
+        key: Hashable = (self._digest(log), section)
+        with self.lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                return self.entries[key]
+
+        value = build(log)
+        with self.lock:
+            self.entries[key] = value
+            if len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+        return value
+
+    @staticmethod
+    def _digest(log: Dict[str, Any]) -> bytes:
+        """Digest of a log's full content, equal for equal documents."""
+        document = json.dumps(log, sort_keys=True, separators=(',', ':'), default=str)
+        return hashlib.blake2b(document.encode('utf-8'), digest_size=16).digest()
+
+
+formatted_logs = FormattedLogCache()
+
+
+class LogSectionRenderer:
+    """
+    Renders the selected section of a log.
+    """
+
+    @staticmethod
+    def render(
+        log: Dict[str, Any],
+        sections: Dict[str, Callable[[Dict[str, Any]], None]],
+        key_prefix: str
+    ) -> None:
+        """
+        Render a section selector and build only the selected section.
+
+        Args:
+            log: Log entry dictionary
+            sections: Section label mapped to its render function, first is default
+            key_prefix: Widget key prefix unique to the calling view
+        """
+        labels = list(sections)
+        selected = st.segmented_control(
+            "Section",
+            labels,
+            default=labels[0],
+            key=f"{key_prefix}_{log['id']}",
+            label_visibility="collapsed"
+        )
+        sections[selected or labels[0]](log)
@@ -2,6 +2,9 @@ import streamlit as st
 from datetime import datetime, date, time as dt_time
 from typing import Dict, List, Any, Optional
 import uuid
+
+from models.medication import MedicationTiming
+from storage.repository import get_repository
 """
 Handles medication tracking, scheduling, and administration recording.
 This feature allows carers to add medications, schedule dosing times,
@@ -70,18 +73,21 @@ class MedicationFormRenderer:
                     st.error("Please fill in all required fields marked with *")
                     return None
                 
+                time_text = med_time.strftime('%H:%M')
+                timing = MedicationTiming.from_schedule(time_text, frequency)
+                
                 return {
                     'id': str(uuid.uuid4()),
                     'name': med_name,
                     'dosage': dosage,
                     'frequency': frequency,
-                    'time': med_time.strftime('%H:%M'),
+                    'time': time_text,
                     'route': route,
                     'prescriber': prescriber,
                     'purpose': purpose,
                     'start_date': start_date.isoformat(),
                     'end_date': end_date.isoformat() if end_date else None,
-                    'active': True
+                    **timing.to_fields()
                 }
             
             return None
@@ -115,9 +121,7 @@ class MedicationListRenderer:
             st.info("No active medications for this patient")
             return
         
-        sorted_meds = sorted(active_meds, key=lambda x: x['time'])
-        
-        for med in sorted_meds:
+        for med in active_meds:
             MedicationListRenderer._render_medication_card(patient_id, med)
     
     @staticmethod
@@ -151,7 +155,7 @@ class MedicationListRenderer:
                     st.rerun()
                 
                 if st.button("Stop", key=f"stop_{med['id']}", use_container_width=True):
-                    med['active'] = False
+                    get_repository().save_medication(patient_id, {**med, 'active': False})
                     st.success(f"Medication '{med['name']}' discontinued")
                     st.rerun()
     
@@ -201,42 +205,8 @@ class MedicationAdministrationLogger:
             'given_by': "Carer"
         }
         
-        if patient_id not in st.session_state.daily_logs:
-            st.session_state.daily_logs[patient_id] = []
-        
         today = datetime.now().date().isoformat()
-        today_log = MedicationAdministrationLogger._find_or_create_today_log(
-            patient_id,
-            today
-        )
-        
-        if 'medications_given' not in today_log:
-            today_log['medications_given'] = []
-        
-        today_log['medications_given'].append(log_entry)
-    
-    @staticmethod
-    def _find_or_create_today_log(patient_id: str, today: str) -> Dict[str, Any]:
-        """
-        Find or create today's log entry.
-        
-        Args:
-            patient_id: ID of the patient
-            today: Today's date in ISO format
-            
-        Returns:
-            Today's log entry dictionary
-        """
-        for log in st.session_state.daily_logs[patient_id]:
-            if log.get('date') == today:
-                return log
-        
-        new_log = {
-            'date': today,
-            'medications_given': []
-        }
-        st.session_state.daily_logs[patient_id].append(new_log)
-        return new_log
+        get_repository().record_administration(patient_id, today, log_entry)
 
 
 class MedicationManager:
@@ -254,10 +224,7 @@ class MedicationManager:
             patient_id: ID of the patient
             medication: Medication dictionary to add
         """
-        if patient_id not in st.session_state.medications:
-            st.session_state.medications[patient_id] = []
-        
-        st.session_state.medications[patient_id].append(medication)
+        get_repository().save_medication(patient_id, medication)
     
     @staticmethod
     def get_medications(patient_id: str) -> List[Dict[str, Any]]:
@@ -270,7 +237,7 @@ class MedicationManager:
         Returns:
             List of medication dictionaries
         """
-        return st.session_state.medications.get(patient_id, [])
+        return get_repository().get_medications(patient_id)
 
 
 def render_page() -> None:
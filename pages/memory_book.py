@@ -2,6 +2,10 @@ import streamlit as st
 from datetime import datetime
 from typing import Dict, List, Any, Optional
 import uuid
+
+from storage.media_ingest import MediaIngestError
+from storage.media_server import get_media_server
+from storage.repository import get_repository
 """
 Memory Book Module
 Manages photo, video, and audio uploads for dementia patient memory support. This feature allows the  carers and families to upload and organize multimedia
@@ -32,10 +36,13 @@ class MediaUploadForm:
     """
     
     @staticmethod
-    def render() -> Optional[Dict[str, Any]]:
+    def render(patient_id: str) -> Optional[Dict[str, Any]]:
         """
         Render media upload form.
         
+        Args:
+            patient_id: ID of the patient the upload is for
+            
         Returns:
             Media data dictionary or None if not submitted
         """
@@ -77,14 +84,18 @@ class MediaUploadForm:
             submitted = st.form_submit_button("Upload", use_container_width=True)
             
             if submitted and uploaded_file and title:
-                return MediaUploadForm._create_media_entry(
-                    media_type,
-                    title,
-                    category,
-                    uploaded_file,
-                    description,
-                    people_tagged
-                )
+                try:
+                    return MediaUploadForm._create_media_entry(
+                        patient_id,
+                        media_type,
+                        title,
+                        category,
+                        uploaded_file,
+                        description,
+                        people_tagged
+                    )
+                except MediaIngestError as error:
+                    st.error(str(error))
             elif submitted:
                 st.error("Please provide both a title and file")
             
@@ -92,6 +103,7 @@ class MediaUploadForm:
     
     @staticmethod
     def _create_media_entry(
+        patient_id: str,
         media_type: str,
         title: str,
         category: str,
@@ -100,9 +112,11 @@ class MediaUploadForm:
         people_tagged: str
     ) -> Dict[str, Any]:
         """
-        Create media entry dictionary from form data.
+        Create and store a media entry from form data.
+        The upload is streamed into media storage in chunks.
         
         Args:
+            patient_id: ID of the patient the upload is for
             media_type: Type of media
             title: Media title
             category: Category
@@ -111,23 +125,28 @@ class MediaUploadForm:
             people_tagged: People in the media
             
         Returns:
-            Media entry dictionary
+            Stored media entry dictionary
+            
+        Raises:
+            MediaIngestError: If the upload breaks a quota or is the wrong type
         """
-        file_data = uploaded_file.read()
-        
-        return {
-            'id': str(uuid.uuid4()),
-            'title': title,
-            'media_type': media_type,
-            'category': category,
-            'description': description,
-            'people': people_tagged,
-            'file_name': uploaded_file.name,
-            'file_type': uploaded_file.type,
-            'file_data': file_data,
-            'uploaded_on': datetime.now().isoformat(),
-            'uploaded_by': "Carer"
-        }
+        uploaded_file.seek(0)
+        return get_repository().ingest_media(
+            patient_id,
+            uploaded_file,
+            {
+                'id': str(uuid.uuid4()),
+                'title': title,
+                'media_type': media_type,
+                'category': category,
+                'description': description,
+                'people': people_tagged,
+                'file_name': uploaded_file.name,
+                'uploaded_on': datetime.now().isoformat(),
+                'uploaded_by': "Carer"
+            },
+            uploaded_file.type
+        )
 
 
 class MediaFilter:
@@ -237,11 +256,14 @@ class MediaRenderer:
             
             with col1:
                 if st.button(
-                    "View Full",
+                    "View Thumbnail" if MediaRenderer._showing_full(memory) else "View Full",
                     key=f"view_{memory['id']}",
                     use_container_width=True
                 ):
-                    st.info("Viewing full media")
+                    st.session_state[f"view_full_{memory['id']}"] = (
+                        not MediaRenderer._showing_full(memory)
+                    )
+                    st.rerun()
             
             with col2:
                 if st.button(
@@ -249,7 +271,7 @@ class MediaRenderer:
                     key=f"del_{memory['id']}",
                     use_container_width=True
                 ):
-                    st.session_state.memory_book[patient_id].remove(memory)
+                    get_repository().delete_media(memory['id'])
                     st.success("Media deleted")
                     st.rerun()
     
@@ -257,16 +279,33 @@ class MediaRenderer:
     def _render_media_preview(memory: Dict[str, Any]) -> None:
         """
         Render media preview based on type.
+        Photos show their thumbnail unless the full view was requested.
         
         Args:
             memory: Media item dictionary
         """
+        repository = get_repository()
+        server = get_media_server()
+        
         if memory['media_type'] == 'Photo':
-            st.image(memory['file_data'], use_container_width=True)
+            if MediaRenderer._showing_full(memory):
+                st.image(
+                    server.url_for(memory) if server else repository.read_media_bytes(memory),
+                    use_container_width=True
+                )
+            elif server and repository.thumbnails.get(memory['blob_hash']):
+                st.image(server.thumbnail_url_for(memory), use_container_width=True)
+            else:
+                st.image(repository.read_media_preview(memory), use_container_width=True)
         elif memory['media_type'] == 'Video':
-            st.video(memory['file_data'])
+            st.video(server.url_for(memory) if server else repository.read_media_bytes(memory))
         elif memory['media_type'] == 'Audio':
-            st.audio(memory['file_data'])
+            st.audio(server.url_for(memory) if server else repository.read_media_bytes(memory))
+    
+    @staticmethod
+    def _showing_full(memory: Dict[str, Any]) -> bool:
+        """Check if the full-size original was requested for a media item."""
+        return st.session_state.get(f"view_full_{memory['id']}", False)
 
 
 class MediaStatistics:
@@ -325,28 +364,6 @@ class MemoryBookManager:
     Main memory book management controller.
     """
     
-    @staticmethod
-    def initialize_memory_book(patient_id: str) -> None:
-        """
-        Initialize memory book for patient if doesn't exist.
-        
-        Args:
-            patient_id: ID of the patient
-        """
-        if patient_id not in st.session_state.memory_book:
-            st.session_state.memory_book[patient_id] = []
-    
-    @staticmethod
-    def add_media(patient_id: str, media_data: Dict[str, Any]) -> None:
-        """
-        Add media item to patient's memory book.
-        
-        Args:
-            patient_id: ID of the patient
-            media_data: Media item dictionary
-        """
-        st.session_state.memory_book[patient_id].append(media_data)
-    
     @staticmethod
     def get_media(patient_id: str) -> List[Dict]:
         """
@@ -358,7 +375,7 @@ class MemoryBookManager:
         Returns:
             List of media items
         """
-        return st.session_state.memory_book.get(patient_id, [])
+        return get_repository().get_media(patient_id)
 
 
 def render_page() -> None:
@@ -375,12 +392,9 @@ def render_page() -> None:
     
     st.divider()
     
-    MemoryBookManager.initialize_memory_book(patient_id)
-    
-    media_data = MediaUploadForm.render()
+    media_data = MediaUploadForm.render(patient_id)
     
     if media_data:
-        MemoryBookManager.add_media(patient_id, media_data)
         st.success(f"Media '{media_data['title']}' uploaded successfully")
         st.rerun()
     
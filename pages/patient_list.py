@@ -1,6 +1,8 @@
 import streamlit as st
 import pandas as pd
 from typing import Dict, Any
+
+from storage.repository import get_repository
 """
 Patient List Module
 Displays and manages the list of all registered dementia patients. This feature provides search, filter, and quick navigation capabilities
@@ -10,7 +12,7 @@ for accessing patient information and related features.
 class PatientFilter:
     """
     Handles filtering and searching of patient list.
-    Provides search by ID/name and filter by dementia stage.
+    Provides search by ID/name/room and filter by dementia stage.
     """
     @staticmethod
     def render_search_controls() -> tuple[str, str, str]:
@@ -23,7 +25,7 @@ class PatientFilter:
         col1, col2, col3 = st.columns([2, 1, 1])
         
         with col1:
-            search = st.text_input("Search", placeholder="Search by ID or name")
+            search = st.text_input("Search", placeholder="Search by ID, name or room")
         
         with col2:
             stage_filter = st.selectbox(
@@ -34,7 +36,7 @@ class PatientFilter:
         with col3:
             sort_by = st.selectbox(
                 "Sort by",
-                ["ID", "Name", "Age", "Room", "Recently Added"]
+                ["ID", "Name", "Age", "Room", "Recently Added", "Best Match"]
             )
         
         return search, stage_filter, sort_by
@@ -46,7 +48,8 @@ class PatientFilter:
         stage_filter: str
     ) -> Dict[str, Dict]:
         """
-        Apply search and filter criteria to patient list.
+        Apply search and filter criteria to patient list using the
+        repository's patient search index.
         
         Args:
             patients: Dictionary of all patients
@@ -54,67 +57,32 @@ class PatientFilter:
             stage_filter: Dementia stage to filter by
             
         Returns:
-            Filtered dictionary of patients
-        """
-        filtered_patients = {}
-        
-        for patient_id, patient in patients.items():
-            if not PatientFilter._matches_search(patient, search_term):
-                continue
-            
-            if not PatientFilter._matches_stage(patient, stage_filter):
-                continue
-            
-            filtered_patients[patient_id] = patient
-        
-        return filtered_patients
-    
-    @staticmethod
-    def _matches_search(patient: Dict, search_term: str) -> bool:
-        """
-        Check if patient matches search criteria.
-        
-        Args:
-            patient: Patient dictionary
-            search_term: Search string
-            
-        Returns:
-            True if patient matches search
+            Filtered dictionary of patients, best matches first
         """
-        if not search_term:
-            return True
+        stage = None if stage_filter == "All" else stage_filter
+        matches = get_repository().search_patients(search_term, stage)
         
-        search_lower = search_term.lower()
-        
-        return (
-            search_lower in patient.get('patient_id_number', '').lower() or
-            search_lower in patient['name'].lower() or
-            search_lower in str(patient.get('room', '')).lower()
-        )
-    
-    @staticmethod
-    def _matches_stage(patient: Dict, stage_filter: str) -> bool:
-        """
-        Check if patient matches stage filter.
-        
-        Args:
-            patient: Patient dictionary
-            stage_filter: Stage to filter by
-            
-        Returns:
-            True if patient matches stage filter
-        """
-        if stage_filter == "All":
-            return True
-        
-        return patient.get('stage') == stage_filter
+        return {
+            patient_id: patients[patient_id]
+            for patient_id in matches
+            if patient_id in patients
+        }
 
 
 class PatientSorter:
     """
     Handles sorting of patient list by various criteria.
+    Orders come from sorted indexes the repository keeps per field.
     """
     
+    SORT_FIELDS = {
+        "ID": ('patient_id_number', False),
+        "Name": ('name', False),
+        "Age": ('age', False),
+        "Room": ('room', False),
+        "Recently Added": ('created_date', True)
+    }
+    
     @staticmethod
     def sort_patients(
         patients: Dict[str, Dict],
@@ -125,23 +93,18 @@ class PatientSorter:
         
         Args:
             patients: Dictionary of patients to sort
-            sort_by: Sorting criteria
+            sort_by: Sorting criteria, "Best Match" keeps the search ranking
             
         Returns:
             Sorted dictionary of patients
         """
-        sort_functions = {
-            "ID": lambda x: x[1].get('patient_id_number', ''),
-            "Name": lambda x: x[1]['name'],
-            "Age": lambda x: x[1]['age'],
-            "Room": lambda x: x[1].get('room', ''),
-            "Recently Added": lambda x: x[1].get('created_date', '')
-        }
+        if sort_by == "Best Match":
+            return patients
         
-        sort_func = sort_functions.get(sort_by)
-        reverse = (sort_by == "Recently Added")
+        field, reverse = PatientSorter.SORT_FIELDS[sort_by]
+        ordered_ids = get_repository().sort_patients(field, list(patients), reverse)
         
-        return dict(sorted(patients.items(), key=sort_func, reverse=reverse))
+        return {patient_id: patients[patient_id] for patient_id in ordered_ids}
 
 
 class PatientCardRenderer:
@@ -332,14 +295,16 @@ def render_page() -> None:
     
     st.divider()
     
-    if not st.session_state.patients:
+    patients = get_repository().list_patients()
+    
+    if not patients:
         st.info("No patients registered yet.")
         if st.button("Add First Patient"):
             st.switch_page("pages/add_patient.py")
         st.stop()
     
     filtered_patients = PatientFilter.apply_filters(
-        st.session_state.patients,
+        patients,
         search,
         stage_filter
     )
@@ -351,10 +316,10 @@ def render_page() -> None:
     for patient_id, patient in sorted_patients.items():
         PatientCardRenderer.render_card(patient_id, patient)
     
-    if st.session_state.patients:
+    if patients:
         st.divider()
         if st.button("Export Patient List to CSV"):
-            csv_data = PatientExporter.export_to_csv(st.session_state.patients)
+            csv_data = PatientExporter.export_to_csv(patients)
             
             st.download_button(
                 label="Download CSV",
@@ -2,6 +2,8 @@ import streamlit as st
 from datetime import datetime, date
 from typing import Dict, List, Any, Optional
 import uuid
+
+from storage.repository import get_repository
 """
 Task Checklist Module
 Manages daily task lists and completion tracking for patient care. This feature allows carers to create, assign, and track completion of
@@ -268,7 +270,7 @@ class TaskRenderer:
                 )
                 
                 if completed != is_completed:
-                    TaskRenderer._toggle_task_completion(task, completed)
+                    TaskRenderer._toggle_task_completion(patient_id, task, completed)
                     st.rerun()
                 
                 if task.get('time'):
@@ -293,16 +295,21 @@ class TaskRenderer:
                     key=f"del_{task['id']}",
                     use_container_width=True
                 ):
-                    st.session_state.tasks[patient_id].remove(task)
+                    get_repository().delete_task(task['id'])
                     st.success("Task deleted")
                     st.rerun()
     
     @staticmethod
-    def _toggle_task_completion(task: Dict[str, Any], completed: bool) -> None:
+    def _toggle_task_completion(
+        patient_id: str,
+        task: Dict[str, Any],
+        completed: bool
+    ) -> None:
         """
         Toggle task completion status.
         
         Args:
+            patient_id: ID of the patient
             task: Task dictionary
             completed: New completion status
         """
@@ -311,6 +318,7 @@ class TaskRenderer:
             datetime.now().isoformat() if completed else None
         )
         task['completed_by'] = "Carer" if completed else None
+        get_repository().save_task(patient_id, task)
 
 
 class TaskStatistics:
@@ -376,11 +384,15 @@ class TaskBulkActions:
         Args:
             patient_id: ID of the patient
         """
-        for task in st.session_state.tasks[patient_id]:
+        reset_tasks = []
+        for task in get_repository().get_tasks(patient_id):
             if task.get('recurring'):
                 task['completed'] = False
                 task['completed_at'] = None
                 task['completed_by'] = None
+                reset_tasks.append(task)
+        
+        get_repository().save_tasks(patient_id, reset_tasks)
     
     @staticmethod
     def _complete_all_tasks(patient_id: str) -> None:
@@ -390,11 +402,15 @@ class TaskBulkActions:
         Args:
             patient_id: ID of the patient
         """
-        for task in st.session_state.tasks[patient_id]:
+        completed_tasks = []
+        for task in get_repository().get_tasks(patient_id):
             if not task.get('completed'):
                 task['completed'] = True
                 task['completed_at'] = datetime.now().isoformat()
                 task['completed_by'] = "Carer"
+                completed_tasks.append(task)
+        
+        get_repository().save_tasks(patient_id, completed_tasks)
 
 
 
@@ -418,10 +434,7 @@ def render_page() -> None:
     new_task = TaskFormRenderer.render()
     
     if new_task:
-        if patient_id not in st.session_state.tasks:
-            st.session_state.tasks[patient_id] = []
-        
-        st.session_state.tasks[patient_id].append(new_task)
+        get_repository().save_task(patient_id, new_task)
         st.success(f"Task '{new_task['task']}' added")
         st.rerun()
     
@@ -433,9 +446,9 @@ def render_page() -> None:
 
 
 
-    if patient_id in st.session_state.tasks and st.session_state.tasks[patient_id]:
-        tasks = st.session_state.tasks[patient_id]
-        
+    tasks = get_repository().get_tasks(patient_id)
+    
+    if tasks:
         filtered_tasks = TaskFilter.apply_filters(
             tasks,
             show_completed,
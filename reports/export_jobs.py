@@ -0,0 +1,275 @@
+import os
+import shutil
+import threading
+import time
+import uuid
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Any, Iterable, Iterator, Optional
+
+import streamlit as st
+
+from reports.log_export import export_file_name, write_csv
+from storage.repository import DATA_DIR, get_repository
+"""
+Export Jobs Module
+Background queue for CSV exports of daily logs.
+
+Submitting an export returns a job ID straight away; the CSV is written by a
+worker thread into the exports directory while the page keeps rerunning. A job
+covers one patient (a .csv or .csv.gz file) or the whole facility (a .zip with
+one CSV per patient). Jobs and their files live in the shared queue, so a
+finished export can be downloaded after a page change. Finished files are
+removed after JOB_RETENTION_SECONDS.
+"""
+
+EXPORT_DIR = os.path.join(DATA_DIR, 'exports')
+JOB_RETENTION_SECONDS = 24 * 60 * 60
+
+QUEUED = 'queued'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+
+
+class ExportJob:
+    """
+    State of one export request.
+    """
+
+    def __init__(
+        self,
+        label: str,
+        patient_ids: List[str],
+        start_date: str,
+        end_date: str,
+        compress: bool
+    ):
+        """
+        Create a queued job.
+
+        Args:
+            label: Patient name, or "All patients" for facility exports
+            patient_ids: Patients to export
+            start_date: First date in ISO format
+            end_date: Last date in ISO format
+            compress: Gzip-compress single-patient exports
+        """
+        self.id = str(uuid.uuid4())
+        self.label = label
+        self.patient_ids = patient_ids
+        self.start_date = start_date
+        self.end_date = end_date
+        self.compress = compress
+        self.status = QUEUED
+        self.logs_written = 0
+        self.logs_total = 0
+        self.path: Optional[str] = None
+        self.file_name: Optional[str] = None
+        self.error: Optional[str] = None
+        self.finished_at: Optional[float] = None
+
+    @property
+    def progress(self) -> float:
+        """Fraction of logs written, between 0 and 1."""
+        if self.status == DONE:
+            return 1.0
+        if not self.logs_total:
+            return 0.0
+        return min(self.logs_written / self.logs_total, 1.0)
+
+    @property
+    def mime(self) -> str:
+        """MIME type of the finished file."""
+        if self.file_name and self.file_name.endswith('.zip'):
+            return 'application/zip'
+        if self.file_name and self.file_name.endswith('.gz'):
+            return 'application/gzip'
+        return 'text/csv'
+
+
+class ExportJobQueue:
+    """
+    Runs export jobs on a small thread pool.
+    """
+
+    def __init__(self, repository, output_dir: str = EXPORT_DIR, max_workers: int = 2):
+        """
+        Create the queue.
+
+        Args:
+            repository: CareRepository to read logs from
+            output_dir: Directory for finished export files
+            max_workers: Number of exports that run at the same time
+        """
+        self.repository = repository
+        self.output_dir = output_dir
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix='log-export'
+        )
+        self.lock = threading.Lock()
+        self.jobs: Dict[str, ExportJob] = {}
+
+    def submit(
+        self,
+        patient_ids: List[str],
+        label: str,
+        start_date: str,
+        end_date: str,
+        compress: bool = False
+    ) -> str:
+        """
+        Queue an export.
+
+        Args:
+            patient_ids: Patients to export; more than one produces a zip file
+            label: Patient name, or "All patients" for facility exports
+            start_date: First date in ISO format
+            end_date: Last date in ISO format
+            compress: Gzip-compress single-patient exports
+
+        Returns:
+            ID of the queued job
+        """
+        self.prune()
+
+        job = ExportJob(label, patient_ids, start_date, end_date, compress)
+        with self.lock:
+            self.jobs[job.id] = job
+        self.executor.submit(self._run, job)
+        return job.id
+
+    def get(self, job_id: str) -> Optional[ExportJob]:
+        """
+        Get a job by ID.
+
+        Args:
+            job_id: ID returned by submit
+
+        Returns:
+            ExportJob, or None if unknown or pruned
+        """
+        with self.lock:
+            return self.jobs.get(job_id)
+
+    def prune(self, max_age: float = JOB_RETENTION_SECONDS) -> None:
+        """
+        Forget finished jobs older than max_age seconds and delete their files.
+
+        Args:
+            max_age: Retention in seconds
+        """
+        cutoff = time.time() - max_age
+        with self.lock:
+            expired = [
+                job for job in self.jobs.values()
+                if job.finished_at is not None and job.finished_at < cutoff
+            ]
+            for job in expired:
+                del self.jobs[job.id]
+
+        for job in expired:
+            shutil.rmtree(os.path.join(self.output_dir, job.id), ignore_errors=True)
+
+    def _counted(self, job: ExportJob, logs: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        """Yield logs while advancing the job's progress."""
+        for log in logs:
+            yield log
+            job.logs_written += 1
+
+    def _run(self, job: ExportJob) -> None:
+        """Write a job's export file on a worker thread."""
+        job.status = RUNNING
+        try:
+            counts = {
+                patient_id: self.repository.count_logs_in_range(
+                    patient_id,
+                    job.start_date,
+                    job.end_date
+                )
+                for patient_id in job.patient_ids
+            }
+            job.logs_total = sum(counts.values())
+
+            job_dir = os.path.join(self.output_dir, job.id)
+            os.makedirs(job_dir, exist_ok=True)
+
+            if len(job.patient_ids) == 1:
+                job.file_name = export_file_name(
+                    job.label,
+                    job.start_date,
+                    job.end_date,
+                    job.compress
+                )
+                self._write_patient_file(job, job.patient_ids[0], job_dir)
+            else:
+                job.file_name = f"all_patients_logs_{job.start_date}_to_{job.end_date}.zip"
+                self._write_facility_zip(job, counts, job_dir)
+
+            job.status = DONE
+        except Exception as error:
+            job.error = str(error)
+            job.status = FAILED
+        finally:
+            job.finished_at = time.time()
+
+    def _patient_logs(self, job: ExportJob, patient_id: str) -> Iterator[Dict[str, Any]]:
+        """Fetch one patient's logs for the job's range and yield them with progress."""
+        yield from self._counted(
+            job,
+            self.repository.get_logs_in_range(patient_id, job.start_date, job.end_date)
+        )
+
+    def _write_patient_file(
+        self,
+        job: ExportJob,
+        patient_id: str,
+        job_dir: str
+    ) -> None:
+        """Write a single-patient CSV export."""
+        path = os.path.join(job_dir, job.file_name)
+        temp_path = path + '.part'
+        with open(temp_path, 'wb') as export_file:
+            write_csv(self._patient_logs(job, patient_id), export_file, job.compress)
+        os.replace(temp_path, path)
+        job.path = path
+
+    def _write_facility_zip(
+        self,
+        job: ExportJob,
+        counts: Dict[str, int],
+        job_dir: str
+    ) -> None:
+        """
+        Write a zip of per-patient CSV exports. Each patient's logs are
+        fetched only when their entry is written, so one patient's logs are
+        held at a time.
+        """
+        patients = self.repository.list_patients()
+        path = os.path.join(job_dir, job.file_name)
+        temp_path = path + '.part'
+
+        with zipfile.ZipFile(temp_path, 'w', zipfile.ZIP_DEFLATED) as archive:
+            for patient_id, count in counts.items():
+                if not count:
+                    continue
+                patient = patients.get(patient_id, {})
+                prefix = patient.get('patient_id_number') or patient_id
+                entry_name = export_file_name(prefix, job.start_date, job.end_date)
+                with archive.open(entry_name, 'w') as entry:
+                    write_csv(self._patient_logs(job, patient_id), entry)
+
+        os.replace(temp_path, path)
+        job.path = path
+
+
+@st.cache_resource
+def get_export_queue() -> ExportJobQueue:
+    """
+    Get the export queue shared by every session of the app.
+
+    Returns:
+        ExportJobQueue instance
+    """
+    return ExportJobQueue(get_repository())
@@ -0,0 +1,243 @@
+import argparse
+import csv
+import gzip
+import io
+import os
+from datetime import date, timedelta
+from typing import Dict, List, Any, BinaryIO, Iterable, Iterator, Optional
+
+from models.status_scales import status_label
+"""
+Log Export Module
+Streaming CSV export of daily care logs.
+
+Logs are turned into CSV rows one at a time and written in fixed-size chunks to
+a binary stream, optionally gzip-compressed, so writing an export never holds
+more than one chunk of text and one patient's log references in memory. Exports
+from the app are written to files by background jobs (see reports.export_jobs);
+the batch entry point writes one file per patient:
+
+    python -m reports.log_export --start 2025-01-01 --end 2025-12-31 --out exports --gzip
+"""
+
+CHUNK_SIZE = 64 * 1024
+
+EXPORT_HEADER = [
+    'Date',
+    'Time',
+    'Temperature',
+    'Blood Pressure',
+    'Systolic',
+    'Diastolic',
+    'Heart Rate',
+    'Oxygen',
+    'Mood',
+    'Sleep',
+    'Appetite',
+    'Total Calories',
+    'Total Fluids',
+    'Medications Given',
+    'Notes',
+    'Incidents',
+    'Logged By',
+]
+
+
+def export_row(log: Dict[str, Any]) -> List[Any]:
+    """
+    Convert a log into a CSV row matching EXPORT_HEADER.
+    Sections missing from a log (e.g. vitals on a medication-only day record)
+    export as empty cells.
+
+    Args:
+        log: Log entry dictionary
+
+    Returns:
+        List of cell values
+    """
+    vitals = log.get('vitals') or {}
+    activities = log.get('activities') or {}
+    meals = log.get('meals') or {}
+
+    meds_given = "; ".join(
+        f"{m['medication']} ({m['dosage']}) at {m['time_given']}"
+        for m in log.get('medications_given', [])
+    )
+
+    return [
+        log['date'],
+        log.get('time', 'N/A'),
+        vitals.get('temperature'),
+        vitals.get('blood_pressure'),
+        vitals.get('systolic'),
+        vitals.get('diastolic'),
+        vitals.get('heart_rate'),
+        vitals.get('oxygen_saturation'),
+        status_label(activities, 'mood'),
+        status_label(activities, 'sleep_quality'),
+        status_label(activities, 'appetite'),
+        meals.get('total_calories', 0),
+        meals.get('total_fluids', 0),
+        meds_given,
+        log.get('general_notes', ''),
+        log.get('incidents', ''),
+        log.get('logged_by', 'Unknown'),
+    ]
+
+
+def iter_csv_chunks(
+    logs: Iterable[Dict[str, Any]],
+    chunk_size: int = CHUNK_SIZE
+) -> Iterator[bytes]:
+    """
+    Generate UTF-8 CSV text for logs in chunks of roughly chunk_size bytes.
+
+    Args:
+        logs: Log entry dictionaries in export order
+        chunk_size: Buffered text size that triggers a chunk
+
+    Yields:
+        Encoded CSV chunks, header first
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_HEADER)
+
+    for log in logs:
+        writer.writerow(export_row(log))
+        if buffer.tell() >= chunk_size:
+            yield buffer.getvalue().encode('utf-8')
+            buffer.seek(0)
+            buffer.truncate()
+
+    if buffer.tell():
+        yield buffer.getvalue().encode('utf-8')
+
+
+def write_csv(
+    logs: Iterable[Dict[str, Any]],
+    target: BinaryIO,
+    compress: bool = False
+) -> None:
+    """
+    Stream logs as CSV into a binary file object.
+
+    Args:
+        logs: Log entry dictionaries in export order
+        target: Writable binary file object
+        compress: Gzip-compress the output
+    """
+    if compress:
+        with gzip.GzipFile(fileobj=target, mode='wb') as gzip_file:
+            for chunk in iter_csv_chunks(logs):
+                gzip_file.write(chunk)
+    else:
+        for chunk in iter_csv_chunks(logs):
+            target.write(chunk)
+
+
+def export_file_name(
+    patient_name: str,
+    start_date: str,
+    end_date: str,
+    compress: bool = False
+) -> str:
+    """
+    Build the download file name for an export.
+
+    Args:
+        patient_name: Name used as the file prefix
+        start_date: First date in ISO format
+        end_date: Last date in ISO format
+        compress: True for a gzip file
+
+    Returns:
+        File name ending in .csv or .csv.gz
+    """
+    suffix = '.csv.gz' if compress else '.csv'
+    return f"{patient_name}_logs_{start_date}_to_{end_date}{suffix}"
+
+
+def export_all_patients(
+    repository,
+    start_date: str,
+    end_date: str,
+    output_dir: str,
+    compress: bool = False
+) -> List[str]:
+    """
+    Export every patient's logs in a date range, one file per patient.
+    Patients are exported one at a time and each file is written to a
+    temporary name before being moved into place.
+
+    Args:
+        repository: CareRepository to read from
+        start_date: First date in ISO format
+        end_date: Last date in ISO format
+        output_dir: Directory for the export files
+        compress: Gzip-compress the files
+
+    Returns:
+        Paths of the written files
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    paths = []
+
+    for patient_id, patient in repository.list_patients().items():
+        logs = repository.get_logs_in_range(patient_id, start_date, end_date)
+        if not logs:
+            continue
+
+        prefix = patient.get('patient_id_number') or patient_id
+        path = os.path.join(
+            output_dir,
+            export_file_name(prefix, start_date, end_date, compress)
+        )
+        temp_path = path + '.part'
+        with open(temp_path, 'wb') as export_file:
+            write_csv(logs, export_file, compress)
+        os.replace(temp_path, path)
+        paths.append(path)
+
+    return paths
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Command-line entry point for batch exports."""
+    parser = argparse.ArgumentParser(
+        description="Export daily care logs for all patients to CSV."
+    )
+    parser.add_argument(
+        '--start',
+        default=(date.today() - timedelta(days=365)).isoformat(),
+        help="First date (YYYY-MM-DD), default one year ago"
+    )
+    parser.add_argument(
+        '--end',
+        default=date.today().isoformat(),
+        help="Last date (YYYY-MM-DD), default today"
+    )
+    parser.add_argument('--out', default='exports', help="Output directory")
+    parser.add_argument('--gzip', action='store_true', help="Gzip-compress files")
+    args = parser.parse_args(argv)
+
+    from storage.repository import CareRepository
+
+    repository = CareRepository()
+    try:
+        paths = export_all_patients(
+            repository,
+            args.start,
+            args.end,
+            args.out,
+            args.gzip
+        )
+    finally:
+        repository.close()
+
+    for path in paths:
+        print(path)
+
+
+if __name__ == '__main__':
+    main()
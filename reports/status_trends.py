@@ -0,0 +1,123 @@
+from datetime import date
+from typing import Dict, Any, Iterable, Optional, Tuple
+
+import numpy as np
+
+from models.status_scales import MEAL_AMOUNTS
+from storage.status_series import MEAL_FIELDS, MISSING, StatusSeries
+"""
+Status Trends Module
+Weekly status averages and meal intake shares from a patient's status series.
+
+Weeks start on Monday. Rows are grouped by week number (day ordinal // 7 after
+aligning to Monday) and summed with bincount, so a weekly mean of a status
+field or a weekly share of poorly eaten meals is a few passes over int8 arrays.
+Values that were not recorded (MISSING) are left out of every statistic.
+"""
+
+LOW_MEAL_AMOUNT = MEAL_AMOUNTS.index("50%")
+
+
+def week_numbers(days: np.ndarray) -> np.ndarray:
+    """
+    Number the Monday-to-Sunday week of each day ordinal.
+
+    Args:
+        days: Day ordinals
+
+    Returns:
+        Week numbers; week w starts on day ordinal 7 * w + 1
+    """
+    return (days - 1) // 7
+
+
+def _weekly(days: np.ndarray, hits: np.ndarray, counted: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Sum hits and counted rows per week; return week start dates and hit / counted ratios."""
+    weeks = week_numbers(days)
+    if not len(weeks):
+        return np.array([], dtype='datetime64[D]'), np.array([], dtype=np.float64)
+
+    unique_weeks, inverse = np.unique(weeks, return_inverse=True)
+    totals = np.bincount(inverse, weights=hits, minlength=len(unique_weeks))
+    counts = np.bincount(inverse, weights=counted, minlength=len(unique_weeks))
+    with np.errstate(invalid='ignore', divide='ignore'):
+        ratios = np.where(counts > 0, totals / counts, np.nan)
+
+    starts = unique_weeks * 7 + 1 - date(1970, 1, 1).toordinal()
+    return starts.astype('datetime64[D]'), ratios
+
+
+def weekly_mean(series: StatusSeries, field: str) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Mean scale position of a status field per week.
+
+    Args:
+        series: Patient's status series
+        field: Status field name
+
+    Returns:
+        (week start dates, mean positions), NaN for weeks without values
+    """
+    codes = series.codes[field]
+    recorded = codes != MISSING
+    return _weekly(series.days, np.where(recorded, codes, 0), recorded)
+
+
+def weekly_low_meal_share(
+    series: StatusSeries,
+    below: int = LOW_MEAL_AMOUNT,
+    meals: Iterable[str] = MEAL_FIELDS
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Share of recorded meals eaten below an amount per week.
+
+    Args:
+        series: Patient's status series
+        below: Meal amount position; meals below it count as low
+        meals: Meal field names
+
+    Returns:
+        (week start dates, shares between 0 and 1), NaN for weeks without meals
+    """
+    codes = np.stack([series.codes[meal] for meal in meals])
+    recorded = codes != MISSING
+    low = recorded & (codes < below)
+    return _weekly(series.days, low.sum(axis=0), recorded.sum(axis=0))
+
+
+def status_summary(
+    series: StatusSeries,
+    field: str,
+    window: int,
+    today: Optional[date] = None
+) -> Dict[str, Any]:
+    """
+    Summarise one status field and meal intake over the last window days.
+
+    Args:
+        series: Patient's status series
+        field: Status field name
+        window: Window length in days
+        today: Last day of the window, today by default
+
+    Returns:
+        Dictionary with 'window', 'count', 'mean' (scale position), 'meals'
+        (recorded meals) and 'low_meal_share'; statistics are None without values
+    """
+    today = today or date.today()
+    recent = series.since(today.toordinal() - (window - 1))
+
+    codes = recent.codes[field]
+    values = codes[codes != MISSING]
+    meal_codes = np.concatenate([recent.codes[meal] for meal in MEAL_FIELDS])
+    meal_codes = meal_codes[meal_codes != MISSING]
+
+    return {
+        'window': window,
+        'count': len(values),
+        'mean': float(values.mean()) if len(values) else None,
+        'meals': len(meal_codes),
+        'low_meal_share': (
+            float((meal_codes < LOW_MEAL_AMOUNT).mean()) if len(meal_codes) else None
+        ),
+    }
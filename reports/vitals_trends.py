@@ -0,0 +1,154 @@
+from datetime import date
+from typing import Dict, List, Any, Iterable, Optional
+
+import numpy as np
+
+from storage.vitals_series import VitalsSeries
+"""
+Vitals Trends Module
+Rolling means, slopes and ranges of a patient's vital signs.
+
+Windows are calendar-based: the window ending at a reading covers the readings
+of that day and the previous window - 1 days, however many logs there were.
+Window bounds come from one searchsorted over the day ordinals, and sums over a
+window are differences of cumulative sums, so a rolling mean for every reading
+costs a few passes over the arrays regardless of the window length. Window
+summaries fit a least-squares slope to the readings of the last window days.
+Missing values (NaN) are left out of every statistic.
+"""
+
+TREND_WINDOWS = [7, 30, 90]
+
+
+def window_starts(days: np.ndarray, window: int) -> np.ndarray:
+    """
+    Find where the window ending at each reading starts.
+
+    Args:
+        days: Day ordinals in ascending order
+        window: Window length in days
+
+    Returns:
+        Index of the first reading inside each reading's window
+    """
+    return np.searchsorted(days, days - (window - 1), side='left')
+
+
+def _window_sums(values: np.ndarray, starts: np.ndarray) -> np.ndarray:
+    """Sum values over [start, i] for every reading i using a cumulative sum."""
+    totals = np.concatenate(([0.0], np.cumsum(values)))
+    return totals[1:] - totals[starts]
+
+
+def rolling_mean(days: np.ndarray, values: np.ndarray, window: int) -> np.ndarray:
+    """
+    Mean of the readings in the window ending at each reading.
+
+    Args:
+        days: Day ordinals in ascending order
+        values: Readings aligned with days, NaN where missing
+        window: Window length in days
+
+    Returns:
+        Rolling means, NaN where the window has no readings
+    """
+    starts = window_starts(days, window)
+    valid = ~np.isnan(values)
+    counts = _window_sums(valid.astype(np.float64), starts)
+    sums = _window_sums(np.where(valid, values, 0.0), starts)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(counts > 0, sums / counts, np.nan)
+
+
+def window_summary(
+    series: VitalsSeries,
+    field: str,
+    window: int,
+    today: Optional[date] = None
+) -> Dict[str, Any]:
+    """
+    Summarise one vital sign over the last window days.
+
+    Args:
+        series: Patient's vitals series
+        field: Vital field name
+        window: Window length in days
+        today: Last day of the window, today by default
+
+    Returns:
+        Dictionary with 'window', 'count', 'mean', 'slope' (per day),
+        'min' and 'max'; statistics are None without readings
+    """
+    today = today or date.today()
+    recent = series.since(today.toordinal() - (window - 1))
+    values = recent.values[field]
+    valid = ~np.isnan(values)
+    count = int(valid.sum())
+
+    summary = {
+        'window': window,
+        'count': count,
+        'mean': None,
+        'slope': None,
+        'min': None,
+        'max': None,
+    }
+    if not count:
+        return summary
+
+    readings = values[valid]
+    summary['mean'] = float(readings.mean())
+    summary['min'] = float(readings.min())
+    summary['max'] = float(readings.max())
+
+    x = recent.days[valid].astype(np.float64)
+    x -= x.mean()
+    spread = (x * x).sum()
+    if spread > 0:
+        summary['slope'] = float((x * (readings - summary['mean'])).sum() / spread)
+    return summary
+
+
+def trend_summaries(
+    series: VitalsSeries,
+    field: str,
+    windows: Iterable[int] = TREND_WINDOWS,
+    today: Optional[date] = None
+) -> List[Dict[str, Any]]:
+    """
+    Summarise one vital sign over each trend window.
+
+    Args:
+        series: Patient's vitals series
+        field: Vital field name
+        windows: Window lengths in days
+        today: Last day of the windows, today by default
+
+    Returns:
+        One window_summary per window
+    """
+    return [window_summary(series, field, window, today) for window in windows]
+
+
+def trend_columns(
+    series: VitalsSeries,
+    field: str,
+    windows: Iterable[int] = TREND_WINDOWS
+) -> Dict[str, np.ndarray]:
+    """
+    Build chart columns for one vital sign: the readings and their rolling
+    mean for each window.
+
+    Args:
+        series: Patient's vitals series
+        field: Vital field name
+        windows: Window lengths in days
+
+    Returns:
+        Column name -> array aligned with series.dates()
+    """
+    values = series.values[field]
+    columns = {'Reading': values}
+    for window in windows:
+        columns[f'{window}-day mean'] = rolling_mean(series.days, values, window)
+    return columns
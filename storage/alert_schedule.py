@@ -0,0 +1,170 @@
+from bisect import bisect_left, bisect_right, insort
+from typing import Dict, List, Any, Iterable, Tuple
+
+from models.medication import MINUTES_PER_DAY, MedicationTiming
+from models.records import Medication
+from storage.log_index import MAX_KEY
+"""
+Alert Schedule Module
+Sorted medication schedule for sidebar alerts and medication lists.
+
+Every dose of every active medication is kept in a list ordered by minute of
+day, built once and updated when a medication is added or discontinued. "Due in
+the next N minutes" is two bisects plus the matching entries, and windows that
+run past midnight continue from the start of the next day.
+
+Each patient's medications are also kept sorted by first dose time as they are
+inserted, so medication lists are read in display order without sorting.
+Timings are pre-parsed on the medication (see models.medication).
+
+The schedule is shared by every session, so it holds each medication as a
+Medication record (see models.records) and hands out new dictionaries from
+to_dict(); callers change and save their own copy.
+"""
+
+
+class MedicationAlertSchedule:
+    """
+    Dose times of active medications and per-patient medication lists,
+    both ordered by minute of day.
+    """
+
+    def __init__(self, medications: Iterable[Tuple[str, Dict[str, Any]]] = ()):
+        """
+        Build the schedule.
+
+        Args:
+            medications: (patient_id, medication) pairs, active or discontinued
+        """
+        self.entries: List[Tuple[int, str]] = []
+        self.medications: Dict[str, Tuple[str, Medication]] = {}
+        self.timings: Dict[str, Tuple[str, MedicationTiming]] = {}
+        self.patient_keys: Dict[str, List[Tuple[int, str]]] = {}
+        self.patient_medications: Dict[str, List[Medication]] = {}
+
+        for patient_id, medication in medications:
+            self.update(patient_id, medication)
+
+    def __len__(self) -> int:
+        return len(self.medications)
+
+    def update(self, patient_id: str, medication: Dict[str, Any]) -> None:
+        """
+        Add, move or drop a medication depending on its timing and active flag.
+
+        Args:
+            patient_id: ID of the patient
+            medication: Medication dictionary
+        """
+        self.remove(medication['id'])
+
+        try:
+            timing = MedicationTiming.from_medication(medication)
+        except (ValueError, KeyError):
+            return
+
+        medication = Medication.from_dict(medication)
+        key = (timing.minute, medication.id)
+        keys = self.patient_keys.setdefault(patient_id, [])
+        position = bisect_right(keys, key)
+        keys.insert(position, key)
+        self.patient_medications.setdefault(patient_id, []).insert(position, medication)
+        self.timings[medication.id] = (patient_id, timing)
+
+        if not timing.active:
+            return
+        for minute in timing.dose_minutes:
+            insort(self.entries, (minute, medication.id))
+        self.medications[medication.id] = (patient_id, medication)
+
+    def remove(self, medication_id: str) -> None:
+        """
+        Drop a medication from the schedule if present.
+
+        Args:
+            medication_id: ID of the medication
+        """
+        scheduled = self.timings.pop(medication_id, None)
+        if scheduled is None:
+            return
+
+        patient_id, timing = scheduled
+        position = bisect_left(self.patient_keys[patient_id], (timing.minute, medication_id))
+        del self.patient_keys[patient_id][position]
+        del self.patient_medications[patient_id][position]
+
+        if self.medications.pop(medication_id, None) is None:
+            return
+        for minute in timing.dose_minutes:
+            position = bisect_left(self.entries, (minute, medication_id))
+            del self.entries[position]
+
+    def for_patient(self, patient_id: str) -> List[Dict[str, Any]]:
+        """
+        Get a patient's medications ordered by first dose time.
+
+        Args:
+            patient_id: ID of the patient
+
+        Returns:
+            List of medication dictionaries, copied from the schedule
+        """
+        return [
+            medication.to_dict()
+            for medication in self.patient_medications.get(patient_id, [])
+        ]
+
+    def active_by_patient(self) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Get active medications grouped by patient, ordered by first dose time.
+
+        Returns:
+            Dictionary mapping patient ID to a list of copied medication dictionaries
+        """
+        grouped = {}
+        for patient_id, medications in self.patient_medications.items():
+            active = [
+                medication.to_dict() for medication in medications
+                if self.timings[medication.id][1].active
+            ]
+            if active:
+                grouped[patient_id] = active
+        return grouped
+
+    def _between(self, first: int, last: int) -> List[Tuple[int, str]]:
+        """Get entries with first <= minute <= last."""
+        low = bisect_left(self.entries, (first, ''))
+        high = bisect_right(self.entries, (last, MAX_KEY))
+        return self.entries[low:high]
+
+    def due_within(
+        self,
+        current_minute: int,
+        window: int
+    ) -> List[Tuple[int, int, str, Dict[str, Any]]]:
+        """
+        Get doses due in the next window minutes, soonest first.
+
+        Args:
+            current_minute: Minutes since midnight now
+            window: Look-ahead in minutes
+
+        Returns:
+            List of (minutes_until_due, dose_minute, patient_id, medication) tuples,
+            each with its own copy of the medication
+        """
+        last = current_minute + min(window, MINUTES_PER_DAY - 1)
+        entries = self._between(current_minute, min(last, MINUTES_PER_DAY - 1))
+        if last >= MINUTES_PER_DAY:
+            entries += self._between(0, last - MINUTES_PER_DAY)
+
+        due = []
+        for minute, medication_id in entries:
+            patient_id, medication = self.medications[medication_id]
+            due.append((
+                (minute - current_minute) % MINUTES_PER_DAY,
+                minute,
+                patient_id,
+                medication.to_dict()
+            ))
+        return due
@@ -0,0 +1,130 @@
+import hashlib
+import os
+import tempfile
+from typing import BinaryIO, Callable, Optional, Tuple
+"""
+Blob Store Module
+Content-addressed on-disk storage for memory book media.
+
+Files are keyed by the SHA-256 of their contents and sharded into two levels of
+directories by hash prefix (ab/cd/abcd...), so identical uploads are stored once
+and media bytes are only read from disk when a preview is rendered.
+
+Uploads are ingested in fixed-size chunks into a temporary file in the store,
+hashed on the way, and moved into place only once complete.
+"""
+
+CHUNK_SIZE = 1024 * 1024
+HEAD_SIZE = 64
+
+
+class BlobTooLargeError(ValueError):
+    """Raised when an ingested stream exceeds its size limit."""
+
+
+class BlobStore:
+    """
+    Stores and retrieves binary media by SHA-256 content hash.
+    """
+
+    def __init__(self, root: str):
+        """
+        Create the blob store rooted at a directory.
+
+        Args:
+            root: Directory that holds the sharded blob files
+        """
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+
+    def path_for(self, blob_hash: str) -> str:
+        """
+        Get the on-disk path for a blob.
+
+        Args:
+            blob_hash: Hex SHA-256 of the blob contents
+
+        Returns:
+            Absolute file path of the blob
+        """
+        return os.path.join(self.root, blob_hash[:2], blob_hash[2:4], blob_hash)
+
+    def ingest(
+        self,
+        stream: BinaryIO,
+        max_bytes: Optional[int] = None,
+        inspect: Optional[Callable[[bytes], None]] = None,
+        chunk_size: int = CHUNK_SIZE
+    ) -> Tuple[str, int, bytes]:
+        """
+        Copy a stream into the store in chunks, hashing as it is written.
+        Nothing is stored if the stream is larger than max_bytes or if
+        inspect raises.
+
+        Args:
+            stream: Readable binary stream positioned at the start of the data
+            max_bytes: Size limit in bytes, or None for no limit
+            inspect: Called with the first HEAD_SIZE bytes before the blob is committed
+            chunk_size: Bytes copied per read
+
+        Returns:
+            Tuple of (blob_hash, size_in_bytes, first HEAD_SIZE bytes)
+
+        Raises:
+            BlobTooLargeError: If the stream exceeds max_bytes
+        """
+        digest = hashlib.sha256()
+        size = 0
+        head = b''
+
+        fd, temp_path = tempfile.mkstemp(dir=self.root, suffix='.part')
+        try:
+            with os.fdopen(fd, 'wb') as temp_file:
+                while True:
+                    chunk = stream.read(chunk_size)
+                    if not chunk:
+                        break
+                    size += len(chunk)
+                    if max_bytes is not None and size > max_bytes:
+                        raise BlobTooLargeError(size)
+                    if len(head) < HEAD_SIZE:
+                        head += chunk[:HEAD_SIZE - len(head)]
+                    digest.update(chunk)
+                    temp_file.write(chunk)
+
+            if inspect is not None:
+                inspect(head)
+
+            blob_hash = digest.hexdigest()
+            path = self.path_for(blob_hash)
+            if os.path.exists(path):
+                os.remove(temp_path)
+            else:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                os.replace(temp_path, path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+        return blob_hash, size, head
+
+    def read(self, blob_hash: str) -> bytes:
+        """
+        Read a blob's contents.
+
+        Args:
+            blob_hash: Hex SHA-256 of the blob contents
+
+        Returns:
+            Raw file contents
+        """
+        with open(self.path_for(blob_hash), 'rb') as blob_file:
+            return blob_file.read()
+
+    def delete(self, blob_hash: str) -> None:
+        """Remove a blob from disk if it exists."""
+        try:
+            os.remove(self.path_for(blob_hash))
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,144 @@
+from typing import Dict, Any, Iterable, Optional, Tuple
+"""
+Dashboard Counters Module
+Running totals behind the dashboard metrics.
+
+The repository adjusts these counters on every write that can change them
+(patient added, task saved or deleted, medication added or discontinued, log
+saved), so the dashboard reads four integers instead of counting rows. The
+logs-today counter belongs to a single day and is reset from the log index the
+first time it is read after midnight.
+"""
+
+COUNTER_NAMES = ('patients', 'pending_tasks', 'active_medications', 'logs_today')
+
+
+class DashboardCounters:
+    """
+    Patient, pending task, active medication and logs-today totals.
+    """
+
+    def __init__(
+        self,
+        patients: int,
+        pending_tasks: int,
+        active_medications: int,
+        day: str,
+        logs_today: int
+    ):
+        """
+        Create counters from full counts.
+
+        Args:
+            patients: Number of registered patients
+            pending_tasks: Number of tasks not completed
+            active_medications: Number of active medications
+            day: Date the logs-today counter belongs to, in ISO format
+            logs_today: Number of logs recorded on that date
+        """
+        self.patients = patients
+        self.pending_tasks = pending_tasks
+        self.active_medications = active_medications
+        self.day = day
+        self.logs_today = logs_today
+
+    def patient_added(self) -> None:
+        """Count a newly registered patient."""
+        self.patients += 1
+
+    def tasks_saved(
+        self,
+        previous: Dict[str, bool],
+        tasks: Iterable[Dict[str, Any]]
+    ) -> None:
+        """
+        Adjust the pending count for saved tasks.
+
+        Args:
+            previous: Task ID -> completed flag before the save, for existing tasks
+            tasks: Saved task dictionaries
+        """
+        for task in tasks:
+            was_pending = task['id'] in previous and not previous[task['id']]
+            is_pending = not task.get('completed', False)
+            self.pending_tasks += int(is_pending) - int(was_pending)
+
+    def task_deleted(self, was_pending: bool) -> None:
+        """
+        Adjust the pending count for a deleted task.
+
+        Args:
+            was_pending: True if the task was not completed
+        """
+        if was_pending:
+            self.pending_tasks -= 1
+
+    def medication_saved(self, was_active: bool, is_active: bool) -> None:
+        """
+        Adjust the active count for a saved medication.
+
+        Args:
+            was_active: True if the medication existed and was active before
+            is_active: True if the medication is active now
+        """
+        self.active_medications += int(is_active) - int(was_active)
+
+    def log_saved(self, previous_date: Optional[str], log_date: str) -> None:
+        """
+        Adjust logs-today for a saved log.
+
+        Args:
+            previous_date: Date the log had before the save, or None if new
+            log_date: Date of the saved log
+        """
+        if previous_date == log_date:
+            return
+        if previous_date == self.day:
+            self.logs_today -= 1
+        if log_date == self.day:
+            self.logs_today += 1
+
+    def needs_rollover(self, today: str) -> bool:
+        """Check if logs-today belongs to an earlier day."""
+        return today != self.day
+
+    def rollover(self, today: str, logs_today: int) -> None:
+        """
+        Start counting a new day.
+
+        Args:
+            today: New date in ISO format
+            logs_today: Logs already recorded on that date
+        """
+        self.day = today
+        self.logs_today = logs_today
+
+    def as_dict(self) -> Dict[str, int]:
+        """
+        Get the counter values.
+
+        Returns:
+            Dictionary keyed by COUNTER_NAMES
+        """
+        return {name: getattr(self, name) for name in COUNTER_NAMES}
+
+
+def compare_counters(
+    maintained: Dict[str, int],
+    rebuilt: Dict[str, int]
+) -> Dict[str, Tuple[int, int]]:
+    """
+    Find counters whose maintained value differs from a full recount.
+
+    Args:
+        maintained: Values kept up to date on the write path
+        rebuilt: Values counted from scratch
+
+    Returns:
+        Counter name -> (maintained, rebuilt) for each mismatch
+    """
+    return {
+        name: (maintained[name], rebuilt[name])
+        for name in COUNTER_NAMES
+        if maintained[name] != rebuilt[name]
+    }
@@ -0,0 +1,220 @@
+import atexit
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Any, Iterator, Optional
+"""
+Mutation Journal Module
+Append-only write-ahead journal for care-log, medication and task writes.
+
+Each mutation is appended as one JSON line with a sequence number before it is
+applied to the database. fsync is batched (by event count and elapsed time) so a
+busy medication round does not pay one disk flush per button press. The database
+records the highest sequence it has applied; after a snapshot (a durable database
+checkpoint) the journal is compacted down to the unapplied tail, so replay on
+startup only reads events written since the last snapshot.
+"""
+
+LOG_CREATED = 'log_created'
+MEDICATION_GIVEN = 'medication_given'
+TASK_UPDATED = 'task_updated'
+
+
+class MutationJournal:
+    """
+    Append-only JSON-lines journal with batched fsync and tail compaction.
+    One instance is shared per journal file (see open_journal).
+    """
+
+    def __init__(
+        self,
+        path: str,
+        batch_size: int = 32,
+        flush_interval: float = 1.0
+    ):
+        """
+        Open the journal file for appending.
+
+        Args:
+            path: Path of the journal file
+            batch_size: Number of events written before forcing an fsync
+            flush_interval: Maximum seconds between fsyncs while events are written
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.lock = threading.Lock()
+        self._truncate_torn_tail()
+        self.last_seq = self._read_last_seq()
+        self.pending = 0
+        self.last_sync = time.monotonic()
+        self.file = open(path, 'a', encoding='utf-8')
+
+    def _truncate_torn_tail(self) -> None:
+        """
+        Cut the file back to the end of its last complete event.
+        A crash mid-write can leave a final line without its newline (or one that
+        is not valid JSON); appending after it would glue the next event onto the
+        broken line and hide every later event from read_events.
+        """
+        if not os.path.exists(self.path):
+            return
+
+        good_size = 0
+        with open(self.path, 'rb') as journal_file:
+            for line in journal_file:
+                if not line.endswith(b'\n'):
+                    break
+                try:
+                    json.loads(line)
+                except ValueError:
+                    break
+                good_size += len(line)
+            size = journal_file.seek(0, os.SEEK_END)
+
+        if good_size < size:
+            with open(self.path, 'r+b') as journal_file:
+                journal_file.truncate(good_size)
+                journal_file.flush()
+                os.fsync(journal_file.fileno())
+
+    def _read_last_seq(self) -> int:
+        """Find the highest sequence number already in the journal file."""
+        last_seq = 0
+        for event in self.read_events():
+            last_seq = event['seq']
+        return last_seq
+
+    def reserve_seq(self, floor: int) -> None:
+        """
+        Make sure new events are numbered above a sequence already applied elsewhere.
+
+        Args:
+            floor: Highest sequence number known to be applied
+        """
+        with self.lock:
+            self.last_seq = max(self.last_seq, floor)
+
+    def append(self, event_type: str, payload: Dict[str, Any]) -> int:
+        """
+        Append a mutation event.
+
+        Args:
+            event_type: One of LOG_CREATED, MEDICATION_GIVEN, TASK_UPDATED
+            payload: Event data needed to re-apply the mutation
+
+        Returns:
+            Sequence number assigned to the event
+        """
+        with self.lock:
+            self.last_seq += 1
+            event = {
+                'seq': self.last_seq,
+                'type': event_type,
+                'at': datetime.now().isoformat(),
+                'payload': payload
+            }
+            self.file.write(json.dumps(event) + '\n')
+            self.file.flush()
+            self.pending += 1
+
+            if (self.pending >= self.batch_size or
+                    time.monotonic() - self.last_sync >= self.flush_interval):
+                self._sync_locked()
+
+            return event['seq']
+
+    def sync(self) -> None:
+        """Force pending events to disk."""
+        with self.lock:
+            self._sync_locked()
+
+    def _sync_locked(self) -> None:
+        """fsync the journal file. Caller must hold the lock."""
+        if self.pending:
+            os.fsync(self.file.fileno())
+            self.pending = 0
+        self.last_sync = time.monotonic()
+
+    def read_events(self, after_seq: int = 0) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate events with a sequence number above after_seq.
+        Reading stops at a line that is not valid JSON; a torn final line left by
+        a crash mid-write is cut off when the journal is opened.
+
+        Args:
+            after_seq: Only yield events newer than this sequence
+
+        Yields:
+            Event dictionaries in journal order
+        """
+        if not os.path.exists(self.path):
+            return
+
+        with open(self.path, 'r', encoding='utf-8') as journal_file:
+            for line in journal_file:
+                try:
+                    event = json.loads(line)
+                except ValueError:
+                    return
+                if event['seq'] > after_seq:
+                    yield event
+
+    def compact(self, snapshot_seq: int) -> None:
+        """
+        Drop events already captured by a durable snapshot.
+
+        Args:
+            snapshot_seq: Highest sequence number included in the snapshot
+        """
+        with self.lock:
+            self._sync_locked()
+            self.file.close()
+
+            tail = list(self.read_events(after_seq=snapshot_seq))
+            temp_path = self.path + '.compact'
+            with open(temp_path, 'w', encoding='utf-8') as temp_file:
+                for event in tail:
+                    temp_file.write(json.dumps(event) + '\n')
+                temp_file.flush()
+                os.fsync(temp_file.fileno())
+            os.replace(temp_path, self.path)
+
+            self.file = open(self.path, 'a', encoding='utf-8')
+
+    def close(self) -> None:
+        """Sync and close the journal file."""
+        with self.lock:
+            if not self.file.closed:
+                self._sync_locked()
+                self.file.close()
+
+
+_journals: Dict[str, MutationJournal] = {}
+_journals_lock = threading.Lock()
+
+
+def open_journal(path: str) -> MutationJournal:
+    """
+    Get the shared journal for a file, opening it on first use.
+    Sharing one instance keeps sequence numbers unique across sessions.
+
+    Args:
+        path: Path of the journal file
+
+    Returns:
+        MutationJournal instance
+    """
+    with _journals_lock:
+        journal: Optional[MutationJournal] = _journals.get(path)
+        if journal is None or journal.file.closed:
+            journal = MutationJournal(path)
+            _journals[path] = journal
+            atexit.register(journal.close)
+        return journal
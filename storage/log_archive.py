@@ -0,0 +1,374 @@
+import json
+import os
+from datetime import date
+from typing import Dict, List, Any, Iterator, Tuple
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+from models.status_scales import (
+    STATUS_SCALES, MEAL_AMOUNTS, encode_value, meal_label, status_label
+)
+"""
+Log Archive Module
+Columnar monthly archive for older daily logs.
+
+Logs older than the hot window are moved out of SQLite into Parquet files
+partitioned by patient and month (patient_id=<id>/month=YYYY-MM.parquet).
+Vitals, status, self-care and nutrition fields are flattened into typed columns,
+so a month or date-range view opens only the partitions it needs and filters on
+the date column inside the Parquet reader. Status and meal amount positions are
+written as their labels in dictionary-encoded columns, which Parquet already
+stores as small integer codes, so archives stay readable without the scales.
+
+pyarrow is optional; without it the archive is disabled and logs stay in SQLite.
+"""
+
+VITAL_COLUMNS = [
+    ('temperature', 'float32'),
+    ('blood_pressure', 'string'),
+    ('systolic', 'int16'),
+    ('diastolic', 'int16'),
+    ('heart_rate', 'int16'),
+    ('respiratory_rate', 'int16'),
+    ('oxygen_saturation', 'int16'),
+    ('weight', 'float32'),
+]
+ACTIVITY_COLUMNS = [
+    'mood',
+    'sleep_quality',
+    'appetite',
+    'activity_level',
+    'social_engagement',
+    'communication',
+]
+SELF_CARE_COLUMNS = [
+    'bathing',
+    'toileting',
+    'dressing',
+    'grooming',
+    'eating',
+    'mobility',
+]
+MEALS = ['breakfast', 'lunch', 'dinner']
+TEXT_COLUMNS = ['general_notes', 'incidents', 'logged_by']
+FLATTENED_KEYS = {
+    'id', 'date', 'time', 'timestamp', 'vitals', 'activities', 'self_care',
+    'meals', 'medications_given', *TEXT_COLUMNS
+}
+
+
+def _build_schema():
+    """Build the Arrow schema for archived logs."""
+    fields = [
+        ('id', pa.string()),
+        ('date', pa.date32()),
+        ('time', pa.string()),
+        ('timestamp', pa.string()),
+    ]
+    fields += [(f'vitals_{name}', getattr(pa, kind)()) for name, kind in VITAL_COLUMNS]
+    fields += [(f'status_{name}', pa.dictionary(pa.int8(), pa.string()))
+               for name in ACTIVITY_COLUMNS]
+    fields += [(f'self_care_{name}', pa.bool_()) for name in SELF_CARE_COLUMNS]
+    for meal in MEALS:
+        fields += [
+            (f'{meal}_amount', pa.dictionary(pa.int8(), pa.string())),
+            (f'{meal}_calories', pa.int16()),
+        ]
+    fields += [
+        ('total_calories', pa.int32()),
+        ('total_fluids', pa.int32()),
+        ('medications_given', pa.string()),
+    ]
+    fields += [(name, pa.string()) for name in TEXT_COLUMNS]
+    fields += [('extra', pa.string())]
+    return pa.schema(fields)
+
+
+ARCHIVE_SCHEMA = _build_schema() if pa is not None else None
+
+
+class LogFlattener:
+    """
+    Converts between nested log dictionaries and flat archive rows.
+    Sections missing from a log (e.g. vitals on a medication-only day record)
+    are stored as nulls and left out again when the log is rebuilt.
+    """
+
+    @staticmethod
+    def flatten(log: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Flatten a log dictionary into an archive row.
+
+        Args:
+            log: Log entry dictionary
+
+        Returns:
+            Row dictionary matching ARCHIVE_SCHEMA
+        """
+        vitals = log.get('vitals') or {}
+        activities = log.get('activities') or {}
+        self_care = log.get('self_care') or {}
+        meals = log.get('meals') or {}
+
+        row = {
+            'id': log['id'],
+            'date': date.fromisoformat(log['date']),
+            'time': log.get('time'),
+            'timestamp': log.get('timestamp'),
+        }
+        for name, _ in VITAL_COLUMNS:
+            row[f'vitals_{name}'] = vitals.get(name)
+        for name in ACTIVITY_COLUMNS:
+            row[f'status_{name}'] = status_label(activities, name)
+        for name in SELF_CARE_COLUMNS:
+            row[f'self_care_{name}'] = self_care.get(name)
+        for meal in MEALS:
+            meal_data = meals.get(meal) or {}
+            row[f'{meal}_amount'] = meal_label(meal_data)
+            row[f'{meal}_calories'] = meal_data.get('calories')
+        row['total_calories'] = meals.get('total_calories')
+        row['total_fluids'] = meals.get('total_fluids')
+        row['medications_given'] = (
+            json.dumps(log['medications_given'])
+            if 'medications_given' in log else None
+        )
+        for name in TEXT_COLUMNS:
+            row[name] = log.get(name)
+
+        extra = {key: value for key, value in log.items() if key not in FLATTENED_KEYS}
+        row['extra'] = json.dumps(extra) if extra else None
+        return row
+
+    @staticmethod
+    def unflatten(row: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Rebuild a log dictionary from an archive row.
+
+        Args:
+            row: Row dictionary read from Parquet
+
+        Returns:
+            Log entry dictionary
+        """
+        log = {
+            'id': row['id'],
+            'date': row['date'].isoformat(),
+        }
+        for key in ('time', 'timestamp'):
+            if row[key] is not None:
+                log[key] = row[key]
+
+        sections = {
+            'vitals': {name: row[f'vitals_{name}'] for name, _ in VITAL_COLUMNS},
+            'activities': {
+                name: encode_value(STATUS_SCALES[name], row[f'status_{name}'])
+                for name in ACTIVITY_COLUMNS
+            },
+            'self_care': {name: row[f'self_care_{name}'] for name in SELF_CARE_COLUMNS},
+        }
+        for section, values in sections.items():
+            if any(value is not None for value in values.values()):
+                log[section] = values
+
+        if 'vitals' in log:
+            for name in ('temperature', 'weight'):
+                if log['vitals'][name] is not None:
+                    log['vitals'][name] = round(log['vitals'][name], 1)
+
+        meals = {
+            meal: {
+                'amount': encode_value(MEAL_AMOUNTS, row[f'{meal}_amount']),
+                'calories': row[f'{meal}_calories'],
+            }
+            for meal in MEALS
+        }
+        meals['total_calories'] = row['total_calories']
+        meals['total_fluids'] = row['total_fluids']
+        if row['total_calories'] is not None or row['total_fluids'] is not None:
+            log['meals'] = meals
+
+        if row['medications_given'] is not None:
+            log['medications_given'] = json.loads(row['medications_given'])
+        for name in TEXT_COLUMNS:
+            if row[name] is not None:
+                log[name] = row[name]
+        if row['extra']:
+            log.update(json.loads(row['extra']))
+
+        return log
+
+
+class MonthlyLogArchive:
+    """
+    Parquet archive of daily logs partitioned by patient and month.
+    """
+
+    def __init__(self, root: str):
+        """
+        Create the archive rooted at a directory.
+
+        Args:
+            root: Directory that holds the partition files
+        """
+        self.root = root
+
+    @property
+    def available(self) -> bool:
+        """True if pyarrow is installed and the archive can be used."""
+        return pa is not None
+
+    def partition_path(self, patient_id: str, year_month: str) -> str:
+        """
+        Get the file path of a patient-month partition.
+
+        Args:
+            patient_id: ID of the patient
+            year_month: Month in YYYY-MM format
+
+        Returns:
+            Path of the Parquet file
+        """
+        return os.path.join(
+            self.root,
+            f"patient_id={patient_id}",
+            f"month={year_month}.parquet"
+        )
+
+    def archived_months(self, patient_id: str) -> List[str]:
+        """
+        List the archived months for a patient, oldest first.
+
+        Args:
+            patient_id: ID of the patient
+
+        Returns:
+            List of YYYY-MM strings
+        """
+        directory = os.path.join(self.root, f"patient_id={patient_id}")
+        if not os.path.isdir(directory):
+            return []
+        return sorted(
+            name[len('month='):-len('.parquet')]
+            for name in os.listdir(directory)
+            if name.startswith('month=') and name.endswith('.parquet')
+        )
+
+    def write_month(
+        self,
+        patient_id: str,
+        year_month: str,
+        logs: List[Dict[str, Any]]
+    ) -> None:
+        """
+        Write logs into a patient-month partition, merging with existing rows.
+
+        Args:
+            patient_id: ID of the patient
+            year_month: Month in YYYY-MM format
+            logs: Log entries dated within that month
+        """
+        path = self.partition_path(patient_id, year_month)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        rows = {}
+        if os.path.exists(path):
+            for row in pq.read_table(path, schema=ARCHIVE_SCHEMA).to_pylist():
+                rows[row['id']] = row
+        for log in logs:
+            rows[log['id']] = LogFlattener.flatten(log)
+
+        ordered = sorted(rows.values(), key=lambda x: (x['date'], x['timestamp'] or ''))
+        table = pa.Table.from_pylist(ordered, schema=ARCHIVE_SCHEMA)
+
+        temp_path = path + '.part'
+        pq.write_table(table, temp_path)
+        os.replace(temp_path, path)
+
+    def read_range(
+        self,
+        patient_id: str,
+        start_date: str,
+        end_date: str
+    ) -> List[Dict[str, Any]]:
+        """
+        Read a patient's archived logs between two ISO dates (inclusive).
+        Only partitions overlapping the range are opened, and the date filter
+        is pushed down into the Parquet reader.
+
+        Args:
+            patient_id: ID of the patient
+            start_date: First date in ISO format
+            end_date: Last date in ISO format
+
+        Returns:
+            List of log dictionaries ordered by date and timestamp
+        """
+        if not self.available:
+            return []
+
+        start = date.fromisoformat(start_date)
+        end = date.fromisoformat(end_date)
+        logs = []
+
+        for year_month in self.archived_months(patient_id):
+            if not start_date[:7] <= year_month <= end_date[:7]:
+                continue
+            table = pq.read_table(
+                self.partition_path(patient_id, year_month),
+                schema=ARCHIVE_SCHEMA,
+                filters=[('date', '>=', start), ('date', '<=', end)]
+            )
+            logs.extend(LogFlattener.unflatten(row) for row in table.to_pylist())
+
+        return logs
+
+    def read_latest(self, patient_id: str, limit: int) -> List[Dict[str, Any]]:
+        """
+        Read a patient's most recent archived logs, newest first.
+
+        Args:
+            patient_id: ID of the patient
+            limit: Maximum number of logs to return
+
+        Returns:
+            List of log dictionaries
+        """
+        if not self.available:
+            return []
+
+        logs = []
+        for year_month in reversed(self.archived_months(patient_id)):
+            table = pq.read_table(
+                self.partition_path(patient_id, year_month),
+                schema=ARCHIVE_SCHEMA
+            )
+            month_logs = [LogFlattener.unflatten(row) for row in table.to_pylist()]
+            month_logs.sort(key=lambda x: x.get('timestamp', ''), reverse=True)
+            logs.extend(month_logs)
+            if len(logs) >= limit:
+                break
+
+        return logs[:limit]
+
+
+def group_by_partition(
+    rows: Iterator[Tuple[str, Dict[str, Any]]]
+) -> Dict[Tuple[str, str], List[Dict[str, Any]]]:
+    """
+    Group (patient_id, log) pairs by (patient_id, YYYY-MM) partition key.
+
+    Args:
+        rows: Iterable of (patient_id, log) pairs
+
+    Returns:
+        Dictionary mapping partition key to log list
+    """
+    partitions = {}
+    for patient_id, log in rows:
+        partitions.setdefault((patient_id, log['date'][:7]), []).append(log)
+    return partitions
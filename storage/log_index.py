@@ -0,0 +1,345 @@
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from typing import Callable, Dict, List, Any, Iterable, Optional, Tuple
+
+from models.records import DailyLog
+"""
+Log Index Module
+In-memory per-patient index of daily logs sorted by (date, timestamp, id).
+
+Range queries and pages of a range are two bisects and a slice, and recent logs
+are a tail read. The index is loaded per patient on first use and maintained by
+the repository on every log write.
+
+A (patient_id, date) map pins the "day record" that medication administrations
+are attached to, so every press during a round lands on the same log.
+
+Logs are held as slotted DailyLog records with interned strings and shared
+small mappings. Callers pass and receive plain dictionaries: written logs are
+converted on the way in and every read returns new dictionaries, so a caller
+changing a log it read cannot change the index.
+"""
+
+MAX_KEY = '\uffff'
+
+
+def log_sort_key(log: Dict[str, Any]) -> Tuple[str, str, str]:
+    """
+    Sort key of a log dictionary. The log ID makes keys unique, so logs sharing
+    a date and timestamp (legacy logs have an empty timestamp) keep a fixed
+    order and a page cursor never skips one of them.
+
+    Args:
+        log: Log dictionary
+
+    Returns:
+        (date, timestamp, id) tuple
+    """
+    return log['date'], log.get('timestamp') or '', log['id']
+
+
+def page_newest_first(
+    keys: List[Tuple[str, str, str]],
+    logs: List[Dict[str, Any]],
+    start_date: str,
+    end_date: str,
+    before: Optional[Tuple[str, str, str]],
+    limit: int
+) -> Tuple[List[Dict[str, Any]], Optional[Tuple[str, str, str]]]:
+    """
+    Get one page of logs in a date range, newest first, from sorted lists.
+
+    Args:
+        keys: Unique (date, timestamp, id) keys in ascending order (see log_sort_key)
+        logs: Logs matching keys
+        start_date: First date in ISO format
+        end_date: Last date in ISO format
+        before: Cursor from the previous page, or None for the newest page
+        limit: Page size
+
+    Returns:
+        Tuple of (logs on the page, cursor for the next older page or None)
+    """
+    low = bisect_left(keys, (start_date, ''))
+    high = bisect_right(keys, (end_date, MAX_KEY))
+    if before is not None:
+        high = min(high, bisect_left(keys, tuple(before)))
+
+    first = max(low, high - limit)
+    page = logs[first:high]
+    page.reverse()
+    return page, (keys[first] if first > low else None)
+
+
+class PatientLogIndex:
+    """
+    Sorted logs for a single patient.
+    """
+
+    def __init__(self, logs: Iterable[Dict[str, Any]]):
+        """
+        Build the index from logs ordered by date and timestamp.
+        Ties are put in ID order; on ordered input that sort is a single pass.
+
+        Args:
+            logs: Log dictionaries in (date, timestamp) order
+        """
+        self.keys: List[Tuple[str, str, str]] = []
+        self.logs: List[DailyLog] = []
+        self.by_date: Dict[str, List[DailyLog]] = {}
+        self.by_id: Dict[str, DailyLog] = {}
+
+        for log in sorted(map(DailyLog.from_dict, logs), key=self._key):
+            self.keys.append(self._key(log))
+            self.logs.append(log)
+            self.by_date.setdefault(log.date, []).append(log)
+            self.by_id[log.id] = log
+
+    @staticmethod
+    def _key(log: DailyLog) -> Tuple[str, str, str]:
+        """Sort key of a log, as log_sort_key."""
+        return log.date, log.timestamp or '', log.id
+
+    def upsert(self, log: Dict[str, Any]) -> bool:
+        """
+        Insert a log, or replace the entry with the same ID in place.
+
+        Args:
+            log: Log dictionary
+
+        Returns:
+            True if the log was new to the index
+        """
+        log = DailyLog.from_dict(log)
+        existing = self.by_id.get(log.id)
+        if existing is not None and self._key(existing) == self._key(log):
+            self.logs[self._position(existing)] = log
+            same_day = self.by_date[log.date]
+            same_day[same_day.index(existing)] = log
+            self.by_id[log.id] = log
+            return False
+
+        if existing is not None:
+            self._remove(existing)
+
+        key = self._key(log)
+        position = bisect_right(self.keys, key)
+        self.keys.insert(position, key)
+        self.logs.insert(position, log)
+
+        same_day = self.by_date.setdefault(log.date, [])
+        day_keys = [self._key(entry) for entry in same_day]
+        same_day.insert(bisect_right(day_keys, key), log)
+
+        self.by_id[log.id] = log
+        return existing is None
+
+    def get(self, log_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a log by ID.
+
+        Args:
+            log_id: ID of the log
+
+        Returns:
+            Log dictionary, or None if not indexed
+        """
+        log = self.by_id.get(log_id)
+        return log.to_dict() if log is not None else None
+
+    def _position(self, log: DailyLog) -> int:
+        """Find a log's position in the sorted lists."""
+        key = self._key(log)
+        position = bisect_left(self.keys, key)
+        while self.logs[position] is not log:
+            position += 1
+        return position
+
+    def _remove(self, log: DailyLog) -> None:
+        """Remove a log from every structure."""
+        position = self._position(log)
+        del self.keys[position]
+        del self.logs[position]
+        same_day = self.by_date[log.date]
+        same_day.remove(log)
+        if not same_day:
+            del self.by_date[log.date]
+        del self.by_id[log.id]
+
+    def range(self, start_date: str, end_date: str) -> List[Dict[str, Any]]:
+        """
+        Get logs between two ISO dates (inclusive), oldest first.
+
+        Args:
+            start_date: First date in ISO format
+            end_date: Last date in ISO format
+
+        Returns:
+            List of log dictionaries
+        """
+        low = bisect_left(self.keys, (start_date, ''))
+        high = bisect_right(self.keys, (end_date, MAX_KEY))
+        return [log.to_dict() for log in self.logs[low:high]]
+
+    def page(
+        self,
+        start_date: str,
+        end_date: str,
+        before: Optional[Tuple[str, str, str]],
+        limit: int
+    ) -> Tuple[List[Dict[str, Any]], Optional[Tuple[str, str, str]]]:
+        """
+        Get one page of logs in a date range, newest first.
+
+        Args:
+            start_date: First date in ISO format
+            end_date: Last date in ISO format
+            before: Cursor from the previous page, or None for the newest page
+            limit: Page size
+
+        Returns:
+            Tuple of (logs on the page, cursor for the next older page or None)
+        """
+        page, cursor = page_newest_first(
+            self.keys, self.logs, start_date, end_date, before, limit
+        )
+        return [log.to_dict() for log in page], cursor
+
+    def count_range(self, start_date: str, end_date: str) -> int:
+        """
+        Count logs between two ISO dates (inclusive).
+
+        Args:
+            start_date: First date in ISO format
+            end_date: Last date in ISO format
+
+        Returns:
+            Number of logs
+        """
+        low = bisect_left(self.keys, (start_date, ''))
+        high = bisect_right(self.keys, (end_date, MAX_KEY))
+        return high - low
+
+    def tail(self, limit: int) -> List[Dict[str, Any]]:
+        """
+        Get the most recent logs, newest first.
+
+        Args:
+            limit: Maximum number of logs to return
+
+        Returns:
+            List of log dictionaries
+        """
+        return [log.to_dict() for log in self.logs[:-limit - 1:-1]] if limit > 0 else []
+
+
+class LogDateIndex:
+    """
+    Per-patient log indexes, a facility-wide count of logs per date and the
+    (patient_id, date) -> day record map.
+    """
+
+    def __init__(
+        self,
+        load_patient_logs: Callable[[str], List[Dict[str, Any]]],
+        date_counts: Dict[str, int]
+    ):
+        """
+        Create the index.
+
+        Args:
+            load_patient_logs: Returns a patient's logs in (date, timestamp) order
+            date_counts: Number of logs recorded on each date across all patients
+        """
+        self.load_patient_logs = load_patient_logs
+        self.date_counts = Counter(date_counts)
+        self.patients: Dict[str, PatientLogIndex] = {}
+        self.day_records: Dict[Tuple[str, str], str] = {}
+
+    def patient(self, patient_id: str) -> PatientLogIndex:
+        """
+        Get a patient's index, loading it on first use.
+
+        Args:
+            patient_id: ID of the patient
+
+        Returns:
+            PatientLogIndex for the patient
+        """
+        index = self.patients.get(patient_id)
+        if index is None:
+            index = PatientLogIndex(self.load_patient_logs(patient_id))
+            self.patients[patient_id] = index
+        return index
+
+    def upsert(self, patient_id: str, log: Dict[str, Any]) -> None:
+        """
+        Record a written log. The patient's index must have been loaded
+        before the write so a new log is counted exactly once.
+
+        Args:
+            patient_id: ID of the patient
+            log: Log dictionary
+        """
+        previous = self.patient(patient_id).by_id.get(log['id'])
+        previous_date = previous.date if previous is not None else None
+
+        self.patient(patient_id).upsert(log)
+
+        if previous_date is not None and previous_date != log['date']:
+            if self.day_records.get((patient_id, previous_date)) == log['id']:
+                del self.day_records[(patient_id, previous_date)]
+
+        if previous_date != log['date']:
+            if previous_date is not None:
+                self.date_counts[previous_date] -= 1
+            self.date_counts[log['date']] += 1
+
+    def day_record(self, patient_id: str, log_date: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the log that medication administrations for a day are attached to.
+        The first choice for a day is pinned: a log that already holds
+        administrations if there is one, otherwise the earliest log that day.
+
+        Args:
+            patient_id: ID of the patient
+            log_date: Date in ISO format
+
+        Returns:
+            The day record, or None if the patient has no log that day
+        """
+        index = self.patient(patient_id)
+        key = (patient_id, log_date)
+        record = index.by_id.get(self.day_records.get(key))
+        if record is None:
+            same_day = index.by_date.get(log_date)
+            if not same_day:
+                return None
+            record = next(
+                (log for log in same_day if log.medications_given is not None),
+                same_day[0]
+            )
+            self.day_records[key] = record.id
+        return record.to_dict()
+
+    def set_day_record(self, patient_id: str, log: Dict[str, Any]) -> None:
+        """
+        Pin a log as the day record for its date.
+
+        Args:
+            patient_id: ID of the patient
+            log: Log dictionary
+        """
+        self.day_records[(patient_id, log['date'])] = log['id']
+
+    def count_on(self, log_date: str) -> int:
+        """
+        Count logs recorded on a date across all patients.
+
+        Args:
+            log_date: Date in ISO format
+
+        Returns:
+            Number of logs
+        """
+        return self.date_counts.get(log_date, 0)
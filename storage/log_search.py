@@ -0,0 +1,157 @@
+import re
+from typing import Dict, Any
+"""
+Log Search Module
+Full-text search over the free-text fields of daily logs.
+
+The notes, incidents and behavioural changes of every log are copied into the
+log_text table, and an SQLite FTS5 index over it holds the inverted index:
+words are tokenised with unicode61, stemmed with the Porter stemmer (so "fall"
+also finds "falls" and "falling") and stored with their positions, which makes
+quoted phrases work. Triggers keep the index in step with log_text, and the
+repository writes a log's row in the same transaction as the log itself. Rows
+are not removed when logs move to the archive, so search covers the whole
+history. Results are ranked with BM25.
+"""
+
+SEARCH_FIELDS = ['general_notes', 'incidents', 'behavioral_changes']
+
+SEARCH_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS log_text (
+        id INTEGER PRIMARY KEY,
+        log_id TEXT NOT NULL UNIQUE,
+        patient_id TEXT NOT NULL,
+        date TEXT NOT NULL,
+        general_notes TEXT,
+        incidents TEXT,
+        behavioral_changes TEXT
+    );
+    CREATE INDEX IF NOT EXISTS idx_log_text_date ON log_text (date);
+
+    CREATE VIRTUAL TABLE IF NOT EXISTS log_search USING fts5(
+        general_notes,
+        incidents,
+        behavioral_changes,
+        content = 'log_text',
+        content_rowid = 'id',
+        tokenize = 'porter unicode61'
+    );
+
+    CREATE TRIGGER IF NOT EXISTS log_text_insert AFTER INSERT ON log_text BEGIN
+        INSERT INTO log_search (rowid, general_notes, incidents, behavioral_changes)
+        VALUES (new.id, new.general_notes, new.incidents, new.behavioral_changes);
+    END;
+    CREATE TRIGGER IF NOT EXISTS log_text_delete AFTER DELETE ON log_text BEGIN
+        INSERT INTO log_search (log_search, rowid, general_notes, incidents, behavioral_changes)
+        VALUES ('delete', old.id, old.general_notes, old.incidents, old.behavioral_changes);
+    END;
+    CREATE TRIGGER IF NOT EXISTS log_text_update AFTER UPDATE ON log_text BEGIN
+        INSERT INTO log_search (log_search, rowid, general_notes, incidents, behavioral_changes)
+        VALUES ('delete', old.id, old.general_notes, old.incidents, old.behavioral_changes);
+        INSERT INTO log_search (rowid, general_notes, incidents, behavioral_changes)
+        VALUES (new.id, new.general_notes, new.incidents, new.behavioral_changes);
+    END;
+
+    INSERT OR IGNORE INTO meta (key, value) VALUES ('log_text_filled', 0);
+"""
+
+LOG_TEXT_UPSERT = (
+    "INSERT INTO log_text "
+    "(log_id, patient_id, date, general_notes, incidents, behavioral_changes) "
+    "VALUES (?, ?, ?, ?, ?, ?) "
+    "ON CONFLICT (log_id) DO UPDATE SET "
+    "patient_id = excluded.patient_id, date = excluded.date, "
+    "general_notes = excluded.general_notes, incidents = excluded.incidents, "
+    "behavioral_changes = excluded.behavioral_changes"
+)
+
+SEARCH_QUERY = """
+    SELECT
+        log_text.log_id,
+        log_text.patient_id,
+        log_text.date,
+        snippet(log_search, 0, char(2), char(3), '...', 16),
+        snippet(log_search, 1, char(2), char(3), '...', 16),
+        snippet(log_search, 2, char(2), char(3), '...', 16)
+    FROM log_search
+    JOIN log_text ON log_text.id = log_search.rowid
+    WHERE log_search MATCH ?
+      AND log_text.date BETWEEN ? AND ?
+      {patient_filter}
+    ORDER BY bm25(log_search)
+    LIMIT ?
+"""
+
+HIGHLIGHT_START = '\x02'
+HIGHLIGHT_END = '\x03'
+TERM_PATTERN = re.compile(r'"([^"]+)"|(\w+)')
+
+
+def text_row(patient_id: str, log: Dict[str, Any]) -> tuple:
+    """
+    Build the log_text row for a log entry.
+
+    Args:
+        patient_id: ID of the patient
+        log: Log entry dictionary
+
+    Returns:
+        Row values in LOG_TEXT_UPSERT order
+    """
+    return (
+        log['id'],
+        patient_id,
+        log['date'],
+        *(log.get(field) or None for field in SEARCH_FIELDS)
+    )
+
+
+def has_text(log: Dict[str, Any]) -> bool:
+    """Check if a log has any searchable text."""
+    return any(log.get(field) for field in SEARCH_FIELDS)
+
+
+def build_match_query(text: str) -> str:
+    """
+    Turn search box text into an FTS5 query. Words must all appear;
+    text in double quotes must appear as a phrase. FTS5 operators typed
+    by the user are treated as plain words.
+
+    Args:
+        text: Search box text
+
+    Returns:
+        FTS5 MATCH expression, empty if the text has no words
+    """
+    terms = []
+    for phrase, word in TERM_PATTERN.findall(text):
+        words = re.findall(r'\w+', phrase) if phrase else [word]
+        if words:
+            terms.append('"' + ' '.join(words) + '"')
+    return ' '.join(terms)
+
+
+def search_hit(row: tuple) -> Dict[str, Any]:
+    """
+    Convert a SEARCH_QUERY row into a hit dictionary.
+
+    Args:
+        row: Result row
+
+    Returns:
+        Dictionary with 'log_id', 'patient_id', 'date' and 'snippets',
+        a field name -> snippet map of the fields that matched, with
+        matching words in bold
+    """
+    log_id, patient_id, log_date, *snippets = row
+    return {
+        'log_id': log_id,
+        'patient_id': patient_id,
+        'date': log_date,
+        'snippets': {
+            field: snippet.replace(HIGHLIGHT_START, '**').replace(HIGHLIGHT_END, '**')
+            for field, snippet in zip(SEARCH_FIELDS, snippets)
+            if snippet and HIGHLIGHT_START in snippet
+        },
+    }
+
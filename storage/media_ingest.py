@@ -0,0 +1,89 @@
+import os
+from typing import Optional
+"""
+Media Ingest Module
+Limits and content checks for memory book uploads.
+
+Uploads are streamed into the blob store in chunks (see BlobStore.ingest). The
+first bytes are sniffed to find the real MIME type, which is stored instead of
+the browser-reported type when recognised and must match the chosen media type.
+Each file and each patient's memory book have a size quota, configured in
+megabytes through CARE_MAX_UPLOAD_MB and CARE_PATIENT_MEDIA_QUOTA_MB.
+"""
+
+MAX_FILE_BYTES = int(os.environ.get('CARE_MAX_UPLOAD_MB', '500')) * 1024 * 1024
+PATIENT_QUOTA_BYTES = int(os.environ.get('CARE_PATIENT_MEDIA_QUOTA_MB', '2048')) * 1024 * 1024
+
+MEDIA_TYPE_PREFIXES = {
+    'Photo': 'image/',
+    'Video': 'video/',
+    'Audio': 'audio/',
+}
+
+
+class MediaIngestError(ValueError):
+    """Raised when an upload breaks a quota or does not match its media type."""
+
+
+def sniff_mime(head: bytes) -> Optional[str]:
+    """
+    Identify common photo, video and audio formats from their first bytes.
+
+    Args:
+        head: Leading bytes of the file (at least 12 for container formats)
+
+    Returns:
+        MIME type, or None if the format is not recognised
+    """
+    if head.startswith(b'\xff\xd8\xff'):
+        return 'image/jpeg'
+    if head.startswith(b'\x89PNG\r\n\x1a\n'):
+        return 'image/png'
+    if head.startswith((b'GIF87a', b'GIF89a')):
+        return 'image/gif'
+    if head[:4] == b'RIFF' and head[8:12] == b'WEBP':
+        return 'image/webp'
+    if head[:4] == b'RIFF' and head[8:12] == b'WAVE':
+        return 'audio/wav'
+    if head[4:8] == b'ftyp':
+        brand = head[8:12]
+        if brand in (b'M4A ', b'M4B '):
+            return 'audio/mp4'
+        if brand in (b'heic', b'heix', b'mif1'):
+            return 'image/heic'
+        if brand == b'qt  ':
+            return 'video/quicktime'
+        return 'video/mp4'
+    if head.startswith(b'\x1a\x45\xdf\xa3'):
+        return 'video/webm'
+    if head.startswith(b'OggS'):
+        return 'audio/ogg'
+    if head.startswith(b'fLaC'):
+        return 'audio/flac'
+    if head.startswith(b'ID3') or head[:2] in (b'\xff\xfb', b'\xff\xf3', b'\xff\xf2'):
+        return 'audio/mpeg'
+    return None
+
+
+def check_media_type(media_type: str, mime: Optional[str]) -> None:
+    """
+    Check that a sniffed MIME type fits the media type chosen in the form.
+    Unrecognised formats are accepted.
+
+    Args:
+        media_type: 'Photo', 'Video' or 'Audio'
+        mime: Sniffed MIME type or None
+
+    Raises:
+        MediaIngestError: If the file is a different kind of media
+    """
+    prefix = MEDIA_TYPE_PREFIXES.get(media_type)
+    if mime is not None and prefix is not None and not mime.startswith(prefix):
+        raise MediaIngestError(
+            f"The file looks like {mime}, which is not a {media_type.lower()}"
+        )
+
+
+def format_megabytes(size: int) -> str:
+    """Format a byte count in megabytes for messages."""
+    return f"{size / (1024 * 1024):.0f} MB"
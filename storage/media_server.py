@@ -0,0 +1,302 @@
+import os
+import re
+import threading
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Any, Optional, Tuple
+from urllib.error import URLError
+from urllib.parse import urlsplit
+from urllib.request import Request, urlopen
+
+import streamlit as st
+
+from storage.blob_store import HEAD_SIZE
+from storage.media_ingest import sniff_mime
+from storage.repository import get_repository
+"""
+Media Server Module
+Small HTTP server for memory book media, started alongside the Streamlit app.
+
+Media is served by content hash (/media/<hash>, /thumbnails/<hash>) with byte
+range support, so browsers can seek and stream large videos instead of
+receiving the whole file through the Streamlit websocket on every rerun.
+Content-addressed files never change, so responses carry the hash as ETag and a
+long-lived immutable Cache-Control header. The Content-Type is sniffed from the
+file's first bytes, never taken from the request.
+
+The server only runs when CARE_MEDIA_URL gives the base URL clients use to reach
+it (for example through the reverse proxy in front of the app); a localhost
+default would point ward tablets and family phones at themselves.
+CARE_MEDIA_HOST / CARE_MEDIA_PORT choose the listening address. After starting,
+the server requests its own /health path through CARE_MEDIA_URL and is only used
+if that answers. Without a reachable URL, pages send the bytes through Streamlit.
+"""
+
+MEDIA_HOST = os.environ.get('CARE_MEDIA_HOST', '127.0.0.1')
+MEDIA_PORT = int(os.environ.get('CARE_MEDIA_PORT', '8502'))
+MEDIA_URL = os.environ.get('CARE_MEDIA_URL')
+PROBE_TIMEOUT = 3.0
+
+CHUNK_SIZE = 64 * 1024
+CACHE_CONTROL = 'public, max-age=31536000, immutable'
+PATH_PATTERN = re.compile(r'^/(media|thumbnails)/([0-9a-f]{64})$')
+RANGE_PATTERN = re.compile(r'^bytes=(\d*)-(\d*)$')
+HEALTH_PATH = '/health'
+INSTANCE_HEADER = 'X-Care-Media-Instance'
+
+
+def parse_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parse a single-range Range header.
+
+    Args:
+        header: Value of the Range header
+        size: Size of the file in bytes
+
+    Returns:
+        Inclusive (start, end) byte positions, or None if unsatisfiable
+
+    Raises:
+        ValueError: If the header is not a single byte range
+    """
+    match = RANGE_PATTERN.match(header.strip())
+    if not match or match.groups() == ('', ''):
+        raise ValueError(header)
+
+    first, last = match.groups()
+    if first == '':
+        length = int(last)
+        if length == 0:
+            return None
+        return max(size - length, 0), size - 1
+
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        return None
+    return start, end
+
+
+class MediaRequestHandler(BaseHTTPRequestHandler):
+    """
+    Serves blobs and thumbnails by content hash.
+    """
+
+    server_version = 'CareMedia/1.0'
+    blobs = None
+    thumbnails = None
+    instance = ''
+
+    def log_message(self, format: str, *args) -> None:
+        """Keep request logs out of the Streamlit console."""
+
+    def do_HEAD(self) -> None:
+        self._serve(send_body=False)
+
+    def do_GET(self) -> None:
+        if urlsplit(self.path).path == HEALTH_PATH:
+            self.send_response(204)
+            self.send_header(INSTANCE_HEADER, self.instance)
+            self.send_header('Cache-Control', 'no-store')
+            self.end_headers()
+            return
+        self._serve(send_body=True)
+
+    @staticmethod
+    def _content_type(path: str) -> str:
+        """Sniff a stored file's MIME type, octet-stream if unrecognised."""
+        try:
+            with open(path, 'rb') as media_file:
+                head = media_file.read(HEAD_SIZE)
+        except OSError:
+            return 'application/octet-stream'
+        return sniff_mime(head) or 'application/octet-stream'
+
+    def _resolve(self) -> Tuple[Optional[str], str, str]:
+        """Map the request path to (file path, hash, content type)."""
+        match = PATH_PATTERN.match(urlsplit(self.path).path)
+        if not match:
+            return None, '', ''
+
+        kind, blob_hash = match.groups()
+        if kind == 'thumbnails':
+            return self.thumbnails.path_for(blob_hash), blob_hash, 'image/jpeg'
+
+        path = self.blobs.path_for(blob_hash)
+        return path, blob_hash, self._content_type(path)
+
+    def _serve(self, send_body: bool) -> None:
+        """Send a full or partial response for the requested file."""
+        path, blob_hash, content_type = self._resolve()
+        if path is None or not os.path.isfile(path):
+            self.send_error(404)
+            return
+
+        etag = f'"{blob_hash}"'
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.send_header('Cache-Control', CACHE_CONTROL)
+            self.end_headers()
+            return
+
+        size = os.path.getsize(path)
+        start, end = 0, size - 1
+        status = 200
+
+        range_header = self.headers.get('Range')
+        if range_header and self.headers.get('If-Range', etag) == etag:
+            try:
+                byte_range = parse_range(range_header, size)
+            except ValueError:
+                # An invalid Range header is ignored (RFC 9110 14.2): send the whole file.
+                byte_range = ()
+            if byte_range is None:
+                self.send_response(416)
+                self.send_header('Content-Range', f'bytes */{size}')
+                self.end_headers()
+                return
+            if byte_range:
+                start, end = byte_range
+                status = 206
+
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(end - start + 1))
+        self.send_header('Accept-Ranges', 'bytes')
+        self.send_header('X-Content-Type-Options', 'nosniff')
+        self.send_header('ETag', etag)
+        self.send_header('Cache-Control', CACHE_CONTROL)
+        if status == 206:
+            self.send_header('Content-Range', f'bytes {start}-{end}/{size}')
+        self.end_headers()
+
+        if not send_body:
+            return
+
+        try:
+            with open(path, 'rb') as media_file:
+                media_file.seek(start)
+                remaining = end - start + 1
+                while remaining > 0:
+                    chunk = media_file.read(min(CHUNK_SIZE, remaining))
+                    if not chunk:
+                        break
+                    self.wfile.write(chunk)
+                    remaining -= len(chunk)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+
+class MediaServer:
+    """
+    Runs the media HTTP server on a background thread.
+    """
+
+    def __init__(
+        self,
+        blobs,
+        thumbnails,
+        host: str = MEDIA_HOST,
+        port: int = MEDIA_PORT,
+        base_url: str = MEDIA_URL
+    ):
+        """
+        Create the server without starting it.
+
+        Args:
+            blobs: BlobStore holding original media
+            thumbnails: ThumbnailGenerator locating photo thumbnails
+            host: Address to listen on
+            port: Port to listen on
+            base_url: URL prefix browsers use to reach the server
+        """
+        self.instance = uuid.uuid4().hex
+        handler = type(
+            'BoundMediaRequestHandler',
+            (MediaRequestHandler,),
+            {'blobs': blobs, 'thumbnails': thumbnails, 'instance': self.instance}
+        )
+        self.httpd = ThreadingHTTPServer((host, port), handler)
+        self.httpd.daemon_threads = True
+        self.base_url = base_url.rstrip('/')
+        self.thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Start serving on a daemon thread."""
+        self.thread = threading.Thread(
+            target=self.httpd.serve_forever,
+            name='media-server',
+            daemon=True
+        )
+        self.thread.start()
+
+    def stop(self) -> None:
+        """Stop serving and release the port."""
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def reachable(self, timeout: float = PROBE_TIMEOUT) -> bool:
+        """
+        Check that the base URL reaches this server by requesting its health
+        path through the base URL and matching the instance header.
+
+        Args:
+            timeout: Seconds to wait for the response
+
+        Returns:
+            True if this server answered through the base URL
+        """
+        try:
+            with urlopen(Request(self.base_url + HEALTH_PATH), timeout=timeout) as response:
+                return response.headers.get(INSTANCE_HEADER) == self.instance
+        except (URLError, OSError, ValueError):
+            return False
+
+    def url_for(self, media: Dict[str, Any]) -> str:
+        """
+        Get the URL of a media item's original file.
+
+        Args:
+            media: Media item dictionary
+
+        Returns:
+            URL of the original file
+        """
+        return f"{self.base_url}/media/{media['blob_hash']}"
+
+    def thumbnail_url_for(self, media: Dict[str, Any]) -> str:
+        """
+        Get the URL of a photo's thumbnail.
+
+        Args:
+            media: Media item dictionary
+
+        Returns:
+            URL of the thumbnail
+        """
+        return f"{self.base_url}/thumbnails/{media['blob_hash']}"
+
+
+@st.cache_resource
+def get_media_server() -> Optional[MediaServer]:
+    """
+    Start the media server once per process if CARE_MEDIA_URL is configured.
+
+    Returns:
+        Running MediaServer, or None if no base URL is configured, the port
+        could not be opened or the base URL does not reach the server
+    """
+    if not MEDIA_URL:
+        return None
+
+    repository = get_repository()
+    try:
+        server = MediaServer(repository.blobs, repository.thumbnails)
+    except OSError:
+        return None
+    server.start()
+    if not server.reachable():
+        server.stop()
+        return None
+    return server
@@ -0,0 +1,109 @@
+from bisect import bisect_left, insort
+from typing import Callable, Dict, List, Any, Iterable, Optional, Tuple
+"""
+Patient Order Module
+Patient IDs kept sorted by each field the patient list can sort on.
+
+Each sort field has a list of (value, patient_id) pairs maintained with bisect
+when a patient is saved, so a sorted view is a walk over the list that keeps
+the IDs passing the current filter. Small filtered sets are sorted directly by
+their stored values instead.
+"""
+
+SORT_FIELDS: Dict[str, Callable[[Dict[str, Any]], Any]] = {
+    'patient_id_number': lambda patient: patient.get('patient_id_number') or '',
+    'name': lambda patient: patient.get('name') or '',
+    'age': lambda patient: patient.get('age') or 0,
+    'room': lambda patient: str(patient.get('room') or ''),
+    'created_date': lambda patient: patient.get('created_date') or '',
+}
+
+DIRECT_SORT_FRACTION = 16
+
+
+class PatientSortIndex:
+    """
+    One sorted list of (value, patient_id) per sort field.
+    """
+
+    def __init__(self, patients: Iterable[Dict[str, Any]] = ()):
+        """
+        Build the sorted lists.
+
+        Args:
+            patients: Patient dictionaries
+        """
+        self.entries: Dict[str, List[Tuple[Any, str]]] = {}
+        self.values: Dict[str, Dict[str, Any]] = {}
+
+        for patient in patients:
+            self.values[patient['id']] = {
+                field: key(patient) for field, key in SORT_FIELDS.items()
+            }
+        for field in SORT_FIELDS:
+            self.entries[field] = sorted(
+                (values[field], patient_id)
+                for patient_id, values in self.values.items()
+            )
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def update(self, patient: Dict[str, Any]) -> None:
+        """
+        Add a patient or move a changed one to its new positions.
+
+        Args:
+            patient: Patient dictionary
+        """
+        patient_id = patient['id']
+        previous = self.values.get(patient_id)
+        values = {field: key(patient) for field, key in SORT_FIELDS.items()}
+
+        for field, entries in self.entries.items():
+            if previous is not None:
+                if previous[field] == values[field]:
+                    continue
+                del entries[bisect_left(entries, (previous[field], patient_id))]
+            insort(entries, (values[field], patient_id))
+        self.values[patient_id] = values
+
+    def ordered(
+        self,
+        field: str,
+        patient_ids: Optional[Iterable[str]] = None,
+        reverse: bool = False
+    ) -> List[str]:
+        """
+        Get patient IDs in the order of a sort field.
+
+        Args:
+            field: Key of SORT_FIELDS
+            patient_ids: IDs to keep, or None for every patient
+            reverse: True for descending order
+
+        Returns:
+            Patient IDs in sorted order
+        """
+        entries = self.entries[field]
+        if patient_ids is None:
+            ordered = [patient_id for _, patient_id in entries]
+        else:
+            wanted = {
+                patient_id for patient_id in patient_ids
+                if patient_id in self.values
+            }
+            if len(wanted) * DIRECT_SORT_FRACTION < len(entries):
+                ordered = sorted(
+                    wanted,
+                    key=lambda patient_id: (self.values[patient_id][field], patient_id)
+                )
+            else:
+                ordered = [
+                    patient_id for _, patient_id in entries
+                    if patient_id in wanted
+                ]
+
+        if reverse:
+            ordered.reverse()
+        return ordered
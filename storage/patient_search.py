@@ -0,0 +1,241 @@
+from collections import Counter
+from typing import Dict, List, Any, Iterable, Optional, Set, Tuple
+"""
+Patient Search Module
+In-memory n-gram index for searching patients by ID number, name and room.
+
+Every 1-, 2- and 3-character substring of the searchable fields is posted to
+the patients containing it, so a query is answered from a few set lookups
+instead of scanning every patient. Queries of up to three characters are a
+single posting; longer queries intersect the postings of their trigrams and
+confirm the substring. When a query of four or more characters has few exact
+matches, patients sharing most of its word-boundary trigrams are ranked after
+them, so "smyth" still finds "Smith". Dementia stages have their own postings
+and filter by intersection.
+
+The repository maintains the index when patients are saved.
+"""
+
+MIN_FUZZY_LENGTH = 4
+FUZZY_BELOW_MATCHES = 5
+MIN_FUZZY_SIMILARITY = 0.4
+
+EXACT_FIELD = 0
+FIELD_PREFIX = 1
+WORD_PREFIX = 2
+SUBSTRING = 3
+FUZZY = 4
+
+
+def normalize(text: Any) -> str:
+    """Lowercase a field value and collapse whitespace."""
+    return ' '.join(str(text or '').casefold().split())
+
+
+def substrings(text: str, max_length: int = 3) -> Set[str]:
+    """
+    Get every substring of a text up to a maximum length.
+
+    Args:
+        text: Normalized text
+        max_length: Longest substring to include
+
+    Returns:
+        Set of substrings
+    """
+    return {
+        text[start:start + length]
+        for length in range(1, max_length + 1)
+        for start in range(len(text) - length + 1)
+    }
+
+
+def boundary_trigrams(text: str) -> Set[str]:
+    """
+    Get the trigrams of a text padded with spaces, so word starts and ends
+    form trigrams of their own.
+
+    Args:
+        text: Normalized text
+
+    Returns:
+        Set of trigrams
+    """
+    padded = f' {text} '
+    return {padded[start:start + 3] for start in range(len(padded) - 2)}
+
+
+class PatientSearchIndex:
+    """
+    N-gram postings over patient ID numbers, names and rooms, plus stage postings.
+    """
+
+    def __init__(self, patients: Iterable[Dict[str, Any]] = ()):
+        """
+        Build the index.
+
+        Args:
+            patients: Patient dictionaries
+        """
+        self.postings: Dict[str, Set[str]] = {}
+        self.stages: Dict[str, Set[str]] = {}
+        self.fields: Dict[str, Tuple[str, ...]] = {}
+        self.grams: Dict[str, Set[str]] = {}
+        self.patient_stage: Dict[str, Optional[str]] = {}
+
+        for patient in patients:
+            self.update(patient)
+
+    def __len__(self) -> int:
+        return len(self.fields)
+
+    def update(self, patient: Dict[str, Any]) -> None:
+        """
+        Add a patient or re-index a changed one.
+
+        Args:
+            patient: Patient dictionary
+        """
+        self.remove(patient['id'])
+
+        patient_id = patient['id']
+        fields = (
+            normalize(patient.get('patient_id_number')),
+            normalize(patient.get('name')),
+            normalize(patient.get('room')),
+        )
+        grams = set()
+        for field in fields:
+            grams |= substrings(field)
+            grams |= boundary_trigrams(field)
+
+        for gram in grams:
+            self.postings.setdefault(gram, set()).add(patient_id)
+        self.fields[patient_id] = fields
+        self.grams[patient_id] = grams
+
+        stage = patient.get('stage')
+        self.stages.setdefault(stage, set()).add(patient_id)
+        self.patient_stage[patient_id] = stage
+
+    def remove(self, patient_id: str) -> None:
+        """
+        Drop a patient from the index if present.
+
+        Args:
+            patient_id: Internal patient ID
+        """
+        grams = self.grams.pop(patient_id, None)
+        if grams is None:
+            return
+
+        for gram in grams:
+            posting = self.postings[gram]
+            posting.discard(patient_id)
+            if not posting:
+                del self.postings[gram]
+        del self.fields[patient_id]
+
+        stage = self.patient_stage.pop(patient_id)
+        self.stages[stage].discard(patient_id)
+
+    def _match_rank(self, patient_id: str, query: str) -> Optional[int]:
+        """Rank how a patient's fields contain the query, or None if none do."""
+        best = None
+        for field in self.fields[patient_id]:
+            position = field.find(query)
+            if position < 0:
+                continue
+            if field == query:
+                rank = EXACT_FIELD
+            elif position == 0:
+                rank = FIELD_PREFIX
+            elif f' {query}' in field:
+                rank = WORD_PREFIX
+            else:
+                rank = SUBSTRING
+            if best is None or rank < best:
+                best = rank
+        return best
+
+    def _exact_candidates(self, query: str) -> Set[str]:
+        """Patients whose postings contain every trigram of the query."""
+        if len(query) <= 3:
+            return set(self.postings.get(query, ()))
+
+        trigrams = sorted(
+            (query[start:start + 3] for start in range(len(query) - 2)),
+            key=lambda gram: len(self.postings.get(gram, ()))
+        )
+        candidates = set(self.postings.get(trigrams[0], ()))
+        for gram in trigrams[1:]:
+            if not candidates:
+                break
+            candidates &= self.postings.get(gram, set())
+        return candidates
+
+    def _fuzzy_scores(self, query: str) -> Counter:
+        """Count shared word-boundary trigrams per patient."""
+        scores = Counter()
+        for gram in boundary_trigrams(query):
+            scores.update(self.postings.get(gram, ()))
+        return scores
+
+    def search(
+        self,
+        query: str,
+        stage: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> List[str]:
+        """
+        Find patients matching a query, best matches first.
+
+        Exact substring matches come first (whole field, then field prefix,
+        then word prefix, then anywhere). If there are fewer than
+        FUZZY_BELOW_MATCHES of them, close misspellings follow, ordered by
+        trigram similarity. An empty query matches every patient, in
+        the order they were indexed.
+
+        Args:
+            query: Search text
+            stage: Dementia stage to restrict to, or None for all stages
+            limit: Maximum number of results
+
+        Returns:
+            Internal patient IDs in rank order
+        """
+        query = normalize(query)
+        allowed = self.stages.get(stage, set()) if stage is not None else None
+
+        if not query:
+            results = [
+                patient_id for patient_id in self.fields
+                if allowed is None or patient_id in allowed
+            ]
+            return results[:limit] if limit is not None else results
+
+        ranked = []
+        candidates = self._exact_candidates(query)
+        if allowed is not None:
+            candidates &= allowed
+        for patient_id in candidates:
+            rank = self._match_rank(patient_id, query)
+            if rank is not None:
+                ranked.append((rank, 0.0, self.fields[patient_id][1], patient_id))
+
+        if len(query) >= MIN_FUZZY_LENGTH and len(ranked) < FUZZY_BELOW_MATCHES:
+            query_grams = len(boundary_trigrams(query))
+            for patient_id, shared in self._fuzzy_scores(query).items():
+                if patient_id in candidates:
+                    continue
+                if allowed is not None and patient_id not in allowed:
+                    continue
+                similarity = shared / query_grams
+                if shared >= 2 and similarity >= MIN_FUZZY_SIMILARITY:
+                    ranked.append(
+                        (FUZZY, -similarity, self.fields[patient_id][1], patient_id)
+                    )
+
+        ranked.sort()
+        results = [patient_id for _, _, _, patient_id in ranked]
+        return results[:limit] if limit is not None else results
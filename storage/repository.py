@@ -0,0 +1,1463 @@
+import json
+import os
+import sqlite3
+import threading
+import uuid
+from datetime import date, datetime
+from typing import Dict, List, Any, BinaryIO, Optional, Tuple
+
+import streamlit as st
+
+from models.status_scales import encode_status, is_encoded
+from models.vitals import structure_vitals
+from storage.alert_schedule import MedicationAlertSchedule
+from storage.blob_store import BlobStore, BlobTooLargeError
+from storage.dashboard_counters import DashboardCounters, compare_counters
+from storage.journal import (
+    LOG_CREATED,
+    MEDICATION_GIVEN,
+    TASK_UPDATED,
+    open_journal,
+)
+from storage.log_archive import MonthlyLogArchive, group_by_partition
+from storage.log_index import LogDateIndex, log_sort_key, page_newest_first
+from storage.log_search import (
+    LOG_TEXT_UPSERT,
+    SEARCH_QUERY,
+    SEARCH_SCHEMA,
+    build_match_query,
+    has_text,
+    search_hit,
+    text_row,
+)
+from storage.media_ingest import (
+    MAX_FILE_BYTES,
+    PATIENT_QUOTA_BYTES,
+    MediaIngestError,
+    check_media_type,
+    format_megabytes,
+    sniff_mime,
+)
+from storage.patient_order import PatientSortIndex
+from storage.patient_search import PatientSearchIndex
+from storage.thumbnails import ThumbnailGenerator
+from storage.status_series import StatusSeries
+from storage.vitals_anomalies import detect_anomalies
+from storage.vitals_series import VitalsSeries
+"""
+Care Repository Module
+SQLite-backed storage for patients, daily logs, medications, tasks and memory book media.
+
+Every record is stored as a JSON document alongside the columns that pages filter
+and sort on (patient id, date, timestamp, time), so reads are indexed queries
+instead of scans over Python lists held in session state.
+"""
+
+DATA_DIR = os.environ.get(
+    'CARE_DATA_DIR',
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
+)
+DATABASE_PATH = os.path.join(DATA_DIR, 'care.db')
+BLOB_DIR = os.path.join(DATA_DIR, 'media')
+JOURNAL_PATH = os.path.join(DATA_DIR, 'journal.log')
+ARCHIVE_DIR = os.path.join(DATA_DIR, 'archive')
+LOG_PAGE_SIZE = 20
+
+LOG_UPSERT = (
+    "INSERT OR REPLACE INTO daily_logs "
+    "(id, patient_id, date, timestamp, data) VALUES (?, ?, ?, ?, ?)"
+)
+TASK_UPSERT = (
+    "INSERT OR REPLACE INTO tasks "
+    "(id, patient_id, completed, created_date, data) VALUES (?, ?, ?, ?, ?)"
+)
+
+
+class CareRepository:
+    """
+    Repository over a local SQLite database in WAL mode.
+    All pages read and write care records through this class; one instance is
+    shared by every session and guarded by a re-entrant lock.
+    """
+
+    SNAPSHOT_EVERY = 1000
+    ARCHIVE_AFTER_MONTHS = 6
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS meta (
+            key TEXT PRIMARY KEY,
+            value INTEGER NOT NULL
+        );
+        INSERT OR IGNORE INTO meta (key, value) VALUES ('journal_seq', 0);
+        INSERT OR IGNORE INTO meta (key, value) VALUES ('archived_before', 0);
+        INSERT OR IGNORE INTO meta (key, value) VALUES ('blood_pressure_structured', 0);
+        INSERT OR IGNORE INTO meta (key, value) VALUES ('status_encoded', 0);
+
+        CREATE TABLE IF NOT EXISTS patients (
+            id TEXT PRIMARY KEY,
+            patient_id_number TEXT NOT NULL UNIQUE,
+            created_date TEXT,
+            data TEXT NOT NULL
+        );
+
+        CREATE TABLE IF NOT EXISTS daily_logs (
+            id TEXT PRIMARY KEY,
+            patient_id TEXT NOT NULL,
+            date TEXT NOT NULL,
+            timestamp TEXT NOT NULL,
+            data TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_logs_patient_date
+            ON daily_logs (patient_id, date, timestamp);
+        CREATE INDEX IF NOT EXISTS idx_logs_patient_timestamp
+            ON daily_logs (patient_id, timestamp);
+        CREATE INDEX IF NOT EXISTS idx_logs_date ON daily_logs (date);
+
+        CREATE TABLE IF NOT EXISTS medications (
+            id TEXT PRIMARY KEY,
+            patient_id TEXT NOT NULL,
+            time TEXT NOT NULL,
+            active INTEGER NOT NULL,
+            data TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_medications_patient_time
+            ON medications (patient_id, time);
+
+        CREATE TABLE IF NOT EXISTS tasks (
+            id TEXT PRIMARY KEY,
+            patient_id TEXT NOT NULL,
+            completed INTEGER NOT NULL,
+            created_date TEXT,
+            data TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_tasks_patient ON tasks (patient_id, completed);
+        CREATE INDEX IF NOT EXISTS idx_tasks_completed ON tasks (completed);
+
+        CREATE TABLE IF NOT EXISTS memory_book (
+            id TEXT PRIMARY KEY,
+            patient_id TEXT NOT NULL,
+            uploaded_on TEXT NOT NULL,
+            blob_hash TEXT NOT NULL,
+            data TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_memory_book_patient
+            ON memory_book (patient_id, uploaded_on);
+        CREATE INDEX IF NOT EXISTS idx_memory_book_blob ON memory_book (blob_hash);
+    """
+
+    def __init__(
+        self,
+        db_path: str = DATABASE_PATH,
+        blob_dir: str = BLOB_DIR,
+        journal_path: str = JOURNAL_PATH,
+        archive_dir: str = ARCHIVE_DIR
+    ):
+        """
+        Open (and create if needed) the SQLite database, media blob store,
+        mutation journal and log archive, replay any journal events the database
+        is missing, then move logs older than the hot window into the archive.
+
+        Args:
+            db_path: Path of the database file
+            blob_dir: Directory holding memory book media files
+            journal_path: Path of the mutation journal
+            archive_dir: Directory holding monthly Parquet log partitions
+        """
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.db_path = db_path
+        self.lock = threading.RLock()
+        self.media_lock = threading.Lock()
+        self.connection = sqlite3.connect(db_path, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(self.SCHEMA)
+        self.connection.executescript(SEARCH_SCHEMA)
+        self.blobs = BlobStore(blob_dir)
+        self.thumbnails = ThumbnailGenerator(self.blobs)
+        self.journal = open_journal(journal_path)
+        self.events_since_snapshot = 0
+        self.archive = MonthlyLogArchive(archive_dir)
+        self.log_index: Optional[LogDateIndex] = None
+        self.alert_schedule: Optional[MedicationAlertSchedule] = None
+        self.dashboard_counters: Optional[DashboardCounters] = None
+        self.patient_index: Optional[PatientSearchIndex] = None
+        self.patient_order: Optional[PatientSortIndex] = None
+        self.vitals_series: Dict[str, VitalsSeries] = {}
+        self.vitals_anomalies: Optional[List[Dict[str, Any]]] = None
+        self.status_series: Dict[str, StatusSeries] = {}
+        self.data_version = None
+        self.replay_journal()
+        self.fill_log_text()
+        self.structure_blood_pressure()
+        self.encode_status_scales()
+        self.archive_old_logs()
+
+    def close(self) -> None:
+        """Flush the journal, stop thumbnail workers and close the database connection."""
+        with self.lock:
+            self.journal.sync()
+            self.thumbnails.close()
+            self.connection.close()
+
+    # Journal
+
+    def _applied_seq(self) -> int:
+        """Get the highest journal sequence applied to the database."""
+        return self._fetch_scalar("SELECT value FROM meta WHERE key = 'journal_seq'")
+
+    @staticmethod
+    def _log_row(patient_id: str, log: Dict[str, Any]) -> tuple:
+        """Build the daily_logs row for a log entry."""
+        return (
+            log['id'],
+            patient_id,
+            log['date'],
+            log.get('timestamp', ''),
+            json.dumps(log)
+        )
+
+    @staticmethod
+    def _task_row(patient_id: str, task: Dict[str, Any]) -> tuple:
+        """Build the tasks row for a task."""
+        return (
+            task['id'],
+            patient_id,
+            int(task.get('completed', False)),
+            task.get('created_date'),
+            json.dumps(task)
+        )
+
+    def _apply_event(self, event_type: str, payload: Dict[str, Any], seq: int) -> None:
+        """
+        Apply a journal event to the database. Caller must hold an open transaction.
+        Events carry full documents, so applying one twice is harmless.
+        """
+        patient_id = payload['patient_id']
+
+        if event_type in (LOG_CREATED, MEDICATION_GIVEN):
+            self.connection.execute(LOG_UPSERT, self._log_row(patient_id, payload['log']))
+            self._write_log_text(patient_id, payload['log'])
+        elif event_type == TASK_UPDATED:
+            self.connection.executemany(
+                TASK_UPSERT,
+                [self._task_row(patient_id, task) for task in payload['tasks']]
+            )
+
+        self.connection.execute(
+            "UPDATE meta SET value = MAX(value, ?) WHERE key = 'journal_seq'",
+            (seq,)
+        )
+
+    def _write_log_text(self, patient_id: str, log: Dict[str, Any]) -> None:
+        """Update a log's row in the full-text index. Caller must hold an open transaction."""
+        if has_text(log):
+            self.connection.execute(LOG_TEXT_UPSERT, text_row(patient_id, log))
+        else:
+            self.connection.execute("DELETE FROM log_text WHERE log_id = ?", (log['id'],))
+
+    def _journaled_write(self, event_type: str, payload: Dict[str, Any]) -> None:
+        """
+        Append an event to the journal, then apply it to the database.
+
+        Args:
+            event_type: Journal event type
+            payload: Event data, including 'patient_id'
+        """
+        with self.lock:
+            log_index = None
+            if event_type in (LOG_CREATED, MEDICATION_GIVEN):
+                counters = self._current_dashboard_counters()
+                log_index = self._current_log_index()
+                previous = log_index.patient(payload['patient_id']).by_id.get(
+                    payload['log']['id']
+                )
+                previous_date = previous.date if previous is not None else None
+
+            seq = self.journal.append(event_type, payload)
+            with self.connection:
+                self._apply_event(event_type, payload, seq)
+
+            if log_index is not None:
+                log_index.upsert(payload['patient_id'], payload['log'])
+                self.vitals_series.pop(payload['patient_id'], None)
+                self.vitals_anomalies = None
+                self.status_series.pop(payload['patient_id'], None)
+                counters.log_saved(previous_date, payload['log']['date'])
+
+            self.events_since_snapshot += 1
+            if self.events_since_snapshot >= self.SNAPSHOT_EVERY:
+                self.snapshot()
+
+    def replay_journal(self) -> int:
+        """
+        Re-apply journal events newer than the database's applied sequence.
+        Only the tail written since the last snapshot is read.
+
+        Returns:
+            Number of events replayed
+        """
+        with self.lock:
+            applied_seq = self._applied_seq()
+            self.journal.reserve_seq(applied_seq)
+
+            replayed = 0
+            with self.connection:
+                for event in self.journal.read_events(after_seq=applied_seq):
+                    self._apply_event(event['type'], event['payload'], event['seq'])
+                    replayed += 1
+            return replayed
+
+    def snapshot(self) -> bool:
+        """
+        Checkpoint the database durably and compact the journal to the unapplied tail.
+
+        Returns:
+            True if the checkpoint completed and the journal was compacted
+        """
+        with self.lock:
+            busy, _, _ = self.connection.execute(
+                "PRAGMA wal_checkpoint(TRUNCATE)"
+            ).fetchone()
+            if busy:
+                return False
+
+            self.journal.compact(self._applied_seq())
+            self.events_since_snapshot = 0
+            return True
+
+    # Archive
+
+    def _archived_before(self) -> Optional[str]:
+        """Get the ISO date before which logs have been archived, if any."""
+        ordinal = self._fetch_scalar(
+            "SELECT value FROM meta WHERE key = 'archived_before'"
+        )
+        return date.fromordinal(ordinal).isoformat() if ordinal else None
+
+    def fill_log_text(self) -> int:
+        """
+        Copy the text of logs written before full-text search existed,
+        including archived months, into the search index. Runs once.
+
+        Returns:
+            Number of logs indexed
+        """
+        with self.lock:
+            if self._fetch_scalar("SELECT value FROM meta WHERE key = 'log_text_filled'"):
+                return 0
+
+            logs = [
+                (patient_id, json.loads(data))
+                for patient_id, data in self.connection.execute(
+                    "SELECT patient_id, data FROM daily_logs"
+                )
+            ]
+            if self.archive.available:
+                for (patient_id,) in self.connection.execute("SELECT id FROM patients"):
+                    logs += [
+                        (patient_id, log)
+                        for log in self.archive.read_range(
+                            patient_id, date.min.isoformat(), date.max.isoformat()
+                        )
+                    ]
+
+            rows = [text_row(patient_id, log) for patient_id, log in logs if has_text(log)]
+            with self.connection:
+                self.connection.executemany(LOG_TEXT_UPSERT, rows)
+                self.connection.execute(
+                    "UPDATE meta SET value = 1 WHERE key = 'log_text_filled'"
+                )
+            return len(rows)
+
+    def structure_blood_pressure(self) -> int:
+        """
+        Parse the free-text blood pressure of logs saved before readings were
+        structured into systolic and diastolic numbers, in SQLite and in the
+        archive. Unreadable entries are kept as text with empty numbers. Runs once.
+
+        Returns:
+            Number of logs updated
+        """
+        with self.lock:
+            if self._fetch_scalar(
+                "SELECT value FROM meta WHERE key = 'blood_pressure_structured'"
+            ):
+                return 0
+
+            updates = []
+            for log_id, data in self.connection.execute(
+                "SELECT id, data FROM daily_logs "
+                "WHERE json_extract(data, '$.vitals') IS NOT NULL "
+                "AND json_type(data, '$.vitals.systolic') IS NULL"
+            ):
+                log = json.loads(data)
+                log['vitals'] = structure_vitals(log['vitals'], strict=False)
+                updates.append((json.dumps(log), log_id))
+
+            archived = 0
+            if self.archive.available:
+                for (patient_id,) in self.connection.execute("SELECT id FROM patients").fetchall():
+                    logs = [
+                        log for log in self.archive.read_range(
+                            patient_id, date.min.isoformat(), date.max.isoformat()
+                        )
+                        if log.get('vitals', {}).get('blood_pressure')
+                        and log['vitals'].get('systolic') is None
+                    ]
+                    for log in logs:
+                        log['vitals'] = structure_vitals(log['vitals'], strict=False)
+                    partitions = group_by_partition((patient_id, log) for log in logs)
+                    for (_, year_month), month_logs in partitions.items():
+                        self.archive.write_month(patient_id, year_month, month_logs)
+                    archived += len(logs)
+
+            with self.connection:
+                self.connection.executemany(
+                    "UPDATE daily_logs SET data = ? WHERE id = ?",
+                    updates
+                )
+                self.connection.execute(
+                    "UPDATE meta SET value = 1 WHERE key = 'blood_pressure_structured'"
+                )
+            self.log_index = None
+            self.vitals_series = {}
+            self.vitals_anomalies = None
+            return len(updates) + archived
+
+    def encode_status_scales(self) -> int:
+        """
+        Replace the status labels and meal amounts of logs saved before they
+        were encoded as scale positions. Archived rows keep their labels on
+        disk and are encoded when read, so only SQLite documents are rewritten.
+        Runs once.
+
+        Returns:
+            Number of logs updated
+        """
+        with self.lock:
+            if self._fetch_scalar(
+                "SELECT value FROM meta WHERE key = 'status_encoded'"
+            ):
+                return 0
+
+            updates = []
+            for log_id, data in self.connection.execute(
+                "SELECT id, data FROM daily_logs "
+                "WHERE json_extract(data, '$.activities') IS NOT NULL "
+                "OR json_extract(data, '$.meals') IS NOT NULL"
+            ):
+                log = json.loads(data)
+                if not is_encoded(log):
+                    updates.append((json.dumps(encode_status(log)), log_id))
+
+            with self.connection:
+                self.connection.executemany(
+                    "UPDATE daily_logs SET data = ? WHERE id = ?",
+                    updates
+                )
+                self.connection.execute(
+                    "UPDATE meta SET value = 1 WHERE key = 'status_encoded'"
+                )
+            self.log_index = None
+            self.status_series = {}
+            return len(updates)
+
+    def archive_old_logs(self, months_to_keep: Optional[int] = None) -> int:
+        """
+        Move logs from whole months older than the hot window into the archive.
+
+        Args:
+            months_to_keep: Number of recent months kept in SQLite
+
+        Returns:
+            Number of logs archived
+        """
+        if not self.archive.available:
+            return 0
+
+        if months_to_keep is None:
+            months_to_keep = self.ARCHIVE_AFTER_MONTHS
+
+        today = date.today()
+        month_index = today.year * 12 + today.month - 1 - months_to_keep
+        cutoff = date(month_index // 12, month_index % 12 + 1, 1)
+
+        with self.lock:
+            rows = self.connection.execute(
+                "SELECT patient_id, data FROM daily_logs WHERE date < ?",
+                (cutoff.isoformat(),)
+            ).fetchall()
+            if not rows:
+                return 0
+
+            self.snapshot()
+            partitions = group_by_partition(
+                (patient_id, json.loads(data)) for patient_id, data in rows
+            )
+            for (patient_id, year_month), logs in partitions.items():
+                self.archive.write_month(patient_id, year_month, logs)
+
+            with self.connection:
+                self.connection.execute(
+                    "DELETE FROM daily_logs WHERE date < ?",
+                    (cutoff.isoformat(),)
+                )
+                self.connection.execute(
+                    "UPDATE meta SET value = MAX(value, ?) WHERE key = 'archived_before'",
+                    (cutoff.toordinal(),)
+                )
+            self.log_index = None
+
+        return len(rows)
+
+    # Log index
+
+    def _load_patient_logs(self, patient_id: str) -> List[Dict[str, Any]]:
+        """Load a patient's hot logs in (date, timestamp) order for the log index."""
+        return self._fetch_documents(
+            "SELECT data FROM daily_logs WHERE patient_id = ? ORDER BY date, timestamp",
+            (patient_id,)
+        )
+
+    def _check_data_version(self) -> None:
+        """
+        Drop in-memory indexes if another connection has committed to the
+        database since they were built. Caller must hold the lock.
+        """
+        data_version = self._fetch_scalar("PRAGMA data_version")
+        if data_version != self.data_version:
+            self.log_index = None
+            self.alert_schedule = None
+            self.dashboard_counters = None
+            self.patient_index = None
+            self.patient_order = None
+            self.vitals_series = {}
+            self.vitals_anomalies = None
+            self.status_series = {}
+            self.data_version = data_version
+
+    def _current_log_index(self) -> LogDateIndex:
+        """
+        Get the in-memory log index, building it if needed.
+
+        Returns:
+            LogDateIndex over the logs held in SQLite
+        """
+        with self.lock:
+            self._check_data_version()
+            if self.log_index is None:
+                rows = self.connection.execute(
+                    "SELECT date, COUNT(*) FROM daily_logs GROUP BY date"
+                ).fetchall()
+                self.log_index = LogDateIndex(self._load_patient_logs, dict(rows))
+            return self.log_index
+
+    def _current_alert_schedule(self) -> MedicationAlertSchedule:
+        """
+        Get the medication schedule, building it from stored medications if needed.
+
+        Returns:
+            MedicationAlertSchedule over all medications
+        """
+        with self.lock:
+            self._check_data_version()
+            if self.alert_schedule is None:
+                rows = self.connection.execute(
+                    "SELECT patient_id, data FROM medications"
+                ).fetchall()
+                self.alert_schedule = MedicationAlertSchedule(
+                    (patient_id, json.loads(data)) for patient_id, data in rows
+                )
+            return self.alert_schedule
+
+    def _current_patient_index(self) -> PatientSearchIndex:
+        """
+        Get the patient search index, building it from stored patients if needed.
+
+        Returns:
+            PatientSearchIndex over all patients
+        """
+        with self.lock:
+            self._check_data_version()
+            if self.patient_index is None:
+                self.patient_index = PatientSearchIndex(
+                    self._fetch_documents("SELECT data FROM patients ORDER BY rowid")
+                )
+            return self.patient_index
+
+    def _current_patient_order(self) -> PatientSortIndex:
+        """
+        Get the patient sort orders, building them from stored patients if needed.
+
+        Returns:
+            PatientSortIndex over all patients
+        """
+        with self.lock:
+            self._check_data_version()
+            if self.patient_order is None:
+                self.patient_order = PatientSortIndex(
+                    self._fetch_documents("SELECT data FROM patients")
+                )
+            return self.patient_order
+
+    def _count_dashboard_totals(self) -> DashboardCounters:
+        """Count every dashboard total from scratch. Caller must hold the lock."""
+        today = date.today().isoformat()
+        return DashboardCounters(
+            patients=self._fetch_scalar("SELECT COUNT(*) FROM patients"),
+            pending_tasks=self._fetch_scalar(
+                "SELECT COUNT(*) FROM tasks WHERE completed = 0"
+            ),
+            active_medications=self._fetch_scalar(
+                "SELECT COUNT(*) FROM medications WHERE active = 1"
+            ),
+            day=today,
+            logs_today=self._fetch_scalar(
+                "SELECT COUNT(*) FROM daily_logs WHERE date = ?",
+                (today,)
+            )
+        )
+
+    def _current_dashboard_counters(self) -> DashboardCounters:
+        """
+        Get the dashboard counters, counting from scratch if needed and
+        starting a new day's logs-today count after midnight.
+
+        Returns:
+            DashboardCounters kept up to date by the write methods
+        """
+        with self.lock:
+            self._check_data_version()
+            if self.dashboard_counters is None:
+                self.dashboard_counters = self._count_dashboard_totals()
+
+            today = date.today().isoformat()
+            if self.dashboard_counters.needs_rollover(today):
+                self.dashboard_counters.rollover(
+                    today,
+                    self._current_log_index().count_on(today)
+                )
+            return self.dashboard_counters
+
+    # Internal helpers
+
+    def _write(self, sql: str, params: tuple) -> None:
+        """Run a single write statement inside a transaction."""
+        with self.lock, self.connection:
+            self.connection.execute(sql, params)
+
+    def _fetch_documents(self, sql: str, params: tuple = ()) -> List[Dict[str, Any]]:
+        """Run a query whose first column is a JSON document and decode each row."""
+        with self.lock:
+            rows = self.connection.execute(sql, params).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def _fetch_scalar(self, sql: str, params: tuple = ()) -> Any:
+        """Run a query returning a single value."""
+        with self.lock:
+            return self.connection.execute(sql, params).fetchone()[0]
+
+    @staticmethod
+    def _group_by_patient(rows: List[tuple]) -> Dict[str, List[Dict[str, Any]]]:
+        """Group (patient_id, data) rows into a dictionary of decoded lists."""
+        grouped = {}
+        for patient_id, data in rows:
+            grouped.setdefault(patient_id, []).append(json.loads(data))
+        return grouped
+
+    # Patients
+
+    def save_patient(self, patient: Dict[str, Any]) -> None:
+        """
+        Insert or replace a patient record.
+
+        Args:
+            patient: Complete patient record
+        """
+        with self.lock:
+            counters = self._current_dashboard_counters()
+            is_new = not self._fetch_scalar(
+                "SELECT EXISTS(SELECT 1 FROM patients WHERE id = ?)",
+                (patient['id'],)
+            )
+            self._write(
+                "INSERT OR REPLACE INTO patients "
+                "(id, patient_id_number, created_date, data) VALUES (?, ?, ?, ?)",
+                (
+                    patient['id'],
+                    patient['patient_id_number'],
+                    patient.get('created_date'),
+                    json.dumps(patient)
+                )
+            )
+            if is_new:
+                counters.patient_added()
+            self._current_patient_index().update(patient)
+            self._current_patient_order().update(patient)
+
+    def get_patient(self, patient_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a single patient by internal ID.
+
+        Args:
+            patient_id: Internal patient ID
+
+        Returns:
+            Patient record or None if not found
+        """
+        rows = self._fetch_documents(
+            "SELECT data FROM patients WHERE id = ?",
+            (patient_id,)
+        )
+        return rows[0] if rows else None
+
+    def list_patients(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get all patients in registration order.
+
+        Returns:
+            Dictionary mapping patient ID to patient record
+        """
+        patients = self._fetch_documents("SELECT data FROM patients ORDER BY rowid")
+        return {patient['id']: patient for patient in patients}
+
+    def patient_id_number_exists(self, patient_id_number: str) -> bool:
+        """
+        Check if a patient ID number is already registered.
+
+        Args:
+            patient_id_number: Patient ID number entered by the carer
+
+        Returns:
+            True if the ID number exists
+        """
+        return bool(self._fetch_scalar(
+            "SELECT EXISTS(SELECT 1 FROM patients WHERE patient_id_number = ?)",
+            (patient_id_number,)
+        ))
+
+    def search_patients(
+        self,
+        query: str,
+        stage: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> List[str]:
+        """
+        Search patients by ID number, name or room, tolerating small typos.
+
+        Args:
+            query: Search text, empty for all patients
+            stage: Dementia stage to restrict to, or None for all stages
+            limit: Maximum number of results
+
+        Returns:
+            Internal patient IDs, best matches first
+        """
+        with self.lock:
+            return self._current_patient_index().search(query, stage, limit)
+
+    def sort_patients(
+        self,
+        field: str,
+        patient_ids: Optional[List[str]] = None,
+        reverse: bool = False
+    ) -> List[str]:
+        """
+        Order patients by a field using the maintained sort orders.
+
+        Args:
+            field: 'patient_id_number', 'name', 'age', 'room' or 'created_date'
+            patient_ids: IDs to keep, or None for every patient
+            reverse: True for descending order
+
+        Returns:
+            Internal patient IDs in sorted order
+        """
+        with self.lock:
+            return self._current_patient_order().ordered(field, patient_ids, reverse)
+
+    # Daily logs
+
+    def save_log(self, patient_id: str, log: Dict[str, Any]) -> None:
+        """
+        Record a new daily log entry through the journal.
+
+        Args:
+            patient_id: ID of the patient
+            log: Log entry dictionary
+
+        Raises:
+            ValueError: If the log's blood pressure is not a valid reading
+        """
+        if log.get('vitals') and 'systolic' not in log['vitals']:
+            log = {**log, 'vitals': structure_vitals(log['vitals'])}
+        if not is_encoded(log):
+            log = encode_status(log)
+        self._journaled_write(LOG_CREATED, {'patient_id': patient_id, 'log': log})
+
+    def add_administration(
+        self,
+        patient_id: str,
+        log: Dict[str, Any],
+        administration: Dict[str, Any]
+    ) -> None:
+        """
+        Attach a medication administration to a day's log through the journal.
+
+        Args:
+            patient_id: ID of the patient
+            log: Log entry the administration belongs to
+            administration: Administration record
+        """
+        log.setdefault('medications_given', []).append(administration)
+        self._journaled_write(
+            MEDICATION_GIVEN,
+            {'patient_id': patient_id, 'log': log, 'administration': administration}
+        )
+
+    def record_administration(
+        self,
+        patient_id: str,
+        log_date: str,
+        administration: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        Attach a medication administration to the patient's day record,
+        creating a medication-only record if no log exists for the date yet.
+        Lookup and creation happen under one lock, so concurrent presses
+        always share a single day record.
+
+        Args:
+            patient_id: ID of the patient
+            log_date: Date in ISO format
+            administration: Administration record
+
+        Returns:
+            The day record the administration was attached to
+        """
+        with self.lock:
+            log_index = self._current_log_index()
+            day_record = log_index.day_record(patient_id, log_date)
+
+            if day_record is None:
+                day_record = {
+                    'id': str(uuid.uuid4()),
+                    'date': log_date,
+                    'timestamp': datetime.now().isoformat(),
+                    'medications_given': []
+                }
+
+            self.add_administration(patient_id, day_record, administration)
+            log_index.set_day_record(patient_id, day_record)
+            return day_record
+
+    def get_logs_in_range(
+        self,
+        patient_id: str,
+        start_date: str,
+        end_date: str,
+        newest_first: bool = False
+    ) -> List[Dict[str, Any]]:
+        """
+        Get a patient's logs between two ISO dates (inclusive).
+        Archived months overlapping the range are read from the log archive.
+
+        Args:
+            patient_id: ID of the patient
+            start_date: First date in ISO format
+            end_date: Last date in ISO format
+            newest_first: Return the most recent logs first
+
+        Returns:
+            List of log dictionaries ordered by date and timestamp
+        """
+        with self.lock:
+            logs = self._current_log_index().patient(patient_id).range(
+                start_date,
+                end_date
+            )
+        if newest_first:
+            logs.reverse()
+
+        archived_before = self._archived_before()
+        if archived_before and start_date < archived_before:
+            archived = self.archive.read_range(patient_id, start_date, end_date)
+            if archived:
+                hot_ids = {log['id'] for log in logs}
+                logs += [log for log in archived if log['id'] not in hot_ids]
+                logs.sort(key=log_sort_key, reverse=newest_first)
+
+        return logs
+
+    def get_logs_page(
+        self,
+        patient_id: str,
+        start_date: str,
+        end_date: str,
+        before: Optional[Tuple[str, str, str]] = None,
+        limit: int = LOG_PAGE_SIZE
+    ) -> Tuple[List[Dict[str, Any]], Optional[Tuple[str, str, str]]]:
+        """
+        Get one page of a patient's logs between two ISO dates, newest first.
+        Pass the returned cursor as before to get the next older page.
+
+        Args:
+            patient_id: ID of the patient
+            start_date: First date in ISO format
+            end_date: Last date in ISO format
+            before: Cursor returned with the previous page, or None
+            limit: Page size
+
+        Returns:
+            Tuple of (logs on the page, cursor for the next page or None)
+        """
+        archived_before = self._archived_before()
+        if archived_before and start_date < archived_before:
+            logs = self.get_logs_in_range(patient_id, start_date, end_date)
+            keys = [log_sort_key(log) for log in logs]
+            return page_newest_first(keys, logs, start_date, end_date, before, limit)
+
+        with self.lock:
+            return self._current_log_index().patient(patient_id).page(
+                start_date,
+                end_date,
+                before,
+                limit
+            )
+
+    def count_logs_in_range(self, patient_id: str, start_date: str, end_date: str) -> int:
+        """
+        Count a patient's logs between two ISO dates (inclusive).
+
+        Args:
+            patient_id: ID of the patient
+            start_date: First date in ISO format
+            end_date: Last date in ISO format
+
+        Returns:
+            Number of logs
+        """
+        archived_before = self._archived_before()
+        if archived_before and start_date < archived_before:
+            return len(self.get_logs_in_range(patient_id, start_date, end_date))
+
+        with self.lock:
+            return self._current_log_index().patient(patient_id).count_range(
+                start_date,
+                end_date
+            )
+
+    def get_vitals_series(self, patient_id: str) -> VitalsSeries:
+        """
+        Get a patient's vital signs as arrays, covering archived months too.
+        The series is cached until the patient's logs change.
+
+        Args:
+            patient_id: ID of the patient
+
+        Returns:
+            VitalsSeries in date order
+        """
+        with self.lock:
+            self._check_data_version()
+            series = self.vitals_series.get(patient_id)
+            if series is None:
+                series = VitalsSeries.from_logs(
+                    self.get_logs_in_range(
+                        patient_id,
+                        date.min.isoformat(),
+                        date.max.isoformat()
+                    )
+                )
+                self.vitals_series[patient_id] = series
+            return series
+
+    def get_status_series(self, patient_id: str) -> StatusSeries:
+        """
+        Get a patient's daily status and meal amounts as int8 arrays, covering
+        archived months too. The series is cached until the patient's logs change.
+
+        Args:
+            patient_id: ID of the patient
+
+        Returns:
+            StatusSeries in date order
+        """
+        with self.lock:
+            self._check_data_version()
+            series = self.status_series.get(patient_id)
+            if series is None:
+                series = StatusSeries.from_logs(
+                    self.get_logs_in_range(
+                        patient_id,
+                        date.min.isoformat(),
+                        date.max.isoformat()
+                    )
+                )
+                self.status_series[patient_id] = series
+            return series
+
+    def get_vitals_anomalies(self) -> List[Dict[str, Any]]:
+        """
+        Get recent vital signs outside each patient's own normal band.
+        The facility-wide check reruns after any log is saved.
+
+        Returns:
+            List of flag dictionaries ordered by patient and date
+        """
+        with self.lock:
+            self._check_data_version()
+            if self.vitals_anomalies is None:
+                patient_ids = [
+                    patient_id for (patient_id,) in
+                    self.connection.execute("SELECT id FROM patients ORDER BY rowid")
+                ]
+                self.vitals_anomalies = detect_anomalies({
+                    patient_id: self.get_vitals_series(patient_id)
+                    for patient_id in patient_ids
+                })
+            return self.vitals_anomalies
+
+    def search_logs(
+        self,
+        text: str,
+        start_date: str,
+        end_date: str,
+        patient_id: Optional[str] = None,
+        limit: int = 50
+    ) -> List[Dict[str, Any]]:
+        """
+        Search log notes, incidents and behavioural changes, best matches first.
+        Archived logs are included.
+
+        Args:
+            text: Search text; words must all appear, quoted text as a phrase
+            start_date: First date in ISO format
+            end_date: Last date in ISO format
+            patient_id: Patient to restrict to, or None for all patients
+            limit: Maximum number of hits
+
+        Returns:
+            List of hit dictionaries with 'log_id', 'patient_id', 'date'
+            and 'snippets' (field name -> highlighted snippet)
+        """
+        match = build_match_query(text)
+        if not match:
+            return []
+
+        params = [match, start_date, end_date]
+        patient_filter = ''
+        if patient_id is not None:
+            patient_filter = 'AND log_text.patient_id = ?'
+            params.append(patient_id)
+        params.append(limit)
+
+        with self.lock:
+            rows = self.connection.execute(
+                SEARCH_QUERY.format(patient_filter=patient_filter),
+                params
+            ).fetchall()
+        return [search_hit(row) for row in rows]
+
+    def get_recent_logs(self, patient_id: str, limit: int) -> List[Dict[str, Any]]:
+        """
+        Get a patient's most recent logs by date and timestamp.
+
+        Args:
+            patient_id: ID of the patient
+            limit: Maximum number of logs to return
+
+        Returns:
+            List of log dictionaries, newest first
+        """
+        with self.lock:
+            logs = self._current_log_index().patient(patient_id).tail(limit)
+
+        if len(logs) < limit and self._archived_before():
+            logs += self.archive.read_latest(patient_id, limit - len(logs))
+
+        return logs
+
+    def has_logs(self, patient_id: str) -> bool:
+        """Check if any log exists for a patient, including archived months."""
+        with self.lock:
+            if self._current_log_index().patient(patient_id).logs:
+                return True
+        return bool(self.archive.archived_months(patient_id))
+
+    # Medications
+
+    def save_medication(self, patient_id: str, medication: Dict[str, Any]) -> None:
+        """
+        Insert or replace a medication and update the alert schedule.
+        Saving with 'active' set to False discontinues it.
+
+        Args:
+            patient_id: ID of the patient
+            medication: Medication dictionary
+        """
+        with self.lock:
+            counters = self._current_dashboard_counters()
+            alert_schedule = self._current_alert_schedule()
+            was_active = self._fetch_scalar(
+                "SELECT EXISTS(SELECT 1 FROM medications WHERE id = ? AND active = 1)",
+                (medication['id'],)
+            )
+            self._write(
+                "INSERT OR REPLACE INTO medications "
+                "(id, patient_id, time, active, data) VALUES (?, ?, ?, ?, ?)",
+                (
+                    medication['id'],
+                    patient_id,
+                    medication['time'],
+                    int(medication.get('active', True)),
+                    json.dumps(medication)
+                )
+            )
+            alert_schedule.update(patient_id, medication)
+            counters.medication_saved(
+                bool(was_active),
+                bool(medication.get('active', True))
+            )
+
+    def get_medications(self, patient_id: str) -> List[Dict[str, Any]]:
+        """
+        Get all medications for a patient ordered by first dose time.
+
+        Args:
+            patient_id: ID of the patient
+
+        Returns:
+            List of medication dictionaries
+        """
+        with self.lock:
+            return self._current_alert_schedule().for_patient(patient_id)
+
+    def get_active_medications(self) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Get active medications for all patients ordered by first dose time.
+
+        Returns:
+            Dictionary mapping patient ID to medication list
+        """
+        with self.lock:
+            return self._current_alert_schedule().active_by_patient()
+
+    def get_due_medications(
+        self,
+        current_minute: int,
+        window: int
+    ) -> List[tuple]:
+        """
+        Get doses of active medications due within a window, wrapping past midnight.
+
+        Args:
+            current_minute: Minutes since midnight now
+            window: Look-ahead in minutes
+
+        Returns:
+            List of (minutes_until_due, dose_minute, patient_id, medication) tuples,
+            soonest first
+        """
+        with self.lock:
+            return self._current_alert_schedule().due_within(current_minute, window)
+
+    def has_active_medications(self) -> bool:
+        """Check if any active medication is scheduled."""
+        with self.lock:
+            return len(self._current_alert_schedule()) > 0
+
+    # Tasks
+
+    def save_task(self, patient_id: str, task: Dict[str, Any]) -> None:
+        """
+        Insert or replace a task through the journal.
+
+        Args:
+            patient_id: ID of the patient
+            task: Task dictionary
+        """
+        self.save_tasks(patient_id, [task])
+
+    def save_tasks(self, patient_id: str, tasks: List[Dict[str, Any]]) -> None:
+        """
+        Insert or replace several tasks as one journal event and transaction.
+
+        Args:
+            patient_id: ID of the patient
+            tasks: List of task dictionaries
+        """
+        if not tasks:
+            return
+
+        with self.lock:
+            counters = self._current_dashboard_counters()
+            task_ids = [task['id'] for task in tasks]
+            previous = dict(self.connection.execute(
+                "SELECT id, completed FROM tasks WHERE id IN "
+                f"({', '.join('?' * len(task_ids))})",
+                task_ids
+            ).fetchall())
+            self._journaled_write(TASK_UPDATED, {'patient_id': patient_id, 'tasks': tasks})
+            counters.tasks_saved(
+                {task_id: bool(completed) for task_id, completed in previous.items()},
+                tasks
+            )
+
+    def delete_task(self, task_id: str) -> None:
+        """Delete a task by ID."""
+        with self.lock:
+            counters = self._current_dashboard_counters()
+            row = self.connection.execute(
+                "SELECT completed FROM tasks WHERE id = ?",
+                (task_id,)
+            ).fetchone()
+            self._write("DELETE FROM tasks WHERE id = ?", (task_id,))
+            if row is not None:
+                counters.task_deleted(not row[0])
+
+    def get_tasks(self, patient_id: str) -> List[Dict[str, Any]]:
+        """
+        Get all tasks for a patient in creation order.
+
+        Args:
+            patient_id: ID of the patient
+
+        Returns:
+            List of task dictionaries
+        """
+        return self._fetch_documents(
+            "SELECT data FROM tasks WHERE patient_id = ? ORDER BY rowid",
+            (patient_id,)
+        )
+
+    def get_pending_tasks(self) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Get pending tasks for all patients.
+
+        Returns:
+            Dictionary mapping patient ID to pending task list
+        """
+        with self.lock:
+            rows = self.connection.execute(
+                "SELECT patient_id, data FROM tasks "
+                "WHERE completed = 0 ORDER BY rowid"
+            ).fetchall()
+        return self._group_by_patient(rows)
+
+    # Dashboard
+
+    def get_dashboard_counts(self) -> Dict[str, int]:
+        """
+        Get the maintained dashboard totals without counting rows.
+
+        Returns:
+            Dictionary with 'patients', 'pending_tasks', 'active_medications'
+            and 'logs_today'
+        """
+        with self.lock:
+            return self._current_dashboard_counters().as_dict()
+
+    def check_dashboard_counts(self) -> Dict[str, tuple]:
+        """
+        Recount every dashboard total from scratch, compare with the maintained
+        counters and replace them with the recount.
+
+        Returns:
+            Counter name -> (maintained, recounted) for each mismatch
+        """
+        with self.lock:
+            maintained = self._current_dashboard_counters().as_dict()
+            self.dashboard_counters = self._count_dashboard_totals()
+            return compare_counters(maintained, self.dashboard_counters.as_dict())
+
+    # Memory book
+
+    def media_bytes_used(self, patient_id: str) -> int:
+        """
+        Total size of a patient's memory book items.
+
+        Args:
+            patient_id: ID of the patient
+
+        Returns:
+            Size in bytes
+        """
+        return self._fetch_scalar(
+            "SELECT COALESCE(SUM(json_extract(data, '$.file_size')), 0) "
+            "FROM memory_book WHERE patient_id = ?",
+            (patient_id,)
+        )
+
+    def ingest_media(
+        self,
+        patient_id: str,
+        stream: BinaryIO,
+        media: Dict[str, Any],
+        reported_type: Optional[str] = None,
+        max_file_bytes: int = MAX_FILE_BYTES,
+        patient_quota_bytes: int = PATIENT_QUOTA_BYTES
+    ) -> Dict[str, Any]:
+        """
+        Stream an upload into the blob store and store it as a memory book item,
+        enforcing the per-file and per-patient quotas and checking the sniffed
+        type against the item's media_type. Photos get a thumbnail generated in
+        the background.
+
+        The quota check, blob write and row insert run under the media lock,
+        which delete_media also holds, so concurrent uploads cannot both pass the
+        quota and a delete cannot remove a blob an upload is about to reference.
+        Log and medication writes only wait for the row insert.
+
+        Args:
+            patient_id: ID of the patient the upload belongs to
+            stream: Readable binary stream of the upload
+            media: Media item dictionary without the file fields; its
+                'media_type' ('Photo', 'Video' or 'Audio') is checked
+            reported_type: MIME type reported by the browser, used if sniffing fails
+            max_file_bytes: Largest accepted file
+            patient_quota_bytes: Largest total memory book size for the patient
+
+        Returns:
+            The stored media item with 'blob_hash', 'file_size' and 'file_type'
+
+        Raises:
+            MediaIngestError: If a quota is exceeded or the type does not match
+        """
+        sniffed = {}
+
+        def inspect(head: bytes) -> None:
+            sniffed['mime'] = sniff_mime(head)
+            check_media_type(media['media_type'], sniffed['mime'])
+
+        with self.media_lock:
+            remaining = patient_quota_bytes - self.media_bytes_used(patient_id)
+            limit = min(max_file_bytes, remaining)
+            if limit <= 0:
+                raise MediaIngestError(
+                    f"This memory book is full ({format_megabytes(patient_quota_bytes)})"
+                )
+
+            try:
+                blob_hash, file_size, _ = self.blobs.ingest(stream, limit, inspect)
+            except BlobTooLargeError:
+                if limit == max_file_bytes:
+                    raise MediaIngestError(
+                        f"Files must be smaller than {format_megabytes(max_file_bytes)}"
+                    )
+                raise MediaIngestError(
+                    f"Only {format_megabytes(remaining)} left in this memory book"
+                )
+
+            stored = {
+                **media,
+                'file_type': sniffed['mime'] or reported_type,
+                'file_size': file_size,
+                'blob_hash': blob_hash,
+            }
+            self._write(
+                "INSERT OR REPLACE INTO memory_book "
+                "(id, patient_id, uploaded_on, blob_hash, data) VALUES (?, ?, ?, ?, ?)",
+                (
+                    stored['id'],
+                    patient_id,
+                    stored['uploaded_on'],
+                    blob_hash,
+                    json.dumps(stored)
+                )
+            )
+
+        if stored.get('media_type') == 'Photo':
+            self.thumbnails.submit(blob_hash)
+        return stored
+
+    def delete_media(self, media_id: str) -> None:
+        """
+        Delete a memory book item by ID.
+        The underlying blob is removed once no other item references it; the
+        reference check and the removal both run under the media lock.
+
+        Args:
+            media_id: ID of the media item
+        """
+        with self.media_lock:
+            with self.lock, self.connection:
+                row = self.connection.execute(
+                    "SELECT blob_hash FROM memory_book WHERE id = ?",
+                    (media_id,)
+                ).fetchone()
+                if row is None:
+                    return
+
+                self.connection.execute("DELETE FROM memory_book WHERE id = ?", (media_id,))
+                still_referenced = self.connection.execute(
+                    "SELECT EXISTS(SELECT 1 FROM memory_book WHERE blob_hash = ?)",
+                    (row[0],)
+                ).fetchone()[0]
+
+            if not still_referenced:
+                self.blobs.delete(row[0])
+                self.thumbnails.delete(row[0])
+
+    def get_media(self, patient_id: str) -> List[Dict[str, Any]]:
+        """
+        Get all memory book items for a patient, newest first.
+        Items hold a content hash; read the bytes with read_media_bytes.
+
+        Args:
+            patient_id: ID of the patient
+
+        Returns:
+            List of media item dictionaries
+        """
+        return self._fetch_documents(
+            "SELECT data FROM memory_book "
+            "WHERE patient_id = ? ORDER BY uploaded_on DESC",
+            (patient_id,)
+        )
+
+    def read_media_bytes(self, media: Dict[str, Any]) -> bytes:
+        """
+        Read a media item's file contents from the blob store.
+
+        Args:
+            media: Media item dictionary
+
+        Returns:
+            Raw file contents
+        """
+        return self.blobs.read(media['blob_hash'])
+
+    def read_media_preview(self, media: Dict[str, Any]) -> bytes:
+        """
+        Read the bytes to show for a media item in a grid.
+        Photos return their thumbnail when one is available, otherwise the original.
+
+        Args:
+            media: Media item dictionary
+
+        Returns:
+            Thumbnail or original file contents
+        """
+        if media.get('media_type') == 'Photo':
+            path = self.thumbnails.get(media['blob_hash'])
+            if path is not None:
+                with open(path, 'rb') as thumbnail_file:
+                    return thumbnail_file.read()
+        return self.read_media_bytes(media)
+
+
+@st.cache_resource
+def get_repository() -> CareRepository:
+    """
+    Get the process-wide repository shared by every Streamlit session.
+    All access goes through the repository lock, so concurrent reruns from
+    different carers and family members see each other's writes immediately.
+
+    Returns:
+        CareRepository instance
+    """
+    return CareRepository()
@@ -0,0 +1,95 @@
+from datetime import date
+from typing import Dict, List, Any, Iterable
+
+import numpy as np
+
+from models.status_scales import STATUS_SCALES, MEAL_AMOUNTS, MEALS, encode_value
+"""
+Status Series Module
+A patient's daily status and meal amounts as contiguous int8 arrays.
+
+Each log with status or meal values becomes one row: its date as a day ordinal
+and one int8 scale position per status field and per meal, MISSING where the
+value was not recorded. Rows are kept in (date, timestamp) order like
+VitalsSeries, so weekly means and meal shares are computed over whole arrays.
+The repository caches one series per patient and drops it when the patient's
+logs change.
+"""
+
+STATUS_FIELDS = list(STATUS_SCALES)
+MEAL_FIELDS = list(MEALS)
+MISSING = -1
+
+
+class StatusSeries:
+    """
+    Day ordinals and per-field int8 position arrays for one patient.
+    """
+
+    def __init__(self, days: np.ndarray, codes: Dict[str, np.ndarray]):
+        """
+        Create a series from prepared arrays.
+
+        Args:
+            days: Day ordinals in ascending order (int64)
+            codes: Status or meal field -> int8 array aligned with days
+        """
+        self.days = days
+        self.codes = codes
+
+    def __len__(self) -> int:
+        return len(self.days)
+
+    @classmethod
+    def from_logs(cls, logs: Iterable[Dict[str, Any]]) -> 'StatusSeries':
+        """
+        Build a series from logs in (date, timestamp) order.
+        Logs without status or meals, such as medication-only day records, are skipped.
+
+        Args:
+            logs: Log dictionaries
+
+        Returns:
+            StatusSeries of the logs' values
+        """
+        days: List[int] = []
+        columns: Dict[str, List[int]] = {
+            field: [] for field in STATUS_FIELDS + MEAL_FIELDS
+        }
+
+        for log in logs:
+            activities = log.get('activities') or {}
+            meals = log.get('meals') or {}
+            if not activities and not meals:
+                continue
+            days.append(date.fromisoformat(log['date']).toordinal())
+            for field in STATUS_FIELDS:
+                code = encode_value(STATUS_SCALES[field], activities.get(field))
+                columns[field].append(MISSING if code is None else code)
+            for field in MEAL_FIELDS:
+                meal = meals.get(field)
+                code = None
+                if isinstance(meal, dict):
+                    code = encode_value(MEAL_AMOUNTS, meal.get('amount'))
+                columns[field].append(MISSING if code is None else code)
+
+        return cls(
+            np.array(days, dtype=np.int64),
+            {field: np.array(column, dtype=np.int8) for field, column in columns.items()}
+        )
+
+    def since(self, first_day: int) -> 'StatusSeries':
+        """
+        Get the rows on or after a day, sharing memory with this series.
+
+        Args:
+            first_day: Day ordinal of the first row to keep
+
+        Returns:
+            StatusSeries view of the later rows
+        """
+        start = int(np.searchsorted(self.days, first_day, side='left'))
+        return StatusSeries(
+            self.days[start:],
+            {field: codes[start:] for field, codes in self.codes.items()}
+        )
@@ -0,0 +1,179 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor, TimeoutError
+from typing import Dict, Optional, Set
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:
+    Image = None
+    ImageOps = None
+"""
+Thumbnails Module
+Downscaled previews for memory book photos.
+
+When a photo is added, a worker process writes a JPEG no larger than
+THUMBNAIL_SIZE pixels next to the original blob (<hash>.thumb.jpg). Grids show
+the thumbnail, and the original is read only when a carer or family member asks
+for the full view. Photos uploaded before thumbnails existed are converted the
+first time they are shown.
+
+Pillow is optional; without it previews fall back to the original file.
+"""
+
+THUMBNAIL_SIZE = 320
+THUMBNAIL_QUALITY = 80
+THUMBNAIL_SUFFIX = '.thumb.jpg'
+
+
+def make_thumbnail(source_path: str, target_path: str, size: int = THUMBNAIL_SIZE) -> bool:
+    """
+    Write a downscaled JPEG copy of an image. Runs in a worker process.
+
+    Args:
+        source_path: Path of the original image
+        target_path: Path of the thumbnail to write
+        size: Maximum width and height in pixels
+
+    Returns:
+        True if the thumbnail was written, False if the file is not a readable image
+    """
+    temp_path = target_path + '.part'
+    try:
+        with Image.open(source_path) as image:
+            image = ImageOps.exif_transpose(image)
+            image.thumbnail((size, size))
+            if image.mode != 'RGB':
+                image = image.convert('RGB')
+            image.save(temp_path, 'JPEG', quality=THUMBNAIL_QUALITY, optimize=True)
+        os.replace(temp_path, target_path)
+    except (OSError, ValueError, Image.DecompressionBombError):
+        try:
+            os.remove(temp_path)
+        except FileNotFoundError:
+            pass
+        return False
+
+    return True
+
+
+class ThumbnailGenerator:
+    """
+    Generates and locates photo thumbnails stored next to blob files.
+    """
+
+    def __init__(self, blobs, max_workers: int = 2):
+        """
+        Create the generator. The worker pool is started on first use.
+
+        Args:
+            blobs: BlobStore holding the originals
+            max_workers: Number of worker processes
+        """
+        self.blobs = blobs
+        self.max_workers = max_workers
+        self.executor: Optional[ProcessPoolExecutor] = None
+        self.pending: Dict[str, Future] = {}
+        self.failed: Set[str] = set()
+        self.lock = threading.Lock()
+
+    @property
+    def available(self) -> bool:
+        """True if Pillow is installed and thumbnails can be generated."""
+        return Image is not None
+
+    def path_for(self, blob_hash: str) -> str:
+        """
+        Get the thumbnail path of a blob.
+
+        Args:
+            blob_hash: Hex SHA-256 of the original
+
+        Returns:
+            Path next to the original blob
+        """
+        return self.blobs.path_for(blob_hash) + THUMBNAIL_SUFFIX
+
+    def submit(self, blob_hash: str) -> Optional[Future]:
+        """
+        Start generating a thumbnail unless it exists or is already running.
+
+        Args:
+            blob_hash: Hex SHA-256 of the original
+
+        Returns:
+            Future of the worker call, or None if nothing needs to run
+        """
+        if not self.available or os.path.exists(self.path_for(blob_hash)):
+            return None
+
+        with self.lock:
+            if blob_hash in self.failed:
+                return None
+            future = self.pending.get(blob_hash)
+            if future is None:
+                if self.executor is None:
+                    self.executor = ProcessPoolExecutor(
+                        max_workers=self.max_workers,
+                        mp_context=multiprocessing.get_context('spawn')
+                    )
+                future = self.executor.submit(
+                    make_thumbnail,
+                    self.blobs.path_for(blob_hash),
+                    self.path_for(blob_hash)
+                )
+                future.add_done_callback(
+                    lambda done: self._finished(blob_hash, done)
+                )
+                self.pending[blob_hash] = future
+            return future
+
+    def _finished(self, blob_hash: str, future: Future) -> None:
+        """Record the outcome of a worker call. Calls cancelled by close() are not failures."""
+        with self.lock:
+            self.pending.pop(blob_hash, None)
+            if future.cancelled():
+                return
+            if future.exception() is not None or not future.result():
+                self.failed.add(blob_hash)
+
+    def get(self, blob_hash: str, timeout: float = 2.0) -> Optional[str]:
+        """
+        Get a blob's thumbnail path, waiting briefly if it is still being made.
+
+        Args:
+            blob_hash: Hex SHA-256 of the original
+            timeout: Seconds to wait for a pending thumbnail
+
+        Returns:
+            Thumbnail path, or None if there is no thumbnail yet
+        """
+        path = self.path_for(blob_hash)
+        if os.path.exists(path):
+            return path
+
+        future = self.submit(blob_hash)
+        if future is not None:
+            try:
+                future.result(timeout=timeout)
+            except TimeoutError:
+                return None
+            except Exception:
+                pass
+
+        return path if os.path.exists(path) else None
+
+    def delete(self, blob_hash: str) -> None:
+        """Remove a blob's thumbnail if it exists."""
+        try:
+            os.remove(self.path_for(blob_hash))
+        except FileNotFoundError:
+            pass
+
+    def close(self) -> None:
+        """Shut down the worker pool."""
+        with self.lock:
+            if self.executor is not None:
+                self.executor.shutdown(wait=False, cancel_futures=True)
+                self.executor = None
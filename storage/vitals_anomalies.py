@@ -0,0 +1,135 @@
+from datetime import date
+from typing import Dict, List, Any, Optional
+
+import numpy as np
+
+from storage.vitals_series import VITAL_FIELDS, VitalsSeries
+"""
+Vitals Anomalies Module
+Facility-wide check of recent vital signs against each resident's own baseline.
+
+For every vital sign, the readings of all patients are concatenated into one
+array with a parallel array of patient numbers. A patient's baseline is the
+median of their readings in the BASELINE_DAYS before the recent window, and
+their normal band is the median plus or minus ROBUST_Z scaled median absolute
+deviations (at least MIN_DEVIATION). Readings from the last RECENT_DAYS outside
+the band are flagged. Grouped medians come from one sort by (patient, value),
+so the whole facility is checked in a few array passes per vital sign.
+"""
+
+BASELINE_DAYS = 180
+RECENT_DAYS = 2
+MIN_BASELINE_READINGS = 10
+ROBUST_Z = 3.5
+MAD_SCALE = 1.4826
+
+MIN_DEVIATION = {
+    'temperature': 0.5,
+    'heart_rate': 10.0,
+    'oxygen_saturation': 3.0,
+    'weight': 2.0,
+    'systolic': 15.0,
+    'diastolic': 10.0,
+}
+
+
+def grouped_median(groups: np.ndarray, values: np.ndarray, group_count: int) -> np.ndarray:
+    """
+    Median of values per group. Values are packed into the fractional part
+    of their group number, so a single sort orders them by (group, value).
+
+    Args:
+        groups: Group number of each value
+        values: Values without NaN
+        group_count: Number of groups
+
+    Returns:
+        Median per group, NaN for groups without values
+    """
+    if not len(values):
+        return np.full(group_count, np.nan)
+
+    low_value = values.min()
+    scale = values.max() - low_value + 1.0
+    ordered = np.sort(groups + (values - low_value) / scale)
+    ordered = (ordered - np.floor(ordered)) * scale + low_value
+    counts = np.bincount(groups, minlength=group_count)
+    offsets = np.concatenate(([0], np.cumsum(counts)[:-1]))
+
+    medians = np.full(group_count, np.nan)
+    present = counts > 0
+    low = offsets[present] + (counts[present] - 1) // 2
+    high = offsets[present] + counts[present] // 2
+    medians[present] = (ordered[low] + ordered[high]) / 2
+    return medians
+
+
+def detect_anomalies(
+    series_by_patient: Dict[str, VitalsSeries],
+    today: Optional[date] = None
+) -> List[Dict[str, Any]]:
+    """
+    Flag recent readings outside each patient's normal band.
+
+    Args:
+        series_by_patient: Patient ID -> VitalsSeries
+        today: Last day of the recent window, today by default
+
+    Returns:
+        List of flag dictionaries with 'patient_id', 'field', 'date', 'value',
+        'median', 'low' and 'high', ordered by patient and date
+    """
+    today = (today or date.today()).toordinal()
+    recent_start = today - RECENT_DAYS + 1
+    patient_ids = list(series_by_patient)
+    if not patient_ids:
+        return []
+
+    windows = [
+        series_by_patient[patient_id].since(recent_start - BASELINE_DAYS)
+        for patient_id in patient_ids
+    ]
+    days = np.concatenate([window.days for window in windows])
+    groups = np.repeat(np.arange(len(patient_ids)), [len(window) for window in windows])
+
+    in_baseline = days < recent_start
+    in_recent = (days >= recent_start) & (days <= today)
+    if not in_recent.any():
+        return []
+
+    flags = []
+    for field in VITAL_FIELDS:
+        values = np.concatenate([window.values[field] for window in windows])
+        valid = ~np.isnan(values)
+
+        baseline = in_baseline & valid
+        baseline_groups = groups[baseline]
+        baseline_values = values[baseline]
+        counts = np.bincount(baseline_groups, minlength=len(patient_ids))
+        medians = grouped_median(baseline_groups, baseline_values, len(patient_ids))
+        deviations = np.abs(baseline_values - medians[baseline_groups])
+        mads = grouped_median(baseline_groups, deviations, len(patient_ids))
+        bands = np.maximum(ROBUST_Z * MAD_SCALE * mads, MIN_DEVIATION[field])
+
+        checked = in_recent & valid & (counts[groups] >= MIN_BASELINE_READINGS)
+        candidates = np.flatnonzero(checked)
+        candidate_groups = groups[candidates]
+        outside = (
+            np.abs(values[candidates] - medians[candidate_groups])
+            > bands[candidate_groups]
+        )
+
+        for index in candidates[outside]:
+            group = groups[index]
+            flags.append((group, {
+                'patient_id': patient_ids[group],
+                'field': field,
+                'date': date.fromordinal(int(days[index])).isoformat(),
+                'value': float(values[index]),
+                'median': float(medians[group]),
+                'low': float(medians[group] - bands[group]),
+                'high': float(medians[group] + bands[group]),
+            }))
+
+    flags.sort(key=lambda pair: (pair[0], pair[1]['date']))
+    return [flag for _, flag in flags]
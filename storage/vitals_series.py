@@ -0,0 +1,104 @@
+from datetime import date
+from typing import Dict, List, Any, Iterable
+
+import numpy as np
+"""
+Vitals Series Module
+A patient's vital signs as contiguous NumPy arrays.
+
+Each log with vitals becomes one reading: its date as a day ordinal and one
+float64 value per vital sign, NaN where the value was not recorded. Readings are
+kept in (date, timestamp) order, so date windows are found with searchsorted and
+trends are computed over whole arrays. The repository caches one series per
+patient and drops it when the patient's logs change.
+"""
+
+VITAL_FIELDS = [
+    'temperature',
+    'heart_rate',
+    'oxygen_saturation',
+    'weight',
+    'systolic',
+    'diastolic',
+]
+
+
+def _reading(value: Any) -> float:
+    """Convert a stored vital sign to float, NaN if missing or not a number."""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+class VitalsSeries:
+    """
+    Day ordinals and per-vital value arrays for one patient.
+    """
+
+    def __init__(self, days: np.ndarray, values: Dict[str, np.ndarray]):
+        """
+        Create a series from prepared arrays.
+
+        Args:
+            days: Day ordinals in ascending order (int64)
+            values: Vital field -> float64 array aligned with days
+        """
+        self.days = days
+        self.values = values
+
+    def __len__(self) -> int:
+        return len(self.days)
+
+    @classmethod
+    def from_logs(cls, logs: Iterable[Dict[str, Any]]) -> 'VitalsSeries':
+        """
+        Build a series from logs in (date, timestamp) order.
+        Logs without vitals, such as medication-only day records, are skipped.
+
+        Args:
+            logs: Log dictionaries
+
+        Returns:
+            VitalsSeries of the logs' readings
+        """
+        days: List[int] = []
+        columns: Dict[str, List[float]] = {field: [] for field in VITAL_FIELDS}
+
+        for log in logs:
+            vitals = log.get('vitals')
+            if not vitals:
+                continue
+            days.append(date.fromisoformat(log['date']).toordinal())
+            for field in VITAL_FIELDS:
+                columns[field].append(_reading(vitals.get(field)))
+
+        return cls(
+            np.array(days, dtype=np.int64),
+            {field: np.array(column, dtype=np.float64) for field, column in columns.items()}
+        )
+
+    def dates(self) -> np.ndarray:
+        """
+        Get the reading dates.
+
+        Returns:
+            datetime64[D] array aligned with the values
+        """
+        return (self.days - date(1970, 1, 1).toordinal()).astype('datetime64[D]')
+
+    def since(self, first_day: int) -> 'VitalsSeries':
+        """
+        Get the readings on or after a day, sharing memory with this series.
+
+        Args:
+            first_day: Day ordinal of the first reading to keep
+
+        Returns:
+            VitalsSeries view of the later readings
+        """
+        start = int(np.searchsorted(self.days, first_day, side='left'))
+        return VitalsSeries(
+            self.days[start:],
+            {field: values[start:] for field, values in self.values.items()}
+        )
@@ -2,26 +2,29 @@ import streamlit as st
 from datetime import datetime
 from typing import Dict, Any
 
+from models.medication import format_minute
+from reports.export_jobs import DONE, FAILED, get_export_queue
+from storage.media_server import get_media_server
+from storage.repository import get_repository
+from storage.vitals_anomalies import RECENT_DAYS
+
 
 class SessionManager:
     """
     Manages application session state and initialization.
-    Ensures all required session state variables are properly initialized.
+    Session state only holds per-user UI state; care records live in the
+    process-wide repository shared by all sessions.
     """
     
     @staticmethod
     def initialize_session_state() -> None:
         """Initialize all session state variables if they don't exist."""
         default_states = {
-            'patients': {},
             'current_patient': None,
-            'medications': {},
-            'daily_logs': {},
-            'tasks': {},
-            'memory_book': {},
             'num_emergency_contacts': 1,
             'user_role': None,
-            'selected_role': None
+            'selected_role': None,
+            'export_jobs': []
         }
         
         for key, default_value in default_states.items():
@@ -68,13 +71,13 @@ class MedicationAlertSystem:
     """
     
     @staticmethod
-    def get_upcoming_alerts(medications: Dict, patients: Dict, time_window: int = 30) -> list:
+    def get_upcoming_alerts(time_window: int = 30) -> list:
         """
         Get list of medications due within specified time window.
+        Reads the repository's alert schedule, so no medication times are
+        parsed here and windows that cross midnight include the next morning.
         
         Args:
-            medications: Dictionary of patient medications
-            patients: Dictionary of patient information
             time_window: Alert window in minutes
             
         Returns:
@@ -82,29 +85,24 @@ class MedicationAlertSystem:
         """
         current_time = datetime.now().time()
         current_minutes = current_time.hour * 60 + current_time.minute
+        repository = get_repository()
+        patient_names = {}
         alerts = []
         
-        for patient_id, meds in medications.items():
-            patient_name = patients.get(patient_id, {}).get('name', 'Unknown')
+        for minutes, dose_minute, patient_id, med in repository.get_due_medications(
+            current_minutes,
+            time_window
+        ):
+            if patient_id not in patient_names:
+                patient = repository.get_patient(patient_id) or {}
+                patient_names[patient_id] = patient.get('name', 'Unknown')
             
-            for med in meds:
-                if not med.get('active', True):
-                    continue
-                
-                try:
-                    med_time = datetime.strptime(med['time'], '%H:%M').time()
-                    med_minutes = med_time.hour * 60 + med_time.minute
-                    time_diff = med_minutes - current_minutes
-                    
-                    if 0 <= time_diff <= time_window:
-                        alerts.append({
-                            'patient': patient_name,
-                            'medication': med['name'],
-                            'time': med['time'],
-                            'minutes': time_diff
-                        })
-                except (ValueError, KeyError):
-                    continue
+            alerts.append({
+                'patient': patient_names[patient_id],
+                'medication': med['name'],
+                'time': format_minute(dose_minute),
+                'minutes': minutes
+            })
         
         return alerts
     
@@ -127,6 +125,61 @@ class MedicationAlertSystem:
             st.info("No upcoming medications in next 30 mins")
 
 
+class VitalsAlertSystem:
+    """
+    Shows residents whose recent vitals are outside their own normal range.
+    """
+    
+    VITAL_LABELS = {
+        'temperature': ("Temperature", "°C"),
+        'heart_rate': ("Heart rate", "bpm"),
+        'oxygen_saturation': ("Oxygen", "%"),
+        'weight': ("Weight", "kg"),
+        'systolic': ("Systolic BP", "mmHg"),
+        'diastolic': ("Diastolic BP", "mmHg"),
+    }
+    
+    @staticmethod
+    def get_flagged_residents() -> Dict[str, list]:
+        """
+        Get recent out-of-range readings grouped by resident name.
+        
+        Returns:
+            Dictionary mapping patient name to a list of flag dictionaries
+        """
+        repository = get_repository()
+        patients = repository.list_patients()
+        flagged = {}
+        
+        for flag in repository.get_vitals_anomalies():
+            name = patients.get(flag['patient_id'], {}).get('name', 'Unknown')
+            flagged.setdefault(name, []).append(flag)
+        
+        return flagged
+    
+    @staticmethod
+    def display_alerts(flagged: Dict[str, list]) -> None:
+        """
+        Display vitals alerts in the sidebar.
+        
+        Args:
+            flagged: Patient name mapped to flag dictionaries
+        """
+        if not flagged:
+            st.info(f"No unusual vitals in the last {RECENT_DAYS} days")
+            return
+        
+        for name, flags in flagged.items():
+            lines = [f"**{name}**"]
+            for flag in flags:
+                label, unit = VitalsAlertSystem.VITAL_LABELS[flag['field']]
+                lines.append(
+                    f"{label} {flag['value']:g} {unit} on {flag['date']} "
+                    f"(usual {flag['low']:.1f}-{flag['high']:.1f})"
+                )
+            st.error("\n".join(lines))
+
+
 class NavigationManager:
     """
     Manages application navigation and page routing based on user role.
@@ -155,6 +208,7 @@ class NavigationManager:
             ],
             "History": [
                 st.Page("pages/historical_logs.py", title="Historical Logs", icon="📆"),
+                st.Page("pages/log_search.py", title="Search Notes", icon="🔍"),
             ],
             "Memory Book": [
                 st.Page("pages/memory_book.py", title="Photos & Media", icon="📷"),
@@ -179,6 +233,72 @@ class NavigationManager:
         }
 
 
+class ExportJobsPanel:
+    """
+    Shows this session's background exports with progress and download buttons.
+    """
+    
+    @staticmethod
+    def render() -> None:
+        """
+        Render the export list, polling every two seconds while a job is running.
+        """
+        st.subheader("Exports")
+        
+        if any(job.status not in (DONE, FAILED) for job in ExportJobsPanel._session_jobs()):
+            st.fragment(run_every=2)(ExportJobsPanel._render_jobs)(True)
+        else:
+            ExportJobsPanel._render_jobs(False)
+    
+    @staticmethod
+    def _session_jobs() -> list:
+        """Get the export jobs submitted in this session, oldest first."""
+        queue = get_export_queue()
+        jobs = [queue.get(job_id) for job_id in st.session_state.export_jobs]
+        return [job for job in jobs if job is not None]
+    
+    @staticmethod
+    def _render_jobs(polling: bool) -> None:
+        """
+        Render one row per export job, newest first.
+        
+        Args:
+            polling: True when running as an auto-refreshing fragment
+        """
+        jobs = ExportJobsPanel._session_jobs()
+        
+        if polling and all(job.status in (DONE, FAILED) for job in jobs):
+            st.rerun()
+        
+        for job in reversed(jobs):
+            caption = f"{job.label}: {job.start_date} to {job.end_date}"
+            
+            if job.status == DONE:
+                st.download_button(
+                    label=f"Download {caption}",
+                    data=lambda path=job.path: ExportJobsPanel._read_file(path),
+                    file_name=job.file_name,
+                    mime=job.mime,
+                    key=f"export_download_{job.id}",
+                    use_container_width=True
+                )
+            elif job.status == FAILED:
+                st.error(f"{caption} failed: {job.error}")
+            else:
+                st.progress(job.progress, text=caption)
+    
+    @staticmethod
+    def _read_file(path: str) -> bytes:
+        """
+        Read a finished export file when its download button is clicked.
+        Streamlit buffers download data in memory whatever form it is given in
+        (bytes, file handle or callable), so the whole file is read here once,
+        on click, rather than on every rerun.
+        """
+        with open(path, 'rb') as export_file:
+            return export_file.read()
+
+
 class SidebarManager:
     """
     Manages the sidebar content based on user role.
@@ -198,6 +318,11 @@ class SidebarManager:
             
             if role == "Carer":
                 SidebarManager._render_medication_alerts()
+                SidebarManager._render_vitals_alerts()
+            
+            if st.session_state.export_jobs:
+                st.divider()
+                ExportJobsPanel.render()
             
             st.divider()
             if st.button("Change Role", use_container_width=True):
@@ -222,15 +347,21 @@ class SidebarManager:
         """Render medication alert section in sidebar for carers."""
         st.subheader("Medication Alerts")
         
-        alerts = MedicationAlertSystem.get_upcoming_alerts(
-            st.session_state.medications,
-            st.session_state.patients
-        )
+        alerts = MedicationAlertSystem.get_upcoming_alerts()
         
-        if st.session_state.medications:
+        if get_repository().has_active_medications():
             MedicationAlertSystem.display_alerts(alerts)
         else:
             st.info("No medications scheduled")
+    
+    @staticmethod
+    def _render_vitals_alerts() -> None:
+        """Render out-of-range vitals section in sidebar for carers."""
+        st.subheader("Vitals Alerts")
+        
+        VitalsAlertSystem.display_alerts(
+            VitalsAlertSystem.get_flagged_residents()
+        )
 
 
 def configure_page() -> None:
@@ -249,6 +380,8 @@ def main() -> None:
     """
     configure_page()
     SessionManager.initialize_session_state()
+    get_repository()
+    get_media_server()
     
     if not st.session_state.selected_role:
         RoleSelector.render()
@@ -0,0 +1,41 @@
+import json
+
+from storage.journal import MutationJournal, LOG_CREATED
+
+
+def test_reopen_after_torn_write_keeps_later_events(tmp_path):
+    path = str(tmp_path / 'journal.jsonl')
+    journal = MutationJournal(path)
+    journal.append(LOG_CREATED, {'n': 1})
+    journal.close()
+
+    # A crash mid-write leaves half an event without its newline.
+    with open(path, 'a', encoding='utf-8') as journal_file:
+        journal_file.write('{"seq": 2, "type": "log_cr')
+
+    journal = MutationJournal(path)
+    assert journal.last_seq == 1
+    assert journal.append(LOG_CREATED, {'n': 2}) == 2
+    assert journal.append(LOG_CREATED, {'n': 3}) == 3
+    journal.close()
+
+    assert [event['seq'] for event in journal.read_events()] == [1, 2, 3]
+    with open(path, encoding='utf-8') as journal_file:
+        assert all(json.loads(line) for line in journal_file)
+
+
+def test_reopen_drops_invalid_tail_line(tmp_path):
+    path = str(tmp_path / 'journal.jsonl')
+    journal = MutationJournal(path)
+    journal.append(LOG_CREATED, {'n': 1})
+    journal.close()
+
+    with open(path, 'ab') as journal_file:
+        journal_file.write(b'\x00\x00\x00\n')
+
+    journal = MutationJournal(path)
+    journal.append(LOG_CREATED, {'n': 2})
+    journal.compact(snapshot_seq=0)
+    journal.close()
+
+    assert [event['seq'] for event in journal.read_events()] == [1, 2]
@@ -0,0 +1,46 @@
+import io
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+
+import pytest
+
+from storage.blob_store import BlobStore
+from storage.media_server import MediaServer
+
+DATA = bytes(range(256)) * 40
+
+
+@pytest.fixture
+def media_url(tmp_path):
+    blobs = BlobStore(str(tmp_path / 'blobs'))
+    blob_hash = blobs.ingest(io.BytesIO(DATA))[0]
+    server = MediaServer(blobs, None, host='127.0.0.1', port=0, base_url='http://unused')
+    server.start()
+    host, port = server.httpd.server_address[:2]
+    yield f"http://{host}:{port}/media/{blob_hash}"
+    server.stop()
+
+
+def _get(url, range_header):
+    return urlopen(Request(url, headers={'Range': range_header}), timeout=5)
+
+
+def test_valid_range_is_partial(media_url):
+    with _get(media_url, 'bytes=10-19') as response:
+        assert response.status == 206
+        assert response.headers['Content-Range'] == f'bytes 10-19/{len(DATA)}'
+        assert response.read() == DATA[10:20]
+
+
+def test_invalid_range_is_ignored(media_url):
+    with _get(media_url, 'bytes=abc') as response:
+        assert response.status == 200
+        assert response.headers['Content-Range'] is None
+        assert response.read() == DATA
+
+
+def test_unsatisfiable_range_is_416(media_url):
+    with pytest.raises(HTTPError) as error:
+        _get(media_url, f'bytes={len(DATA)}-')
+    assert error.value.code == 416
+    assert error.value.headers['Content-Range'] == f'bytes */{len(DATA)}'